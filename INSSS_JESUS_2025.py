@@ -1,6 +1,11 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+from previdencia.beneficio import fator_previdenciario, salario_de_beneficio
+from previdencia.formatacao import formatar_moeda
+from previdencia.graficos import serie_grafico
+from previdencia.interface import controles_grafico, tabela_paginada
+from previdencia.leitura import organizar_cnis, organizar_desconsiderados
+from previdencia.selecao import SelecaoMaiores
 
 # ================================
 # LOGIN SIMPLES
@@ -24,32 +29,6 @@ def login():
 if login():
     st.set_page_config(page_title="Dashboard Previdenciário Profissional", layout="wide")
 
-    # ================================
-    # FUNÇÕES UTILITÁRIAS
-    # ================================
-
-    def organizar_cnis(file):
-        df = pd.read_csv(file, delimiter=';', encoding='utf-8')
-        df = df.iloc[:,0].str.split(',', expand=True)
-        df.columns = ['Seq', 'Competência', 'Remuneração', 'Ano']
-        df['Remuneração'] = pd.to_numeric(df['Remuneração'], errors='coerce')
-        df = df[df['Remuneração'] < 50000]  # Remove discrepantes - fuzzy
-        return df
-
-    def organizar_desconsiderados(file):
-        df = pd.read_csv(file, delimiter=';', encoding='utf-8')
-        df = df.iloc[:,0].str.split(',', expand=True)
-        df.columns = ['Seq', 'Seq.', 'Data', 'Salário', 'Índice', 'Sal. Corrigido', 'Observação', 'Ano', 'Duplicado']
-        df['Sal. Corrigido'] = pd.to_numeric(df['Sal. Corrigido'], errors='coerce')
-        return df
-
-    def fator_previdenciario(Tc, Es, Id, a=0.31):
-        fator = (Tc * a / Es) * (1 + ((Id + Tc * a) / 100))
-        return round(fator, 4)
-
-    def formatar_moeda(valor):
-        return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
     # ================================
     # UPLOAD
     # ================================
@@ -69,24 +48,22 @@ if login():
         df_desconsiderados = organizar_desconsiderados(desconsid_file)
 
         # 80% MAIORES SALÁRIOS
-        df_cnis_sorted = df_cnis.sort_values(by='Remuneração', ascending=False)
-        qtd_80 = int(len(df_cnis_sorted) * 0.8)
-        df_top80 = df_cnis_sorted.head(qtd_80)
-        df_bottom10 = df_cnis_sorted.tail(len(df_cnis_sorted) - qtd_80)
+        selecao_80 = SelecaoMaiores(df_cnis['Remuneração'])  # partição linear; ordena só ao exibir
+        qtd_80 = selecao_80.qtd
 
         # DESCONSIDERADOS VANTAJOSOS
-        min_80 = df_top80['Remuneração'].min()
+        min_80 = selecao_80.minimo
         df_vantajosos = df_desconsiderados[df_desconsiderados['Sal. Corrigido'] > min_80]
 
         # PARÂMETROS DEFAULT
         Tc_default, Es_default, Id_default, a_default = 38, 21.8, 60, 0.31
-        media_salarios = df_top80['Remuneração'].mean()
+        media_salarios = selecao_80.media
         fator = fator_previdenciario(Tc_default, Es_default, Id_default, a_default)
-        salario_beneficio = round(media_salarios * fator, 2)
+        salario_beneficio = salario_de_beneficio(media_salarios, fator)
 
-        # FORMATAÇÃO MOEDA
-        df_top80['Remuneração'] = df_top80['Remuneração'].apply(formatar_moeda)
-        df_vantajosos['Sal. Corrigido'] = df_vantajosos['Sal. Corrigido'].apply(formatar_moeda)
+        # 80% MAIORES EM ORDEM DECRESCENTE (ordenados só ao exibir)
+        def top80_ordenado():
+            return df_cnis.iloc[selecao_80.ordem]
 
         # ================================
         # DASHBOARD PRINCIPAL
@@ -96,7 +73,7 @@ if login():
 
             col1, col2, col3 = st.columns(3)
             col1.metric("Total CNIS", len(df_cnis))
-            col2.metric("80% Maiores Salários", len(df_top80))
+            col2.metric("80% Maiores Salários", qtd_80)
             col3.metric("Desconsid. Reaproveitados", len(df_vantajosos))
 
             st.subheader("🧮 Resultados Previdenciários")
@@ -105,17 +82,19 @@ if login():
             st.write(f"**Salário de Benefício:** {formatar_moeda(salario_beneficio)}")
 
             st.subheader("📄 Tabelas Detalhadas")
-            st.dataframe(df_top80)
-            st.dataframe(df_vantajosos)
+            tabela_paginada(top80_ordenado(), 'top80', moeda=('Remuneração',))
+            tabela_paginada(df_vantajosos, 'vantajosos', moeda=('Sal. Corrigido',))
 
         # ================================
         # GRÁFICOS
         # ================================
         elif aba == "Gráficos":
             st.title("📊 Visualização Gráfica")
-            df_grafico = df_cnis_sorted.head(qtd_80)
-            st.bar_chart(data=df_grafico, x='Competência', y='Remuneração')
-            st.line_chart(data=df_grafico, x='Competência', y='Remuneração')
+            # Ordem cronológica, agrupado por período; séries longas reduzidas por LTTB
+            periodo, agregacao = controles_grafico('graficos')
+            df_grafico = serie_grafico(df_cnis.iloc[selecao_80.maiores], periodo, agregacao)
+            st.bar_chart(data=df_grafico, x='Período', y='Remuneração')
+            st.line_chart(data=df_grafico, x='Período', y='Remuneração')
 
         # ================================
         # EXPLICAÇÃO
@@ -148,7 +127,7 @@ if login():
             Id_input = st.number_input("Idade", value=60)
             a_input = st.number_input("Alíquota", value=0.31)
             fator_simulado = fator_previdenciario(Tc_input, Es_input, Id_input, a_input)
-            salario_simulado = round(media_salarios * fator_simulado, 2)
+            salario_simulado = salario_de_beneficio(media_salarios, fator_simulado)
             st.write(f"**Fator Previdenciário Simulado:** {fator_simulado}")
             st.write(f"**Salário Benefício Simulado:** {formatar_moeda(salario_simulado)}")
 
@@ -164,15 +143,15 @@ if login():
             Este relatório apresenta os resultados detalhados do processamento previdenciário conforme os dados enviados e as regras aplicadas.
             """)
             st.markdown(f"**Total de registros CNIS:** {len(df_cnis)}")
-            st.markdown(f"**80% maiores salários considerados:** {len(df_top80)}")
+            st.markdown(f"**80% maiores salários considerados:** {qtd_80}")
             st.markdown(f"**Salários desconsiderados reaproveitados:** {len(df_vantajosos)}")
             st.markdown("---")
 
             st.subheader("📌 Detalhamento dos 80% Maiores Salários")
-            st.dataframe(df_top80)
+            tabela_paginada(top80_ordenado(), 'top80', moeda=('Remuneração',))
 
             st.subheader("📌 Salários Desconsiderados Reaproveitados")
-            st.dataframe(df_vantajosos)
+            tabela_paginada(df_vantajosos, 'vantajosos', moeda=('Sal. Corrigido',))
 
             st.subheader("📌 Fórmula Previdenciária Aplicada")
             st.latex(r'''
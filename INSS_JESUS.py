@@ -1,6 +1,11 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+from previdencia.beneficio import fator_previdenciario, salario_de_beneficio
+from previdencia.formatacao import formatar_moeda
+from previdencia.graficos import serie_grafico
+from previdencia.interface import controles_grafico, tabela_paginada
+from previdencia.leitura import organizar_cnis, organizar_desconsiderados
+from previdencia.selecao import SelecaoMaiores
 
 # ================================
 # CONFIGURAÇÃO INICIAL
@@ -24,39 +29,6 @@ def login():
             st.error("Usuário ou senha incorretos ❌")
         return False
 
-# ================================
-# FUNÇÕES DE PROCESSAMENTO
-# ================================
-
-# Organiza o CNIS (para os dados exportados em CSV ou XLSX)
-def organizar_cnis(file):
-    df = pd.read_csv(file, delimiter=';', encoding='utf-8')
-
-    # Divide a primeira coluna em várias partes com base na vírgula
-    df_split = df.iloc[:, 0].str.split(',', expand=True)
-    df_split.columns = ['Seq', 'Competência', 'Remuneração', 'Ano'][:df_split.shape[1]]
-
-    # Converte a coluna 'Remuneração' para numérico e aplica o filtro fuzzy
-    df_split['Remuneração'] = pd.to_numeric(df_split['Remuneração'], errors='coerce')
-    df_split = df_split[df_split['Remuneração'] < 50000]  # Filtro fuzzy
-    return df_split
-
-# Organiza os dados da Carta Benefício
-def organizar_desconsiderados(file):
-    df = pd.read_csv(file, delimiter=';', encoding='utf-8')
-    df = df.iloc[:, 0].str.split(',', expand=True)
-    df.columns = ['Seq', 'Seq.', 'Data', 'Salário', 'Índice', 'Sal. Corrigido', 'Observação', 'Ano', 'Duplicado']
-    df['Sal. Corrigido'] = pd.to_numeric(df['Sal. Corrigido'], errors='coerce')
-    return df
-
-# Calcula o fator previdenciário
-def fator_previdenciario(Tc, Es, Id, a=0.31):
-    return round((Tc * a / Es) * (1 + ((Id + Tc * a) / 100)), 4)
-
-# Formatação para moeda
-def formatar_moeda(valor):
-    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
 # ================================
 # EXECUÇÃO DO APP
 # ================================
@@ -78,18 +50,18 @@ if login():  # Executa o login
         df_desconsiderados = organizar_desconsiderados(desconsid_file)
 
         # Processamento para os 80% maiores salários
-        df_cnis_sorted = df_cnis.sort_values(by='Remuneração', ascending=False)
-        qtd_80 = int(len(df_cnis_sorted) * 0.8)
-        df_top80 = df_cnis_sorted.head(qtd_80)
+        selecao_80 = SelecaoMaiores(df_cnis['Remuneração'])  # partição linear; ordena só ao exibir
+        qtd_80 = selecao_80.qtd
 
         # Calculando os parâmetros
         Tc_default, Es_default, Id_default, a_default = 38, 21.8, 60, 0.31
-        media_salarios = df_top80['Remuneração'].mean()
+        media_salarios = selecao_80.media
         fator = fator_previdenciario(Tc_default, Es_default, Id_default, a_default)
-        salario_beneficio = round(media_salarios * fator, 2)
+        salario_beneficio = salario_de_beneficio(media_salarios, fator)
 
-        # Formatação monetária
-        df_top80['Remuneração'] = df_top80['Remuneração'].apply(formatar_moeda)
+        # 80% MAIORES EM ORDEM DECRESCENTE (ordenados só ao exibir)
+        def top80_ordenado():
+            return df_cnis.iloc[selecao_80.ordem]
 
         # ================================
         # ABAS PRINCIPAIS
@@ -99,7 +71,7 @@ if login():  # Executa o login
 
             col1, col2, col3 = st.columns(3)
             col1.metric("Total CNIS", len(df_cnis))
-            col2.metric("80% Maiores Salários", len(df_top80))
+            col2.metric("80% Maiores Salários", qtd_80)
             col3.metric("Salário de Benefício", formatar_moeda(salario_beneficio))
 
             st.subheader("🧮 Resultados Previdenciários")
@@ -108,13 +80,15 @@ if login():  # Executa o login
             st.write(f"**Salário de Benefício:** {formatar_moeda(salario_beneficio)}")
 
             st.subheader("📄 Tabelas Detalhadas")
-            st.dataframe(df_top80)
+            tabela_paginada(top80_ordenado(), 'top80', moeda=('Remuneração',))
 
         elif aba == "Gráficos":
             st.title("📊 Visualização Gráfica")
-            df_grafico = df_cnis_sorted.head(qtd_80)
-            st.bar_chart(data=df_grafico, x='Competência', y='Remuneração')
-            st.line_chart(data=df_grafico, x='Competência', y='Remuneração')
+            # Ordem cronológica, agrupado por período; séries longas reduzidas por LTTB
+            periodo, agregacao = controles_grafico('graficos')
+            df_grafico = serie_grafico(df_cnis.iloc[selecao_80.maiores], periodo, agregacao)
+            st.bar_chart(data=df_grafico, x='Período', y='Remuneração')
+            st.line_chart(data=df_grafico, x='Período', y='Remuneração')
 
         elif aba == "Explicação":
             st.title("📖 Explicação Detalhada")
@@ -141,7 +115,7 @@ if login():  # Executa o login
             Id_input = st.number_input("Idade", value=60)
             a_input = st.number_input("Alíquota", value=0.31)
             fator_simulado = fator_previdenciario(Tc_input, Es_input, Id_input, a_input)
-            salario_simulado = round(media_salarios * fator_simulado, 2)
+            salario_simulado = salario_de_beneficio(media_salarios, fator_simulado)
             st.write(f"**Fator Previdenciário Simulado:** {fator_simulado}")
             st.write(f"**Salário Benefício Simulado:** {formatar_moeda(salario_simulado)}")
 
@@ -154,15 +128,15 @@ if login():  # Executa o login
             Este relatório apresenta os resultados detalhados do processamento previdenciário conforme os dados enviados e as regras aplicadas.
             """)
             st.markdown(f"**Total de registros CNIS:** {len(df_cnis)}")
-            st.markdown(f"**80% maiores salários considerados:** {len(df_top80)}")
+            st.markdown(f"**80% maiores salários considerados:** {qtd_80}")
             st.markdown(f"**Salários desconsiderados reaproveitados:** {len(df_desconsiderados)}")
             st.markdown("---")
 
             st.subheader("📌 Detalhamento dos 80% Maiores Salários")
-            st.dataframe(df_top80)
+            tabela_paginada(top80_ordenado(), 'top80', moeda=('Remuneração',))
 
             st.subheader("📌 Salários Desconsiderados Reaproveitados")
-            st.dataframe(df_desconsiderados)
+            tabela_paginada(df_desconsiderados, 'desconsiderados', moeda=('Sal. Corrigido',))
 
             st.subheader("📌 Fórmula Previdenciária Aplicada")
             st.latex(r'''
@@ -1,7 +1,43 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+import altair as alt
 import json
+import os
+import pandas as pd
+
+from previdencia.anomalias import pontuar_anomalias, suspeitos
+from previdencia.beneficio import PARAMETROS_PADRAO, fator_previdenciario, salario_de_beneficio
+from previdencia.consolidacao import consolidar
+from previdencia.correcao import ARQUIVO_INDICES_PADRAO, atualizar_valores_plano, carregar_serie
+from previdencia.formatacao import formatar_moeda
+from previdencia.graficos import serie_grafico
+from previdencia.historico import HistoricoResultados, chave_caso
+from previdencia.interface import controles_grafico, painel_tempos, tabela_paginada
+from previdencia.leitura import ler_cnis, limitar_remuneracoes, organizar_desconsiderados
+from previdencia.limites import AJUSTE_PISO, AJUSTE_TETO, ARQUIVO_LIMITES_PADRAO
+from previdencia.medicao import Cronometro
+from previdencia.otimizacao import COLUNAS_TROCAS, PERIODO_BASICO, Reaproveitamento
+from previdencia.pacote import (
+    EXTENSAO_PACOTE,
+    MIME_PACOTE,
+    TABELA_CNIS,
+    TABELA_DESCONSIDERADOS,
+    abrir_pacote,
+    exportar_pacote,
+    formatos_disponiveis,
+)
+from previdencia.selecao import SelecaoMaiores
+from previdencia.simulacao import faixa, grade_fator
+from previdencia.tabua import ARQUIVO_TABUA_PADRAO, carregar_tabua
+
+MOEDA_REAPROVEITAMENTO = ('Salário CNIS', 'Sal. Corrigido', 'Ganho na Média')
+MOEDA_SUSPEITOS = ('Remuneração', 'Mediana do Período')
+MOEDA_LIMITES = ('Remuneração Informada', 'Teto', 'Piso', 'Remuneração Considerada')
+
+# Tabelas derivadas guardadas no histórico: um caso repetido é servido sem recalcular
+TABELA_CALCULADO = 'CNIS Calculado'
+TABELA_REAPROVEITADOS = 'Desconsid. Reaproveitados'
+TABELA_SUSPEITAS = 'Suspeitas'
+TABELA_AJUSTES = 'Ajustes Teto e Piso'
 
 # ================================
 # CONFIGURAÇÃO INICIAL PRIMEIRA LINHA
@@ -29,68 +65,171 @@ def login():
 # ================================
 login()
 
-# ================================
-# FUNÇÕES UTILITÁRIAS
-# ================================
-def organizar_cnis(file):
-    df = pd.read_csv(file, delimiter=';', encoding='utf-8')
-    df = df.iloc[:,0].str.split(',', expand=True)
-    df.columns = ['Seq', 'Competência', 'Remuneração', 'Ano']
-    df['Remuneração'] = pd.to_numeric(df['Remuneração'], errors='coerce')
-    df = df[df['Remuneração'] < 50000]  # Remove discrepantes - fuzzy
-    return df
-
-def organizar_desconsiderados(file):
-    df = pd.read_csv(file, delimiter=';', encoding='utf-8')
-    df = df.iloc[:,0].str.split(',', expand=True)
-    df.columns = ['Seq', 'Seq.', 'Data', 'Salário', 'Índice', 'Sal. Corrigido', 'Observação', 'Ano', 'Duplicado']
-    df['Sal. Corrigido'] = pd.to_numeric(df['Sal. Corrigido'], errors='coerce')
-    return df
-
-def fator_previdenciario(Tc, Es, Id, a=0.31):
-    fator = (Tc * a / Es) * (1 + ((Id + Tc * a) / 100))
-    return round(fator, 4)
-
-def formatar_moeda(valor):
-    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
 # ================================
 # UPLOAD
 # ================================
 st.sidebar.header("🔽 Upload dos Arquivos")
+pacote_file = st.sidebar.file_uploader("Abrir Pacote do Caso (dispensa os 3 arquivos)", type=["xlsx", "zip"])
 cnis_file = st.sidebar.file_uploader("Upload - CNIS", type=["csv"])
 carta_file = st.sidebar.file_uploader("Upload - Carta", type=["csv"])
 desconsid_file = st.sidebar.file_uploader("Upload - Desconsiderados", type=["csv"])
 
-aba = st.sidebar.radio("Navegação", ["Dashboard", "Gráficos", "Explicação", "Simulador", "Relatório", "Atualização Monetária"])
+aba = st.sidebar.radio("Navegação", ["Dashboard", "Gráficos", "Explicação", "Simulador", "Relatório", "Atualização Monetária", "Histórico"])
+consolidar_vinculos = st.sidebar.checkbox("Consolidar vínculos por competência", value=True,
+                                          help="Soma vínculos concomitantes e descarta linhas duplicadas antes dos 80%")
+desconsiderar_suspeitos = st.sidebar.checkbox("Desconsiderar remunerações suspeitas", value=False,
+                                              help="Tira do cálculo as remunerações fora do padrão do ano ou com pico isolado (erro de extração)")
+somente_periodo_basico = st.sidebar.checkbox(f"Reaproveitar só no período básico (desde {PERIODO_BASICO[0]})", value=True,
+                                              help="Desconsiderados anteriores ao período básico de cálculo não entram na otimização")
+usar_historico = st.sidebar.checkbox("Histórico local de casos", value=True, help="Reaproveita casos já calculados com os mesmos arquivos e parâmetros")
+
+
+@st.cache_resource
+def abrir_historico():
+    return HistoricoResultados()
+
 
 # ================================
 # PROCESSAMENTO PRINCIPAL
 # ================================
-if cnis_file and carta_file and desconsid_file:
-
-    df_cnis = organizar_cnis(cnis_file)
-    df_desconsiderados = organizar_desconsiderados(desconsid_file)
+if pacote_file or (cnis_file and carta_file and desconsid_file):
+    # Tempos de cada etapa deste rerun (painel de depuração e log auditável)
+    cronometro = Cronometro()
+
+    if pacote_file:
+        with cronometro.etapa("Abertura do pacote") as etapa:
+            caso = abrir_pacote(pacote_file)
+            if TABELA_CNIS not in caso.tabelas or TABELA_DESCONSIDERADOS not in caso.tabelas:
+                st.error("O pacote não contém as tabelas CNIS e Desconsiderados.")
+                st.stop()
+            df_cnis = caso.tabelas[TABELA_CNIS]
+            df_desconsiderados = caso.tabelas[TABELA_DESCONSIDERADOS]
+            parametros_caso = caso.parametros
+            etapa.linhas = len(df_cnis) + len(df_desconsiderados)
+    else:
+        parametros_caso = {}
+        caso_guardado = None
+        if usar_historico:
+            with cronometro.etapa("Consulta ao histórico"):
+                historico = abrir_historico()
+                arquivos_caso = {'cnis': cnis_file, 'carta': carta_file, 'desconsiderados': desconsid_file}
+                if os.path.exists(ARQUIVO_LIMITES_PADRAO):
+                    arquivos_caso['limites'] = ARQUIVO_LIMITES_PADRAO
+                # As opções da barra lateral mudam os resultados guardados: entram na chave
+                opcoes_caso = {'Consolidar Vínculos': consolidar_vinculos, 'Desconsiderar Suspeitas': desconsiderar_suspeitos,
+                               'Só Período Básico': somente_periodo_basico}
+                chave_historico, entradas_historico = chave_caso(arquivos_caso, {**PARAMETROS_PADRAO, **opcoes_caso})
+                caso_guardado = historico.obter(chave_historico)
+        if caso_guardado is not None and TABELA_CNIS in caso_guardado.tabelas:
+            df_cnis = caso_guardado.tabelas[TABELA_CNIS]
+            df_desconsiderados = caso_guardado.tabelas[TABELA_DESCONSIDERADOS]
+        else:
+            with cronometro.etapa("Leitura CNIS") as etapa:
+                df_cnis = ler_cnis(cnis_file)
+                etapa.linhas = len(df_cnis)
+            with cronometro.etapa("Leitura Desconsiderados") as etapa:
+                df_desconsiderados = organizar_desconsiderados(desconsid_file)
+                etapa.linhas = len(df_desconsiderados)
+    tabelas_lidas = {TABELA_CNIS: df_cnis, TABELA_DESCONSIDERADOS: df_desconsiderados}
+
+    # PARÂMETROS DEFAULT (ou os gravados no pacote aberto)
+    parametros = {nome: parametros_caso.get(nome, valor) for nome, valor in PARAMETROS_PADRAO.items()}
+    Tc_default, Es_default, Id_default, a_default = parametros['Tc'], parametros['Es'], parametros['Id'], parametros['a']
+
+    # Caso repetido: tabelas derivadas e resultados vêm do histórico, sem recalcular
+    servido_do_historico = (not pacote_file and caso_guardado is not None
+                            and TABELA_CALCULADO in caso_guardado.tabelas)
+    if servido_do_historico:
+        df_cnis = caso_guardado.tabelas[TABELA_CALCULADO]
+        df_vantajosos = caso_guardado.tabelas[TABELA_REAPROVEITADOS]
+        df_suspeitos = caso_guardado.tabelas[TABELA_SUSPEITAS]
+        ajustes_limites = caso_guardado.tabelas.get(TABELA_AJUSTES)  # ausente: não havia tabela de teto e piso
+        resultados_caso = caso_guardado.resultados
+    else:
+        # ANOMALIAS: pontuadas antes do teto, que mascararia um valor 100× maior; só saem se o usuário pedir
+        with cronometro.etapa("Detecção de anomalias", len(df_cnis)):
+            pontuacao_anomalias = pontuar_anomalias(df_cnis)
+            df_suspeitos = suspeitos(df_cnis, pontuacao_anomalias)
+            if desconsiderar_suspeitos:
+                df_cnis = df_cnis[~pontuacao_anomalias['Suspeito']]
+
+        # CONSOLIDAÇÃO: um salário por competência (vínculos somados, duplicatas descartadas)
+        if consolidar_vinculos:
+            with cronometro.etapa("Consolidação por competência", len(df_cnis)) as etapa:
+                df_cnis = consolidar(df_cnis)
+                etapa.linhas = len(df_cnis)
+
+        # TETO E PISO: depois da consolidação, o teto vale para a soma dos vínculos (sem a tabela, corte fixo de 50.000)
+        with cronometro.etapa("Teto e piso por competência", len(df_cnis)):
+            df_cnis, ajustes_limites = limitar_remuneracoes(df_cnis)
 
     # 80% MAIORES SALÁRIOS
-    df_cnis_sorted = df_cnis.sort_values(by='Remuneração', ascending=False)
-    qtd_80 = int(len(df_cnis_sorted) * 0.8)
-    df_top80 = df_cnis_sorted.head(qtd_80)
-    df_bottom10 = df_cnis_sorted.tail(len(df_cnis_sorted) - qtd_80)
-
-    # DESCONSIDERADOS VANTAJOSOS
-    min_80 = df_top80['Remuneração'].min()
-    df_vantajosos = df_desconsiderados[df_desconsiderados['Sal. Corrigido'] > min_80]
-
-    # PARÂMETROS DEFAULT
-    Tc_default, Es_default, Id_default, a_default = 38, 21.8, 60, 0.31
-    media_salarios = df_top80['Remuneração'].mean()
-    fator = fator_previdenciario(Tc_default, Es_default, Id_default, a_default)
-    salario_beneficio = round(media_salarios * fator, 2)
+    with cronometro.etapa("Seleção 80% maiores", len(df_cnis)):
+        selecao_80 = SelecaoMaiores(df_cnis['Remuneração'])  # partição linear; ordena só ao exibir
+        qtd_80 = selecao_80.qtd
+
+    if not servido_do_historico:
+        # DESCONSIDERADOS REAPROVEITADOS: combinação que maximiza a média, um salário por competência.
+        # Só com o CNIS consolidado: sem ele a média do otimizador não é a dos 80% acima e o ganho não se compara.
+        if consolidar_vinculos:
+            with cronometro.etapa("Reaproveitamento de desconsiderados", len(df_cnis) + len(df_desconsiderados)) as etapa:
+                reaproveitamento = Reaproveitamento(df_cnis, df_desconsiderados,
+                                                    periodo=PERIODO_BASICO if somente_periodo_basico else None)
+                df_vantajosos = reaproveitamento.trocas
+                etapa.linhas = len(df_vantajosos)
+        else:
+            reaproveitamento = None
+            df_vantajosos = pd.DataFrame(columns=list(COLUNAS_TROCAS))
+
+        media_salarios = selecao_80.media
+        fator = fator_previdenciario(Tc_default, Es_default, Id_default, a_default)
+        salario_beneficio = salario_de_beneficio(media_salarios, fator)
+        media_otimizada = media_salarios if reaproveitamento is None else reaproveitamento.media
+        resultados_caso = {
+            '80% Maiores Salários': qtd_80,
+            'Média 80%': media_salarios,
+            'Fator Previdenciário': fator,
+            'Salário de Benefício': salario_beneficio,
+            'Desconsid. Reaproveitados': len(df_vantajosos),
+            # Base do ganho: a mesma média, no mesmo período, sem os desconsiderados
+            'Média 80% sem Reaproveitamento': None if reaproveitamento is None else reaproveitamento.media_original,
+            'Média 80% com Reaproveitamento': None if reaproveitamento is None else media_otimizada,
+            'Salário de Benefício com Reaproveitamento':
+                None if reaproveitamento is None else salario_de_beneficio(media_otimizada, fator),
+        }
 
-    # FORMATAÇÃO MOEDA
-    df_top80['Remuneração'] = df_top80['Remuneração'].apply(formatar_moeda)
-    df_vantajosos['Sal. Corrigido'] = df_vantajosos['Sal. Corrigido'].apply(formatar_moeda)
+    media_salarios = resultados_caso['Média 80%']
+    fator = resultados_caso['Fator Previdenciário']
+    salario_beneficio = resultados_caso['Salário de Benefício']
+    reaproveitamento_ativo = resultados_caso['Média 80% com Reaproveitamento'] is not None
+    media_otimizada = resultados_caso['Média 80% com Reaproveitamento'] if reaproveitamento_ativo else media_salarios
+    salario_beneficio_otimizado = salario_de_beneficio(media_otimizada, fator)
+    media_sem_reaproveitamento = resultados_caso['Média 80% sem Reaproveitamento'] if reaproveitamento_ativo else media_salarios
+    ganho_reaproveitamento = salario_beneficio_otimizado - salario_de_beneficio(media_sem_reaproveitamento, fator)
+
+    # Caso novo (ou guardado sem as derivadas): grava tabelas lidas, derivadas e resultados no histórico local
+    if not pacote_file and usar_historico and not servido_do_historico:
+        tabelas_historico = {
+            **tabelas_lidas,
+            TABELA_CALCULADO: df_cnis,
+            TABELA_REAPROVEITADOS: df_vantajosos,
+            TABELA_SUSPEITAS: df_suspeitos,
+        }
+        if ajustes_limites is not None:
+            tabelas_historico[TABELA_AJUSTES] = ajustes_limites
+        with cronometro.etapa("Gravação no histórico", len(df_cnis) + len(df_desconsiderados)):
+            historico.guardar(
+                chave_historico, entradas_historico, parametros, resultados_caso,
+                tabelas_historico,
+                caso=getattr(cnis_file, 'name', None),
+            )
+
+    # 80% MAIORES EM ORDEM DECRESCENTE (ordenados só ao exibir)
+    def top80_ordenado():
+        with cronometro.etapa("Ordenação 80% maiores", qtd_80):
+            return df_cnis.iloc[selecao_80.ordem]
+
+    parametros_correcao = {}
 
     # ================================
     # DASHBOARD PRINCIPAL
@@ -100,26 +239,55 @@ if cnis_file and carta_file and desconsid_file:
 
         col1, col2, col3 = st.columns(3)
         col1.metric("Total CNIS", len(df_cnis))
-        col2.metric("80% Maiores Salários", len(df_top80))
+        col2.metric("80% Maiores Salários", qtd_80)
         col3.metric("Desconsid. Reaproveitados", len(df_vantajosos))
+        if len(df_suspeitos):
+            st.warning(f"{len(df_suspeitos)} remunerações suspeitas de erro de extração "
+                       f"({'fora do cálculo' if desconsiderar_suspeitos else 'mantidas no cálculo'}).")
+        if ajustes_limites is None:
+            st.caption(f"Sem tabela de teto e piso em {ARQUIVO_LIMITES_PADRAO}: removidas as remunerações acima de R$ 50.000.")
+        elif len(ajustes_limites):
+            st.caption(f"{int((ajustes_limites['Ajuste'] == AJUSTE_TETO).sum())} remunerações limitadas ao teto, "
+                       f"{int((ajustes_limites['Ajuste'] == AJUSTE_PISO).sum())} abaixo do piso")
+        if consolidar_vinculos:
+            st.caption(f"{len(tabelas_lidas[TABELA_CNIS])} linhas do CNIS consolidadas em {len(df_cnis)} competências "
+                       f"({int(df_cnis['Vínculos'].gt(1).sum())} com vínculos concomitantes, "
+                       f"{int(df_cnis['Duplicados'].sum())} linhas duplicadas descartadas)")
 
         st.subheader("🧮 Resultados Previdenciários")
         st.write(f"**Média dos 80% maiores salários:** {formatar_moeda(media_salarios)}")
         st.write(f"**Fator Previdenciário:** {fator}")
         st.write(f"**Salário de Benefício:** {formatar_moeda(salario_beneficio)}")
+        if len(df_vantajosos):
+            st.write(f"**Com desconsiderados reaproveitados:** média {formatar_moeda(media_otimizada)}, "
+                     f"salário de benefício {formatar_moeda(salario_beneficio_otimizado)} "
+                     f"(+{formatar_moeda(ganho_reaproveitamento)} sobre {formatar_moeda(media_sem_reaproveitamento)} "
+                     f"de média no mesmo período)")
+
+        if not reaproveitamento_ativo:
+            st.info("Reaproveitamento de desconsiderados desativado: ele exige um salário por competência. "
+                    "Ative a consolidação de vínculos na barra lateral.")
 
         st.subheader("📄 Tabelas Detalhadas")
-        st.dataframe(df_top80)
-        st.dataframe(df_vantajosos)
+        tabela_paginada(top80_ordenado(), 'top80', moeda=('Remuneração',), cronometro=cronometro)
+        tabela_paginada(df_vantajosos, 'vantajosos', moeda=MOEDA_REAPROVEITAMENTO, cronometro=cronometro)
+        if len(df_suspeitos):
+            tabela_paginada(df_suspeitos, 'suspeitos', moeda=MOEDA_SUSPEITOS, cronometro=cronometro)
+        if ajustes_limites is not None and len(ajustes_limites):
+            tabela_paginada(ajustes_limites, 'limites', moeda=MOEDA_LIMITES, cronometro=cronometro)
 
     # ================================
     # GRÁFICOS
     # ================================
     elif aba == "Gráficos":
         st.title("📊 Visualização Gráfica")
-        df_grafico = df_cnis_sorted.head(qtd_80)
-        st.bar_chart(data=df_grafico, x='Competência', y='Remuneração')
-        st.line_chart(data=df_grafico, x='Competência', y='Remuneração')
+        # Ordem cronológica, agrupado por período; séries longas reduzidas por LTTB
+        periodo, agregacao = controles_grafico('graficos')
+        with cronometro.etapa("Série do gráfico", qtd_80) as etapa:
+            df_grafico = serie_grafico(df_cnis.iloc[selecao_80.maiores], periodo, agregacao)
+            etapa.linhas = len(df_grafico)
+        st.bar_chart(data=df_grafico, x='Período', y='Remuneração')
+        st.line_chart(data=df_grafico, x='Período', y='Remuneração')
 
     # ================================
     # EXPLICAÇÃO
@@ -147,14 +315,60 @@ if cnis_file and carta_file and desconsid_file:
     # ================================
     elif aba == "Simulador":
         st.title("⚙️ Simulador Previdenciário")
-        Tc_input = st.number_input("Tempo de Contribuição (anos)", value=38)
-        Es_input = st.number_input("Expectativa Sobrevida", value=21.8)
-        Id_input = st.number_input("Idade", value=60)
-        a_input = st.number_input("Alíquota", value=0.31)
-        fator_simulado = fator_previdenciario(Tc_input, Es_input, Id_input, a_input)
-        salario_simulado = round(media_salarios * fator_simulado, 2)
-        st.write(f"**Fator Previdenciário Simulado:** {fator_simulado}")
-        st.write(f"**Salário Benefício Simulado:** {formatar_moeda(salario_simulado)}")
+        modo_simulador = st.radio("Modo", ["Cenário único", "Grade de cenários"], horizontal=True)
+
+        if modo_simulador == "Cenário único":
+            Tc_input = st.number_input("Tempo de Contribuição (anos)", value=38)
+            Id_input = st.number_input("Idade", value=60)
+            if os.path.exists(ARQUIVO_TABUA_PADRAO) and st.checkbox("Expectativa Sobrevida pela tábua do IBGE", value=True):
+                concessao = st.text_input("Competência da concessão (MM/AAAA)", value="12/2019")
+                Es_input = float(carregar_tabua().expectativa(Id_input, concessao)[0])
+                if Es_input != Es_input:  # NaN: idade ou ano fora da tábua
+                    st.warning("Sem expectativa de sobrevida na tábua para essa idade e concessão; usando 21,8.")
+                    Es_input = 21.8
+                st.write(f"**Expectativa Sobrevida (tábua):** {Es_input}")
+            else:
+                Es_input = st.number_input("Expectativa Sobrevida", value=21.8)
+            a_input = st.number_input("Alíquota", value=0.31)
+            fator_simulado = fator_previdenciario(Tc_input, Es_input, Id_input, a_input)
+            salario_simulado = salario_de_beneficio(media_salarios, fator_simulado)
+            st.write(f"**Fator Previdenciário Simulado:** {fator_simulado}")
+            st.write(f"**Salário Benefício Simulado:** {formatar_moeda(salario_simulado)}")
+
+        else:
+            # Todas as combinações calculadas de uma vez (broadcast em NumPy)
+            col1, col2, col3 = st.columns(3)
+            Tc_faixa = col1.slider("Tempo de Contribuição (anos)", 15, 50, (30, 45))
+            Id_faixa = col2.slider("Idade", 40, 80, (55, 70))
+            Es_faixa = col3.slider("Expectativa Sobrevida", 10.0, 35.0, (18.0, 25.0), step=0.1)
+            Es_passo = col3.number_input("Passo da Expectativa", value=0.5, min_value=0.1, step=0.1)
+            a_input = st.number_input("Alíquota", value=0.31)
+
+            with cronometro.etapa("Grade de cenários") as etapa:
+                df_grade = grade_fator(
+                    media_salarios,
+                    faixa(*Tc_faixa, 1),
+                    faixa(*Id_faixa, 1),
+                    faixa(*Es_faixa, Es_passo),
+                    a_input,
+                )
+                etapa.linhas = len(df_grade)
+            melhor = df_grade.loc[df_grade['Salário de Benefício'].idxmax()]
+            st.write(f"**Cenários avaliados:** {len(df_grade)}")
+            st.write(f"**Melhor cenário:** Tc = {melhor['Tc']:.0f}, Id = {melhor['Id']:.0f}, Es = {melhor['Es']:.1f} "
+                     f"→ Fator {melhor['Fator']} | {formatar_moeda(melhor['Salário de Benefício'])}")
+
+            Es_mapa = st.select_slider("Expectativa Sobrevida no mapa de calor", options=sorted(df_grade['Es'].unique()), value=melhor['Es'])
+            st.altair_chart(
+                alt.Chart(df_grade[df_grade['Es'] == Es_mapa]).mark_rect().encode(
+                    x=alt.X('Tc:O', title="Tempo de Contribuição"),
+                    y=alt.Y('Id:O', title="Idade", sort='descending'),
+                    color=alt.Color('Salário de Benefício:Q', scale=alt.Scale(scheme='viridis')),
+                    tooltip=['Tc', 'Id', 'Es', 'Fator', alt.Tooltip('Salário de Benefício:Q', format=',.2f')],
+                ),
+                use_container_width=True,
+            )
+            tabela_paginada(df_grade.sort_values('Salário de Benefício', ascending=False), 'grade', moeda=('Salário de Benefício',), cronometro=cronometro)
 
     # ================================
     # RELATÓRIO FINAL
@@ -168,15 +382,15 @@ if cnis_file and carta_file and desconsid_file:
         Este relatório apresenta os resultados detalhados do processamento previdenciário conforme os dados enviados e as regras aplicadas.
         """)
         st.markdown(f"**Total de registros CNIS:** {len(df_cnis)}")
-        st.markdown(f"**80% maiores salários considerados:** {len(df_top80)}")
+        st.markdown(f"**80% maiores salários considerados:** {qtd_80}")
         st.markdown(f"**Salários desconsiderados reaproveitados:** {len(df_vantajosos)}")
         st.markdown("---")
 
         st.subheader("📌 Detalhamento dos 80% Maiores Salários")
-        st.dataframe(df_top80)
+        tabela_paginada(top80_ordenado(), 'top80', moeda=('Remuneração',), cronometro=cronometro)
 
         st.subheader("📌 Salários Desconsiderados Reaproveitados")
-        st.dataframe(df_vantajosos)
+        tabela_paginada(df_vantajosos, 'vantajosos', moeda=MOEDA_REAPROVEITAMENTO, cronometro=cronometro)
 
         st.subheader("📌 Fórmula Previdenciária Aplicada")
         st.latex(r'''
@@ -185,6 +399,9 @@ if cnis_file and carta_file and desconsid_file:
         st.markdown(f"**Fator aplicado:** {fator}")
         st.markdown(f"**Média dos salários:** {formatar_moeda(media_salarios)}")
         st.markdown(f"**Salário de Benefício Final:** {formatar_moeda(salario_beneficio)}")
+        if len(df_vantajosos):
+            st.markdown(f"**Média com desconsiderados reaproveitados:** {formatar_moeda(media_otimizada)}")
+            st.markdown(f"**Salário de Benefício com reaproveitamento:** {formatar_moeda(salario_beneficio_otimizado)}")
         st.markdown("---")
 
         st.markdown("📎 **Este relatório pode ser impresso diretamente em PDF.**")
@@ -193,60 +410,111 @@ if cnis_file and carta_file and desconsid_file:
     # ATUALIZAÇÃO MONETÁRIA
     # ================================
     elif aba == "Atualização Monetária":
-        st.title("💰 Atualização Monetária por Período Econômico")
-        st.markdown("Aplique atualização monetária em cascata com índices ajustáveis para planos econômicos.")
-
-        indices_ano = {
-            '1980': st.number_input("Índice 1980-1990", value=5000.0),
-            '1990': st.number_input("Índice 1990-1994", value=1000.0),
-            '1994': st.number_input("Índice 1994-2000", value=2.75),
-            '2000': st.number_input("Índice 2000-2010", value=1.3),
-            '2010': st.number_input("Índice 2010-2020", value=1.1),
-            '2020': st.number_input("Índice 2020+", value=1.05),
-        }
-
-        def atualizar_valor_plano(competencia, salario):
-            ano = int(competencia.split('/')[-1])
-            if ano < 1990:
-                fator = indices_ano['1980']
-            elif ano < 1994:
-                fator = indices_ano['1990']
-            elif ano < 2000:
-                fator = indices_ano['1994']
-            elif ano < 2010:
-                fator = indices_ano['2000']
-            elif ano < 2020:
-                fator = indices_ano['2010']
-            else:
-                fator = indices_ano['2020']
-            salario_corrigido = salario * fator
-            return round(salario_corrigido, 2)
-
-        df_cnis['Remuneração Corrigida'] = df_cnis.apply(
-            lambda row: atualizar_valor_plano(str(row['Competência']), row['Remuneração']), axis=1
-        )
+        st.title("💰 Atualização Monetária")
+        st.markdown("Corrija cada competência pela série mensal de índices ou, na falta dela, por índices ajustáveis por período econômico.")
+
+        metodos = ["Índice mensal", "Períodos econômicos"]
+        metodo = st.radio("Método de correção", metodos, index=0 if os.path.exists(ARQUIVO_INDICES_PADRAO) else 1, horizontal=True)
+
+        if metodo == "Índice mensal":
+            caminho_indices = st.text_input("Série mensal de índices (CSV ou Parquet com Competência, Índice)", value=ARQUIVO_INDICES_PADRAO)
+            try:
+                serie_indices = carregar_serie(caminho_indices)
+            except (OSError, ValueError, ImportError) as erro:
+                st.error(f"Não foi possível carregar a série de índices: {erro}")
+                st.stop()
+            competencia_alvo = st.selectbox("Corrigir até a competência", serie_indices.competencias_alvo())
+
+            with cronometro.etapa("Correção monetária (índice mensal)", len(df_cnis)):
+                df_cnis['Remuneração Corrigida'] = serie_indices.corrigir(
+                    df_cnis['Competência'], df_cnis['Remuneração'], competencia_alvo
+                )
+            parametros_correcao = {'Série de Índices': caminho_indices, 'Competência-Alvo': competencia_alvo}
+
+        else:
+            indices_ano = {
+                '1980': st.number_input("Índice 1980-1990", value=5000.0),
+                '1990': st.number_input("Índice 1990-1994", value=1000.0),
+                '1994': st.number_input("Índice 1994-2000", value=2.75),
+                '2000': st.number_input("Índice 2000-2010", value=1.3),
+                '2010': st.number_input("Índice 2010-2020", value=1.1),
+                '2020': st.number_input("Índice 2020+", value=1.05),
+            }
+
+            with cronometro.etapa("Correção monetária (períodos)", len(df_cnis)):
+                df_cnis['Remuneração Corrigida'] = atualizar_valores_plano(
+                    df_cnis['Competência'], df_cnis['Remuneração'], indices_ano
+                )
+            parametros_correcao = {'Índices Econômicos Aplicados': indices_ano}
 
         st.subheader("Tabela com Remunerações Corrigidas")
-        st.dataframe(df_cnis[['Competência', 'Remuneração', 'Remuneração Corrigida']])
+        tabela_paginada(df_cnis[['Competência', 'Remuneração', 'Remuneração Corrigida']], 'corrigidas', moeda=('Remuneração', 'Remuneração Corrigida'), cronometro=cronometro)
 
-        salarios_corrigidos = df_cnis['Remuneração Corrigida'].dropna().astype(float)
-        salarios_ordenados = salarios_corrigidos.sort_values(ascending=False)
-        n_corrigido = int(len(salarios_ordenados) * 0.8)
-        media_80_corrigida = round(salarios_ordenados.iloc[:n_corrigido].mean(), 2)
-        salario_beneficio_corrigido = round(media_80_corrigida * fator, 2)
+        with cronometro.etapa("Seleção 80% corrigida", len(df_cnis)):
+            salarios_corrigidos = df_cnis['Remuneração Corrigida'].dropna().astype(float)
+            media_80_corrigida = round(SelecaoMaiores(salarios_corrigidos).media, 2)
+        salario_beneficio_corrigido = salario_de_beneficio(media_80_corrigida, fator)
 
         st.write(f"**Média dos 80% maiores salários corrigidos:** {formatar_moeda(media_80_corrigida)}")
         st.write(f"**Salário de Benefício Corrigido:** {formatar_moeda(salario_beneficio_corrigido)}")
 
         # Log auditável
         log_corrigido = {
-            'Índices Econômicos Aplicados': indices_ano,
+            **parametros_correcao,
             'Média 80% Corrigida': media_80_corrigida,
             'Fator Previdenciário': fator,
-            'Salário Benefício Corrigido': salario_beneficio_corrigido
+            'Salário Benefício Corrigido': salario_beneficio_corrigido,
+            'Remunerações Suspeitas': df_suspeitos[['Competência', 'Remuneração', 'Pontuação']].to_dict('records'),
+            'Suspeitas Desconsideradas': desconsiderar_suspeitos,
+            'Ajustes Teto/Piso': [] if ajustes_limites is None else ajustes_limites.to_dict('records'),
+            # Tempos das etapas deste rerun até aqui, para acompanhar a latência real
+            'Tempos por Etapa': cronometro.resumo(),
         }
         log_json = json.dumps(log_corrigido, indent=4)
         st.download_button("Baixar Log Auditável", log_json, file_name="log_auditoria_corrigido.json")
 
+    # ================================
+    # HISTÓRICO DE CASOS
+    # ================================
+    elif aba == "Histórico":
+        st.title("🗂️ Histórico de Casos Calculados")
+        if not usar_historico:
+            st.info("Ative o histórico local de casos na barra lateral.")
+        else:
+            df_historico = abrir_historico().consultar()
+            st.caption(f"{len(df_historico)} casos guardados em {abrir_historico().caminho}")
+            if not df_historico.empty:
+                tabela_paginada(df_historico.drop(columns=['Chave', 'Entradas']), 'historico',
+                                moeda=('Média 80%', 'Salário de Benefício'), cronometro=cronometro)
+
+    # ================================
+    # PACOTE DO CASO
+    # ================================
+    formatos = formatos_disponiveis()
+    if formatos and st.sidebar.checkbox("Gerar Pacote do Caso"):
+        formato_pacote = st.sidebar.selectbox("Formato do Pacote", formatos)
+        with cronometro.etapa("Exportação do pacote", len(df_cnis) + len(df_desconsiderados)):
+            pacote = exportar_pacote(
+                {
+                    # Tabelas como lidas: ao reabrir, teto, anomalias e consolidação são aplicados uma única vez
+                    **tabelas_lidas,
+                    TABELA_CALCULADO: df_cnis,
+                    '80% Maiores Salários': df_cnis.iloc[selecao_80.ordem],
+                    TABELA_REAPROVEITADOS: df_vantajosos,
+                },
+                {**parametros, **parametros_correcao},
+                resultados_caso,
+                formato_pacote,
+            )
+        st.sidebar.download_button(
+            "⬇️ Baixar Pacote do Caso", pacote,
+            file_name=f"pacote_caso.{EXTENSAO_PACOTE[formato_pacote]}", mime=MIME_PACOTE[formato_pacote],
+        )
+
+    # ================================
+    # DEPURAÇÃO: TEMPOS POR ETAPA
+    # ================================
+    painel_tempos(cronometro)
+
 else:
-    st.info("🔔 Faça upload dos 3 arquivos obrigatórios para liberar o dashboard.")
+    st.info("🔔 Faça upload dos 3 arquivos obrigatórios (ou de um Pacote do Caso) para liberar o dashboard.")
@@ -2,6 +2,11 @@ import streamlit as st
 import pandas as pd
 import json
 
+from previdencia.beneficio import salario_de_beneficio
+from previdencia.correcao import atualizar_valores_plano
+from previdencia.formatacao import formatar_moeda
+from previdencia.selecao import SelecaoMaiores
+
 st.set_page_config(page_title="Dashboard Previdenciário Profissional", layout="wide")
 
 # ================================
@@ -49,42 +54,23 @@ if uploaded_file:
         '2020': st.number_input("Índice 2020+", value=1.05),
     }
 
-    def atualizar_valor_plano(competencia, salario):
-        ano = int(competencia.split('/')[-1])
-        if ano < 1990:
-            fator = indices_ano['1980']
-        elif ano < 1994:
-            fator = indices_ano['1990']
-        elif ano < 2000:
-            fator = indices_ano['1994']
-        elif ano < 2010:
-            fator = indices_ano['2000']
-        elif ano < 2020:
-            fator = indices_ano['2010']
-        else:
-            fator = indices_ano['2020']
-        salario_corrigido = salario * fator
-        return round(salario_corrigido, 2)
-
-    df['Remuneração Corrigida'] = df.apply(
-        lambda row: atualizar_valor_plano(str(row['Competência']), row['Remuneração']), axis=1
+    df['Remuneração Corrigida'] = atualizar_valores_plano(
+        df['Competência'], df['Remuneração'], indices_ano
     )
 
     st.subheader("Salários Corrigidos")
     st.dataframe(df[['Competência', 'Remuneração', 'Remuneração Corrigida']])
 
     salarios_corrigidos = df['Remuneração Corrigida'].dropna().astype(float)
-    salarios_ordenados = salarios_corrigidos.sort_values(ascending=False)
-    n = int(len(salarios_ordenados) * 0.8)
-    media_80 = round(salarios_ordenados.iloc[:n].mean(), 2)
+    media_80 = round(SelecaoMaiores(salarios_corrigidos).media, 2)
 
     fator_previdenciario = 0.9322
-    salario_beneficio = round(media_80 * fator_previdenciario, 2)
+    salario_beneficio = salario_de_beneficio(media_80, fator_previdenciario)
 
     st.subheader("Resultados")
-    st.write(f"**Média dos 80% maiores salários corrigidos:** R$ {media_80:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+    st.write(f"**Média dos 80% maiores salários corrigidos:** {formatar_moeda(media_80)}")
     st.write(f"**Fator Previdenciário Aplicado:** {fator_previdenciario}")
-    st.write(f"**Salário de Benefício Final:** R$ {salario_beneficio:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+    st.write(f"**Salário de Benefício Final:** {formatar_moeda(salario_beneficio)}")
 
     log = {
         'Índices Econômicos Aplicados': indices_ano,
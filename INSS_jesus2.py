@@ -1,6 +1,12 @@
 import streamlit as st
 import pandas as pd
 
+from previdencia.beneficio import fator_previdenciario, salario_de_beneficio
+from previdencia.graficos import serie_grafico
+from previdencia.interface import download_csv
+from previdencia.leitura import ler_cnis, organizar_desconsiderados
+from previdencia.selecao import SelecaoMaiores
+
 st.set_page_config(page_title="Dashboard Previdenciário Completo", layout="wide")
 
 st.title("📑 Dashboard Previdenciário Completo com Reprocessamento")
@@ -12,29 +18,17 @@ carta_file = st.sidebar.file_uploader("Upload - 80% Maiores Salários Carta", ty
 desconsid_file = st.sidebar.file_uploader("Upload - Salários Desconsiderados", type=["csv"])
 
 if cnis_file and carta_file and desconsid_file:
-    # Leitura dos arquivos
-    df_cnis = pd.read_csv(cnis_file, delimiter=';', encoding='utf-8')
-    df_carta = pd.read_csv(carta_file, delimiter=';', encoding='utf-8')
-    df_desconsiderados = pd.read_csv(desconsid_file, delimiter=';', encoding='utf-8')
-
-    # Organizando CNIS
-    df_cnis = df_cnis.iloc[:,0].str.split(',', expand=True)
-    df_cnis.columns = ['Seq', 'Competência', 'Remuneração', 'Ano']
-    df_cnis['Remuneração'] = pd.to_numeric(df_cnis['Remuneração'], errors='coerce')
+    # Leitura dos arquivos (CNIS sem o filtro de discrepantes)
+    df_cnis = ler_cnis(cnis_file)
+    df_desconsiderados = organizar_desconsiderados(desconsid_file)
 
     # 80% maiores salários CNIS
-    df_cnis_sorted = df_cnis.sort_values(by='Remuneração', ascending=False)
-    qtd_80 = int(len(df_cnis_sorted) * 0.8)
-    df_top80 = df_cnis_sorted.head(qtd_80)
-    df_bottom10 = df_cnis_sorted.tail(len(df_cnis_sorted) - qtd_80)
-
-    # Organizando desconsiderados
-    df_desconsiderados = df_desconsiderados.iloc[:,0].str.split(',', expand=True)
-    df_desconsiderados.columns = ['Seq', 'Seq.', 'Data', 'Salário', 'Índice', 'Sal. Corrigido', 'Observação', 'Ano', 'Duplicado']
-    df_desconsiderados['Sal. Corrigido'] = pd.to_numeric(df_desconsiderados['Sal. Corrigido'], errors='coerce')
+    selecao_80 = SelecaoMaiores(df_cnis['Remuneração'])
+    df_top80 = df_cnis.iloc[selecao_80.ordem]
+    df_bottom10 = df_cnis.iloc[selecao_80.ordem_descartados]
 
     # Verificando vantagem
-    min_80 = df_top80['Remuneração'].min()
+    min_80 = selecao_80.minimo
     df_vantajosos = df_desconsiderados[df_desconsiderados['Sal. Corrigido'] > min_80]
 
     # Métrica Resumo
@@ -46,10 +40,11 @@ if cnis_file and carta_file and desconsid_file:
 
     # Gráficos com Streamlit Charts
     st.subheader("📊 Comparativo CNIS - 80% Maiores Salários")
-    st.bar_chart(data=df_top80, x='Competência', y='Remuneração', use_container_width=True)
+    df_grafico = serie_grafico(df_top80, 'Ano')  # ordem cronológica, agrupado por ano
+    st.bar_chart(data=df_grafico, x='Período', y='Remuneração', use_container_width=True)
 
     st.subheader("📈 Evolução Média Salarial - CNIS")
-    st.line_chart(data=df_top80, x='Competência', y='Remuneração', use_container_width=True)
+    st.line_chart(data=df_grafico, x='Período', y='Remuneração', use_container_width=True)
 
     # Tabelas detalhadas
     st.subheader("📄 80% Maiores Salários")
@@ -62,9 +57,6 @@ if cnis_file and carta_file and desconsid_file:
     # Aplicação Fator Previdenciário com funções
     st.subheader("🧮 Cálculo Fator Previdenciário e Benefício")
 
-    def calcular_fator_previdenciario(Tc, Es, Id, a):
-        return round((Tc * a / Es) * (1 + (Id + Tc * a) / 100), 4)
-
     def calcular_media_salarios(df):
         return round(df['Remuneração'].mean(), 2)
 
@@ -74,8 +66,8 @@ if cnis_file and carta_file and desconsid_file:
     Id = 60
     a = 0.31
 
-    fator = calcular_fator_previdenciario(Tc, Es, Id, a)
-    salario_beneficio = round(media * fator, 2)
+    fator = fator_previdenciario(Tc, Es, Id, a)
+    salario_beneficio = salario_de_beneficio(media, fator)
 
     # Exibição detalhada com LaTeX
     st.latex(r"\text{Fator Previdenciário} = \frac{Tc \times a}{Es} \times \left(1 + \frac{Id + Tc \times a}{100}\right)")
@@ -100,7 +92,7 @@ if cnis_file and carta_file and desconsid_file:
     st.dataframe(consolidado_final)
 
     # Download da planilha consolidada
-    st.sidebar.download_button(label="⬇️ Baixar Consolidação Final (CSV)", data=consolidado_final.to_csv(index=False).encode('utf-8'), file_name='Consolidado_Final.csv', mime='text/csv')
+    download_csv("Consolidação Final (CSV)", consolidado_final, "Consolidado_Final.csv", 'consolidado_final', destino=st.sidebar)
 
     # Regra de pertinência
     st.subheader("⚠️ Análise de Pertinência")
@@ -1,7 +1,19 @@
 import streamlit as st
-import pandas as pd
-import re
-from io import StringIO
+
+from previdencia.anomalias import pontuar_anomalias, suspeitos
+from previdencia.conciliacao import SITUACOES, conciliar, divergencias, resumo_conciliacao
+from previdencia.extracao import estrutura_carta, estrutura_cnis
+from previdencia.interface import download_csv, painel_tempos
+from previdencia.medicao import Cronometro
+from previdencia.pacote import (
+    EXTENSAO_PACOTE,
+    MIME_PACOTE,
+    TABELA_CARTA,
+    TABELA_CNIS,
+    TABELA_DESCONSIDERADOS,
+    exportar_pacote,
+    formatos_disponiveis,
+)
 
 # ===================== CONFIG PÁGINA =====================
 st.set_page_config(page_title="Jesus e INSS | Extrator CNIS + Carta Benefício", layout="wide")
@@ -23,6 +35,8 @@ def login():
 
 # ===================== EXECUTA LOGIN =====================
 if login():  # Executa o login
+    cronometro = Cronometro()  # tempos de cada etapa deste rerun (painel de depuração)
+
     # ===================== RECEPÇÃO DOS TXT =====================
     col1, col2 = st.columns(2)
 
@@ -32,51 +46,6 @@ if login():  # Executa o login
     with col2:
         uploaded_carta_txt = st.file_uploader("🔽 Upload do arquivo Carta Benefício (TXT):", type="txt", key="carta_txt")
 
-    # ===================== FUNÇÕES BASE =====================
-
-    def ler_texto(uploaded_file):
-        stringio = StringIO(uploaded_file.getvalue().decode("utf-8", errors='ignore'))
-        texto = stringio.read()
-        return texto
-
-    def estrutura_cnis(texto):
-        linhas = texto.split('\n')
-        data = []
-        for line in linhas:
-            match = re.search(r"(\d{2}/\d{4})\s+([0-9.]+,[0-9]{2})", line)
-            if match:
-                competencia = match.group(1)
-                remuneracao = match.group(2).replace('.', '').replace(',', '.')
-                data.append({'Competência': competencia, 'Remuneração': remuneracao})
-        return pd.DataFrame(data)
-
-    def estrutura_carta(texto):
-        linhas = texto.split('\n')
-        data = []
-        for line in linhas:
-            match = re.match(r"^(\d{3})\s+(\d{2}/\d{4})\s+([0-9.,]+)\s+([0-9.,]+)\s+([0-9.,]+)(\s+.*)?", line)
-            if match:
-                seq = match.group(1)
-                data_col = match.group(2)
-                salario = match.group(3).replace('.', '').replace(',', '.')
-                indice = match.group(4).replace(',', '.')
-                sal_corrigido = match.group(5).replace('.', '').replace(',', '.')
-                observacao = match.group(6).strip() if match.group(6) else ""
-                data.append({
-                    'Seq.': seq,
-                    'Data': data_col,
-                    'Salário': salario,
-                    'Índice': indice,
-                    'Sal. Corrigido': sal_corrigido,
-                    'Observação': observacao
-                })
-        return pd.DataFrame(data)
-
-    def exportar_csv(df, nome_base):
-        nome_arquivo = f"{nome_base}.csv"
-        df.to_csv(nome_arquivo, index=False)
-        return nome_arquivo
-
     # ===================== SEPARAÇÃO DOS DADOS =====================
 
     def separar_desconsiderados(df_carta):
@@ -96,12 +65,18 @@ if login():  # Executa o login
     with col3:
         st.markdown("### 📄 Extrato CNIS")
         if uploaded_cnis_txt is not None:
-            texto_txt = ler_texto(uploaded_cnis_txt)
-            df_cnis = estrutura_cnis(texto_txt)
+            with cronometro.etapa("Leitura CNIS (TXT)") as etapa:
+                df_cnis = estrutura_cnis(uploaded_cnis_txt)
+                etapa.linhas = len(df_cnis)
             if not df_cnis.empty:
                 st.dataframe(df_cnis, use_container_width=True)
-                file_output = exportar_csv(df_cnis, "Extrato_CNIS_Organizado")
-                st.download_button("⬇️ Baixar CNIS CSV", data=open(file_output, 'rb'), file_name=file_output, mime='text/csv')
+                download_csv("CNIS CSV", df_cnis, "Extrato_CNIS_Organizado.csv", 'cnis')
+                # Erros de OCR/extração (ex.: vírgula fora do lugar) aparecem como valores fora do padrão do período
+                with cronometro.etapa("Detecção de anomalias", len(df_cnis)):
+                    df_suspeitos = suspeitos(df_cnis, pontuar_anomalias(df_cnis))
+                if len(df_suspeitos):
+                    st.warning(f"⚠️ {len(df_suspeitos)} remunerações suspeitas de erro de extração: confira no TXT original.")
+                    st.dataframe(df_suspeitos, use_container_width=True)
             else:
                 st.warning("⚠️ Nenhum dado CNIS identificado.")
         else:
@@ -110,12 +85,12 @@ if login():  # Executa o login
     with col4:
         st.markdown("### 📄 Carta Benefício")
         if uploaded_carta_txt is not None:
-            texto_txt = ler_texto(uploaded_carta_txt)
-            df_carta = estrutura_carta(texto_txt)
+            with cronometro.etapa("Leitura Carta (TXT)") as etapa:
+                df_carta = estrutura_carta(uploaded_carta_txt)
+                etapa.linhas = len(df_carta)
             if not df_carta.empty:
                 st.dataframe(df_carta, use_container_width=True)
-                file_output = exportar_csv(df_carta, "Carta_Beneficio_Organizada")
-                st.download_button("⬇️ Baixar Carta CSV", data=open(file_output, 'rb'), file_name=file_output, mime='text/csv')
+                download_csv("Carta CSV", df_carta, "Carta_Beneficio_Organizada.csv", 'carta')
 
                 # Separando os dados considerados e desconsiderados
                 df_considerados, df_desconsiderados = separar_desconsiderados(df_carta)
@@ -124,8 +99,7 @@ if login():  # Executa o login
                 st.subheader("📄 Dados Considerados")
                 if not df_considerados.empty:
                     st.dataframe(df_considerados, use_container_width=True)
-                    file_output_considerados = exportar_csv(df_considerados, "Dados_Considerados")
-                    st.download_button("⬇️ Baixar Dados Considerados CSV", data=open(file_output_considerados, 'rb'), file_name=file_output_considerados, mime='text/csv')
+                    download_csv("Dados Considerados CSV", df_considerados, "Dados_Considerados.csv", 'considerados')
                 else:
                     st.warning("⚠️ Nenhum dado considerado identificado.")
 
@@ -133,8 +107,7 @@ if login():  # Executa o login
                 st.subheader("📄 Dados Desconsiderados")
                 if not df_desconsiderados.empty:
                     st.dataframe(df_desconsiderados, use_container_width=True)
-                    file_output_desconsiderados = exportar_csv(df_desconsiderados, "Dados_Desconsiderados")
-                    st.download_button("⬇️ Baixar Dados Desconsiderados CSV", data=open(file_output_desconsiderados, 'rb'), file_name=file_output_desconsiderados, mime='text/csv')
+                    download_csv("Dados Desconsiderados CSV", df_desconsiderados, "Dados_Desconsiderados.csv", 'desconsiderados')
                 else:
                     st.warning("⚠️ Nenhum dado desconsiderado identificado.")
             else:
@@ -142,6 +115,49 @@ if login():  # Executa o login
         else:
             st.info("Faça upload do TXT da Carta para visualizar.")
 
+    # ===================== CONCILIAÇÃO CNIS × CARTA =====================
+    df_conciliacao = None
+    if uploaded_cnis_txt is not None and uploaded_carta_txt is not None and not df_cnis.empty and not df_carta.empty:
+        st.subheader("🔎 Conciliação CNIS × Carta Benefício")
+        tolerancia = st.number_input("Tolerância (R$)", value=0.01, min_value=0.0, step=0.01, format="%.2f")
+        with cronometro.etapa("Conciliação CNIS × Carta", len(df_cnis) + len(df_carta)) as etapa:
+            df_conciliacao = conciliar(df_cnis, df_carta, tolerancia)
+            etapa.linhas = len(df_conciliacao)
+        resumo = resumo_conciliacao(df_conciliacao)
+        for coluna, situacao in zip(st.columns(len(SITUACOES)), SITUACOES):
+            coluna.metric(situacao, resumo[situacao])
+
+        df_divergencias = divergencias(df_conciliacao)
+        if df_divergencias.empty:
+            st.success("✅ CNIS e Carta conferem em todas as competências.")
+        else:
+            st.dataframe(df_divergencias, use_container_width=True)
+        download_csv("Conciliação CSV", df_conciliacao, "Conciliacao_CNIS_Carta.csv", 'conciliacao')
+
+    # ===================== PACOTE DO CASO =====================
+    formatos = formatos_disponiveis()
+    if uploaded_cnis_txt is not None and uploaded_carta_txt is not None and formatos:
+        st.subheader("📦 Pacote do Caso")
+        st.caption("Todas as tabelas em um único arquivo, que pode ser aberto direto no dashboard sem reenviar os TXT.")
+        df_considerados, df_desconsiderados = separar_desconsiderados(df_carta)
+        formato_pacote = st.selectbox("Formato", formatos)
+        with cronometro.etapa("Exportação do pacote", len(df_cnis) + len(df_carta)):
+            pacote = exportar_pacote(
+                {
+                    TABELA_CNIS: df_cnis,
+                    TABELA_CARTA: df_carta,
+                    'Considerados': df_considerados,
+                    TABELA_DESCONSIDERADOS: df_desconsiderados,
+                    **({'Conciliação': df_conciliacao} if df_conciliacao is not None else {}),
+                },
+                formato=formato_pacote,
+            )
+        st.download_button("⬇️ Baixar Pacote do Caso", pacote,
+                           file_name=f"pacote_caso.{EXTENSAO_PACOTE[formato_pacote]}", mime=MIME_PACOTE[formato_pacote])
+
     # ===================== FEEDBACK =====================
     if uploaded_cnis_txt is None and uploaded_carta_txt is None:
         st.info("👆 Faça upload dos arquivos CNIS e Carta Benefício em TXT para iniciar.")
+
+    # ===================== DEPURAÇÃO =====================
+    painel_tempos(cronometro)
@@ -1,6 +1,11 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
+
+from previdencia.beneficio import fator_previdenciario, salario_de_beneficio
+from previdencia.graficos import serie_grafico
+from previdencia.interface import download_csv
+from previdencia.leitura import organizar_cnis, organizar_desconsiderados
+from previdencia.selecao import SelecaoMaiores
 
 st.set_page_config(page_title="Dashboard Previdenciário Inteligente", layout="wide")
 st.title("📑 Dashboard Previdenciário com Regras Fuzzy e LaTeX")
@@ -12,30 +17,16 @@ carta_file = st.sidebar.file_uploader("Upload - Carta", type=["csv"])
 desconsid_file = st.sidebar.file_uploader("Upload - Desconsiderados", type=["csv"])
 
 # Funções Modularizadas
-def organizar_cnis(file):
-    df = pd.read_csv(file, delimiter=';', encoding='utf-8')
-    df = df.iloc[:,0].str.split(',', expand=True)
-    df.columns = ['Seq', 'Competência', 'Remuneração', 'Ano']
-    df['Remuneração'] = pd.to_numeric(df['Remuneração'], errors='coerce')
-    return df
-
-def remover_outliers(df, limite_superior=50000):
-    """γ (Gama) - Correção crítica para remover salários absurdos"""
-    df_filtrado = df[df['Remuneração'] < limite_superior]
-    return df_filtrado
-
 def calcular_80_maiores(df):
-    df_sorted = df.sort_values(by='Remuneração', ascending=False)
-    qtd_80 = int(len(df_sorted) * 0.8)
-    df_top = df_sorted.head(qtd_80)
-    df_bottom = df_sorted.tail(len(df_sorted) - qtd_80)
+    selecao = SelecaoMaiores(df['Remuneração'])
+    df_top = df.iloc[selecao.ordem]
+    df_bottom = df.iloc[selecao.ordem_descartados]
     return df_top, df_bottom
 
 def aplicar_fator_previdenciario(media, Tc=38, Es=21.8, Id=60, a=0.31):
     """θ (Theta) - Otimização matemática"""
-    fator = (Tc * a / Es) * (1 + (Id + Tc * a)/100)
-    fator = round(fator, 4)
-    salario_beneficio = round(media * fator, 2)
+    fator = fator_previdenciario(Tc, Es, Id, a)
+    salario_beneficio = salario_de_beneficio(media, fator)
     return fator, salario_beneficio
 
 def apresentar_calculo_latex(media, fator, salario_beneficio):
@@ -49,16 +40,12 @@ def apresentar_calculo_latex(media, fator, salario_beneficio):
 
 if cnis_file and carta_file and desconsid_file:
     # α (Alfa) - Organização
-    df_cnis = organizar_cnis(cnis_file)
-    df_cnis = remover_outliers(df_cnis, limite_superior=50000)
+    df_cnis = organizar_cnis(cnis_file)  # γ (Gama) - já limita ao teto (sem a tabela, remove acima de 50.000)
 
     df_top80, df_bottom10 = calcular_80_maiores(df_cnis)
 
     # Desconsiderados
-    df_desconsiderados = pd.read_csv(desconsid_file, delimiter=';', encoding='utf-8')
-    df_desconsiderados = df_desconsiderados.iloc[:,0].str.split(',', expand=True)
-    df_desconsiderados.columns = ['Seq', 'Seq.', 'Data', 'Salário', 'Índice', 'Sal. Corrigido', 'Observação', 'Ano', 'Duplicado']
-    df_desconsiderados['Sal. Corrigido'] = pd.to_numeric(df_desconsiderados['Sal. Corrigido'], errors='coerce')
+    df_desconsiderados = organizar_desconsiderados(desconsid_file)
 
     # Correção - reaproveitamento
     min_80 = df_top80['Remuneração'].min()
@@ -71,8 +58,8 @@ if cnis_file and carta_file and desconsid_file:
     col2.metric("80% Maiores Salários", len(df_top80))
     col3.metric("Desconsiderados Reaproveitados", len(df_vantajosos))
 
-    # Gráficos
-    st.bar_chart(data=df_top80, x='Competência', y='Remuneração', use_container_width=True)
+    # Gráficos (ordem cronológica, agrupado por ano)
+    st.bar_chart(data=serie_grafico(df_top80, 'Ano'), x='Período', y='Remuneração', use_container_width=True)
 
     # Fator Previdenciário Aplicado
     media = df_top80['Remuneração'].mean()
@@ -93,7 +80,7 @@ if cnis_file and carta_file and desconsid_file:
     st.dataframe(consolidado_final)
 
     # Download CSV
-    st.sidebar.download_button(label="⬇️ Baixar Consolidação (CSV)", data=consolidado_final.to_csv(index=False).encode('utf-8'), file_name='Consolidado_Final.csv', mime='text/csv')
+    download_csv("Consolidação (CSV)", consolidado_final, "Consolidado_Final.csv", 'consolidado_final', destino=st.sidebar)
 
 else:
     st.info("🔔 Faça o upload dos 3 arquivos obrigatórios para visualizar o dashboard.")
@@ -0,0 +1,67 @@
+"""Núcleo de cálculo previdenciário compartilhado pelos dashboards.
+
+Não importa Streamlit e não executa nada na importação. Os nomes abaixo são
+carregados sob demanda: `from previdencia import fator_previdenciario` não
+carrega pandas/numpy; só os módulos que trabalham com tabelas os importam.
+"""
+import importlib
+
+_EXPORTACOES = {
+    'PARAMETROS_PADRAO': 'previdencia.beneficio',
+    'fator_previdenciario': 'previdencia.beneficio',
+    'salario_de_beneficio': 'previdencia.beneficio',
+    'formatar_moeda': 'previdencia.formatacao',
+    'estrutura_carta': 'previdencia.extracao',
+    'estrutura_cnis': 'previdencia.extracao',
+    'ler_cnis': 'previdencia.leitura',
+    'organizar_cnis': 'previdencia.leitura',
+    'organizar_desconsiderados': 'previdencia.leitura',
+    'ler_carta': 'previdencia.leitura',
+    'limitar_remuneracoes': 'previdencia.leitura',
+    'remover_discrepantes': 'previdencia.leitura',
+    'TabelaLimites': 'previdencia.limites',
+    'aplicar_limites': 'previdencia.limites',
+    'carregar_limites': 'previdencia.limites',
+    'pontuar_anomalias': 'previdencia.anomalias',
+    'suspeitos': 'previdencia.anomalias',
+    'SelecaoMaiores': 'previdencia.selecao',
+    'SerieIndices': 'previdencia.correcao',
+    'atualizar_valores_plano': 'previdencia.correcao',
+    'carregar_serie': 'previdencia.correcao',
+    'consolidar': 'previdencia.consolidacao',
+    'marcar_duplicados': 'previdencia.consolidacao',
+    'conciliar': 'previdencia.conciliacao',
+    'compactar': 'previdencia.esquema',
+    'expandir': 'previdencia.esquema',
+    'HistoricoResultados': 'previdencia.historico',
+    'chave_caso': 'previdencia.historico',
+    'Reaproveitamento': 'previdencia.otimizacao',
+    'lttb': 'previdencia.graficos',
+    'serie_grafico': 'previdencia.graficos',
+    'csv_em_bytes': 'previdencia.exportacao',
+    'PacoteCaso': 'previdencia.pacote',
+    'abrir_pacote': 'previdencia.pacote',
+    'exportar_pacote': 'previdencia.pacote',
+    'medir_importacao': 'previdencia.diagnostico',
+    'Cronometro': 'previdencia.medicao',
+    'VisaoPaginada': 'previdencia.paginacao',
+    'faixa': 'previdencia.simulacao',
+    'grade_fator': 'previdencia.simulacao',
+    'TabuaSobrevida': 'previdencia.tabua',
+    'carregar_tabua': 'previdencia.tabua',
+}
+
+__all__ = sorted(_EXPORTACOES)
+
+
+def __getattr__(nome):
+    modulo = _EXPORTACOES.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module 'previdencia' has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(modulo), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
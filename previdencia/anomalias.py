@@ -0,0 +1,120 @@
+"""Detecção de remunerações suspeitas (erros de OCR e de extração).
+
+Um separador decimal fora do lugar multiplica o salário por 10 ou 100. Em
+escala logarítmica esse erro é um deslocamento fixo, então cada linha recebe
+duas pontuações robustas (no padrão do z modificado, 0,6745 × desvio / MAD):
+
+- desvio: distância do log da remuneração à mediana do seu período (ano, ou
+  vínculo quando pedido), sem misturar padrões monetários diferentes;
+- salto: pico isolado entre as competências vizinhas da mesma sequência
+  (sobe e volta, ou cai e volta). Um reajuste real é degrau e não pontua.
+
+Nada é removido: a linha ganha a pontuação e a marca de suspeita. Tudo em
+uma passada vetorizada (ordenação, medianas por grupo e diferenças), então
+o corpus inteiro do lote pode ser pontuado de uma vez com `chaves=('Caso',)`.
+"""
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import ORDINAL_INVALIDO
+from previdencia.consolidacao import COLUNAS_VINCULO
+from previdencia.esquema import centavos_de, ordinais_de
+
+LIMIAR_PADRAO = 3.5  # z modificado acima de 3,5: suspeito
+ESCALA_MINIMA = 0.05  # MAD mínimo em log10 (~12%): períodos de salário constante não explodem o z
+_CONSTANTE_MAD = 0.6745
+
+POR_ANO = 'ano'
+POR_VINCULO = 'vinculo'
+
+# Competências em que o padrão monetário mudou (cruzado, cruzado novo,
+# cruzeiro, cruzeiro real, real): valores de lados diferentes não se comparam.
+MUDANCAS_MOEDA = np.array([1986 * 12 + 2, 1989 * 12 + 0, 1990 * 12 + 2, 1993 * 12 + 7, 1994 * 12 + 6])
+
+
+def _codigos(colunas, tamanho):
+    """Código inteiro do grupo de cada linha a partir de várias colunas."""
+    if not colunas:
+        return np.zeros(tamanho, dtype=np.int64)
+    return pd.DataFrame(colunas).groupby(list(colunas), sort=False, dropna=False).ngroup().to_numpy()
+
+
+def _escala_robusta(desvios, codigos):
+    """MAD por grupo (mediana dos desvios absolutos), com piso em ESCALA_MINIMA."""
+    mad = pd.Series(np.abs(desvios)).groupby(codigos).transform('median').to_numpy()
+    return np.fmax(mad, ESCALA_MINIMA)
+
+
+def pontuar_anomalias(df, coluna_competencia='Competência', coluna_valor='Remuneração',
+                      por=POR_ANO, chaves=(), limiar=LIMIAR_PADRAO):
+    """Pontuação de anomalia de cada linha, alinhada ao índice de `df`.
+
+    `por` define o período da mediana: POR_ANO (padrão) ou POR_VINCULO (as
+    colunas de vínculo presentes; sem elas, volta ao ano). `chaves` são
+    colunas extras que separam as séries, como o caso no corpus do lote.
+    Colunas: 'Mediana do Período' (R$), 'Desvio', 'Salto', 'Pontuação'
+    (o maior dos dois) e 'Suspeito'. Competências inválidas e valores
+    ausentes ou não positivos ficam com pontuação NaN e não são suspeitos.
+    """
+    compacto = bool(df.attrs.get('compacto'))
+    ordinais = ordinais_de(df[coluna_competencia])
+    centavos = centavos_de(df[coluna_valor], compacto).to_numpy(dtype=np.float64, na_value=np.nan)
+    validos = (ordinais != ORDINAL_INVALIDO) & (centavos > 0)
+
+    n = int(validos.sum())
+    ordinais, log = ordinais[validos], np.log10(centavos[validos] / 100)
+    extras = {f'chave_{i}': df[coluna].to_numpy()[validos] for i, coluna in enumerate(chaves)}
+    vinculos = {coluna: df[coluna].to_numpy()[validos] for coluna in COLUNAS_VINCULO if coluna in df.columns}
+    moeda = np.searchsorted(MUDANCAS_MOEDA, ordinais, side='right')
+
+    # Desvio em relação à mediana do período (nunca atravessando troca de moeda).
+    if por == POR_VINCULO and vinculos:
+        periodo = {**extras, **vinculos, 'moeda': moeda}
+    else:
+        periodo = {**extras, 'ano': ordinais // 12, 'moeda': moeda}
+    codigos = _codigos(periodo, n)
+    mediana = pd.Series(log).groupby(codigos).transform('median').to_numpy()
+    desvio = log - mediana
+    z_desvio = _CONSTANTE_MAD * np.abs(desvio) / _escala_robusta(desvio, codigos)
+
+    # Saltos entre competências vizinhas da mesma sequência (vínculo, quando há).
+    sequencia = _codigos({**extras, **vinculos, 'moeda': moeda}, n)
+    ordem = np.lexsort((log, ordinais, sequencia))
+    log_ordenado, sequencia_ordenada = log[ordem], sequencia[ordem]
+    mesma = sequencia_ordenada[1:] == sequencia_ordenada[:-1]
+    passo = np.where(mesma, np.diff(log_ordenado), np.nan)
+    antes = np.concatenate(([np.nan], passo))  # log - log anterior
+    depois = np.concatenate((passo, [np.nan]))  # log seguinte - log
+    # Pico: sobe e volta (ou cai e volta); o menor dos dois lados é o tamanho do salto.
+    pico = np.where(np.sign(antes) == -np.sign(depois), np.fmin(np.abs(antes), np.abs(depois)), 0.0)
+    pico[np.isnan(antes) | np.isnan(depois)] = np.nan
+    escala_passo = np.fmax(np.nanmedian(np.abs(passo)) if np.isfinite(passo).any() else 0.0, ESCALA_MINIMA)
+    z_salto = np.empty(n)
+    z_salto[ordem] = _CONSTANTE_MAD * pico / escala_passo
+
+    pontuacao = np.fmax(z_desvio, z_salto)
+    colunas = {
+        'Mediana do Período': (np.nan, 10 ** mediana),
+        'Desvio': (np.nan, z_desvio),
+        'Salto': (np.nan, z_salto),
+        'Pontuação': (np.nan, pontuacao),
+        'Suspeito': (False, pontuacao > limiar),
+    }
+    resultado = pd.DataFrame(index=df.index)
+    for nome, (vazio, valores) in colunas.items():
+        coluna = np.full(len(df), vazio, dtype=np.asarray(valores).dtype)
+        coluna[validos] = valores
+        resultado[nome] = coluna
+    return resultado
+
+
+def suspeitos(df, pontuacao):
+    """Linhas de `df` marcadas como suspeitas, com as pontuações, da maior para a menor.
+
+    Ficam no mesmo esquema de `df` (compacto ou de exibição).
+    """
+    marcadas = pontuacao[pontuacao['Suspeito']]
+    resultado = (df.loc[marcadas.index].join(marcadas.drop(columns='Suspeito'))
+                 .sort_values('Pontuação', ascending=False, kind='stable'))
+    resultado.attrs = dict(df.attrs)  # o join não propaga a marca do esquema
+    return resultado
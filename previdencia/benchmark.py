@@ -0,0 +1,200 @@
+"""Benchmark das etapas do cálculo sobre dados sintéticos reprodutíveis.
+
+Uso:
+    python -m previdencia.benchmark [--tamanhos 100 10000 1000000] [--repeticoes 5]
+                                    [--semente 0] [--saida resultados.json]
+                                    [--comparar base.json --tolerancia 0.25]
+
+Para cada tamanho, gera os arquivos com `previdencia.sintetico` e mede cada
+etapa (leitura, filtro de discrepantes, 80% maiores, correção, fator,
+formatação e exportação): mediana e mínimo do tempo das repetições e pico
+de memória alocada (tracemalloc, em uma execução separada). O resultado é
+um JSON com o ambiente (versões, commit) e uma linha por etapa e tamanho.
+Com --comparar, sai com código 1 se alguma etapa ficou mais lenta que a
+base além da tolerância.
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from previdencia import sintetico
+from previdencia.anomalias import pontuar_anomalias
+from previdencia.beneficio import PARAMETROS_PADRAO, fator_previdenciario, salario_de_beneficio
+from previdencia.correcao import SerieIndices, atualizar_valores_plano
+from previdencia.exportacao import csv_em_bytes
+from previdencia.extracao import estrutura_carta, estrutura_cnis
+from previdencia.formatacao import moeda_em_texto
+from previdencia.leitura import ler_cnis, organizar_desconsiderados, remover_discrepantes
+from previdencia.limites import TabelaLimites, aplicar_limites
+from previdencia.selecao import SelecaoMaiores
+from previdencia.simulacao import faixa, grade_fator
+
+TAMANHOS_PADRAO = (100, 10_000, 100_000, 1_000_000)
+REPETICOES_PADRAO = 5
+TOLERANCIA_PADRAO = 0.25
+
+INDICES_PERIODO = {'1980': 5000.0, '1990': 1000.0, '1994': 2.75, '2000': 1.3, '2010': 1.1, '2020': 1.05}
+
+
+# ===================== ETAPAS =====================
+
+def _preparar(n, semente):
+    """Arquivos sintéticos e os DataFrames de entrada de cada etapa (fora da medição)."""
+    dados = {
+        'cnis_txt': sintetico.cnis_txt(n, semente),
+        'carta_txt': sintetico.carta_txt(n, semente),
+        'cnis_csv': sintetico.cnis_csv(n, semente),
+        'desconsiderados_csv': sintetico.desconsiderados_csv(n, semente),
+        'serie': SerieIndices.de_tabela(sintetico.indices_mensais(semente)),
+        'limites': TabelaLimites.de_tabela(sintetico.teto_piso(semente)),
+    }
+    dados['df_cnis_bruto'] = ler_cnis.__wrapped__(io.BytesIO(dados['cnis_csv']))
+    dados['df_cnis'] = remover_discrepantes(dados['df_cnis_bruto'])
+    dados['alvo'] = dados['serie'].competencias_alvo()[0]
+    return dados
+
+
+def _fator(dados):
+    media = SelecaoMaiores(dados['df_cnis']['Remuneração']).media
+    p = PARAMETROS_PADRAO
+    salario_de_beneficio(media, fator_previdenciario(p['Tc'], p['Es'], p['Id'], p['a']))
+    return grade_fator(media, faixa(30, 45, 1), faixa(55, 70, 1), faixa(15, 25, 0.25))
+
+
+def _selecao(dados):
+    selecao = SelecaoMaiores(dados['df_cnis']['Remuneração'])
+    return selecao.media, selecao.minimo, selecao.ordem
+
+
+ETAPAS = {
+    'leitura_cnis_txt': lambda d: estrutura_cnis(d['cnis_txt']),
+    'leitura_carta_txt': lambda d: estrutura_carta(d['carta_txt']),
+    'leitura_cnis_csv': lambda d: ler_cnis.__wrapped__(io.BytesIO(d['cnis_csv'])),
+    'leitura_desconsiderados_csv': lambda d: organizar_desconsiderados.__wrapped__(io.BytesIO(d['desconsiderados_csv'])),
+    'filtro_discrepantes': lambda d: remover_discrepantes(d['df_cnis_bruto']),
+    'anomalias': lambda d: pontuar_anomalias(d['df_cnis_bruto']),
+    'limites_teto_piso': lambda d: aplicar_limites(d['df_cnis_bruto'], d['limites']),
+    'selecao_80': _selecao,
+    'correcao_indice_mensal': lambda d: d['serie'].corrigir(d['df_cnis']['Competência'], d['df_cnis']['Remuneração'], d['alvo']),
+    'correcao_periodos': lambda d: atualizar_valores_plano(d['df_cnis']['Competência'], d['df_cnis']['Remuneração'], INDICES_PERIODO),
+    'fator': _fator,
+    'formatacao_moeda': lambda d: moeda_em_texto(d['df_cnis']['Remuneração']),
+    'exportacao_csv': lambda d: csv_em_bytes(d['df_cnis']),
+}
+
+
+# ===================== MEDIÇÃO =====================
+
+def medir(funcao, dados, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(dados)
+        tempos.append(time.perf_counter() - inicio)
+
+    # Memória medida à parte: o tracemalloc distorce o tempo.
+    tracemalloc.start()
+    try:
+        funcao(dados)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'tempo_mediana_s': statistics.median(tempos),
+        'tempo_min_s': min(tempos),
+        'memoria_pico_bytes': pico,
+    }
+
+
+def _commit():
+    try:
+        saida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+        return saida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ambiente():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'commit': _commit(),
+    }
+
+
+def executar(tamanhos=TAMANHOS_PADRAO, repeticoes=REPETICOES_PADRAO, semente=0, etapas=None, progresso=None):
+    """Roda as etapas em cada tamanho e devolve o relatório (dicionário serializável em JSON)."""
+    etapas = etapas or list(ETAPAS)
+    resultados = []
+    for n in tamanhos:
+        dados = _preparar(n, semente)
+        for etapa in etapas:
+            medicao = {'etapa': etapa, 'linhas': n, **medir(ETAPAS[etapa], dados, repeticoes)}
+            resultados.append(medicao)
+            if progresso:
+                progresso(medicao)
+    return {
+        'ambiente': ambiente(),
+        'configuracao': {'tamanhos': list(tamanhos), 'repeticoes': repeticoes, 'semente': semente},
+        'resultados': resultados,
+    }
+
+
+def comparar(atual, base, tolerancia=TOLERANCIA_PADRAO):
+    """Etapas (etapa, linhas) cuja mediana passou da base em mais que `tolerancia` (fração)."""
+    referencia = {(r['etapa'], r['linhas']): r['tempo_mediana_s'] for r in base['resultados']}
+    regressoes = []
+    for r in atual['resultados']:
+        anterior = referencia.get((r['etapa'], r['linhas']))
+        if anterior and r['tempo_mediana_s'] > anterior * (1 + tolerancia):
+            regressoes.append({**r, 'tempo_base_s': anterior, 'variacao': r['tempo_mediana_s'] / anterior - 1})
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m previdencia.benchmark', description="Benchmark das etapas do cálculo.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(TAMANHOS_PADRAO), help="Linhas por arquivo sintético")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--etapas', nargs='+', choices=list(ETAPAS), default=None)
+    parser.add_argument('--saida', default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument('--comparar', default=None, help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO, help="Aumento relativo aceito (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    def progresso(m):
+        print(f"{m['etapa']:<30} {m['linhas']:>9} linhas  {m['tempo_mediana_s'] * 1000:10.2f} ms  "
+              f"{m['memoria_pico_bytes'] / 2**20:8.1f} MiB", file=sys.stderr)
+
+    relatorio = executar(args.tamanhos, args.repeticoes, args.semente, args.etapas, progresso)
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            regressoes = comparar(relatorio, json.load(f), args.tolerancia)
+        for r in regressoes:
+            print(f"REGRESSÃO: {r['etapa']} ({r['linhas']} linhas) {r['tempo_base_s'] * 1000:.2f} ms -> "
+                  f"{r['tempo_mediana_s'] * 1000:.2f} ms (+{r['variacao']:.0%})", file=sys.stderr)
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
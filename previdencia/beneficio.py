@@ -0,0 +1,18 @@
+# ===================== FATOR PREVIDENCIÁRIO =====================
+
+# Tc (tempo de contribuição), Es (expectativa de sobrevida), Id (idade), a (alíquota)
+PARAMETROS_PADRAO = {'Tc': 38, 'Es': 21.8, 'Id': 60, 'a': 0.31}
+
+
+def fator_previdenciario(Tc, Es, Id, a=0.31):
+    fator = (Tc * a / Es) * (1 + ((Id + Tc * a) / 100))
+    return round(fator, 4)
+
+
+def salario_de_beneficio(media, fator):
+    # Em centavos e décimos de milésimo inteiros: sem erro de arredondamento
+    # de float no produto; meio centavo arredonda para cima.
+    if media != media:
+        return media
+    centavos = (round(media * 100) * round(fator * 10000) + 5000) // 10000
+    return centavos / 100
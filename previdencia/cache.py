@@ -0,0 +1,132 @@
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# ===================== LIMITES =====================
+
+MAX_ENTRADAS = 64
+MAX_BYTES = 256 * 1024 * 1024
+
+
+# ===================== HASH DO CONTEÚDO =====================
+
+def hash_conteudo(origem):
+    """Hash do conteúdo de um upload, caminho ou bytes, sem mover a posição do arquivo.
+
+    Uploads do Streamlit têm `file_id` único por envio: o hash é calculado uma
+    vez por upload e reaproveitado nos reruns seguintes.
+    """
+    identificador = getattr(origem, 'file_id', None)
+    if identificador is not None:
+        chave = (identificador, getattr(origem, 'size', None))
+        guardado = HASHES_UPLOAD.obter(chave)
+        if guardado is None:
+            guardado = _hash_conteudo(origem)
+            HASHES_UPLOAD.guardar(chave, guardado)
+        return guardado
+    return _hash_conteudo(origem)
+
+
+def _hash_conteudo(origem):
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(origem, (str, os.PathLike)):
+        with open(origem, 'rb') as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloco)
+    elif isinstance(origem, (bytes, bytearray, memoryview)):
+        h.update(origem)
+    elif hasattr(origem, 'getbuffer'):
+        buffer = origem.getbuffer()
+        try:
+            h.update(buffer)
+        finally:
+            buffer.release()
+    else:
+        posicao = origem.tell()
+        origem.seek(0)
+        for bloco in iter(lambda: origem.read(1 << 20), b""):
+            h.update(bloco)
+        origem.seek(posicao)
+    return h.hexdigest()
+
+
+def _tamanho(valor):
+    if hasattr(valor, 'memory_usage'):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    return 0
+
+
+def _copiar(valor):
+    return valor.copy() if hasattr(valor, 'copy') else valor
+
+
+# ===================== LRU LIMITADO =====================
+
+class CacheLRU:
+    """Cache LRU limitado por número de entradas e por memória estimada."""
+
+    def __init__(self, max_entradas=MAX_ENTRADAS, max_bytes=MAX_BYTES):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._dados = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._dados)
+
+    def obter(self, chave):
+        with self._trava:
+            if chave not in self._dados:
+                return None
+            self._dados.move_to_end(chave)
+            return self._dados[chave][0]
+
+    def guardar(self, chave, valor):
+        tamanho = _tamanho(valor)
+        if tamanho > self.max_bytes:
+            return
+        with self._trava:
+            if chave in self._dados:
+                self._bytes -= self._dados.pop(chave)[1]
+            self._dados[chave] = (valor, tamanho)
+            self._bytes += tamanho
+            while len(self._dados) > self.max_entradas or self._bytes > self.max_bytes:
+                _, (_, liberado) = self._dados.popitem(last=False)
+                self._bytes -= liberado
+
+    def limpar(self):
+        with self._trava:
+            self._dados.clear()
+            self._bytes = 0
+
+
+CACHE_LEITURA = CacheLRU()
+HASHES_UPLOAD = CacheLRU(max_entradas=256)
+
+
+def cache_por_conteudo(funcao=None, cache=CACHE_LEITURA):
+    """Memoiza `funcao(arquivo)` pelo hash do conteúdo do arquivo.
+
+    Os reruns do Streamlit entregam o mesmo upload a cada interação; com o
+    cache o arquivo é apenas re-hasheado e o DataFrame já tipado é devolvido
+    (como cópia, para que colunas adicionadas pelo dashboard não vazem).
+    A função original continua acessível em `__wrapped__`.
+    """
+    if funcao is None:
+        return functools.partial(cache_por_conteudo, cache=cache)
+
+    @functools.wraps(funcao)
+    def envolvida(arquivo):
+        chave = (funcao.__module__, funcao.__qualname__, hash_conteudo(arquivo))
+        resultado = cache.obter(chave)
+        if resultado is None:
+            if hasattr(arquivo, 'seek'):
+                arquivo.seek(0)
+            resultado = funcao(arquivo)
+            cache.guardar(chave, resultado)
+        return _copiar(resultado)
+
+    return envolvida
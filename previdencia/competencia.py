@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+# Ordinal de mês: ano * 12 + (mês - 1). Competências inválidas viram -1.
+ORDINAL_INVALIDO = -1
+
+
+def _por_valor_unico(competencias, converter, dtype, invalido):
+    # Um histórico tem poucas centenas de competências distintas: o texto é
+    # interpretado uma vez por valor único e espalhado pelos códigos.
+    codigos, unicos = pd.factorize(np.asarray(competencias, dtype=object))
+    valores = np.empty(len(unicos) + 1, dtype=dtype)
+    for i, texto in enumerate(unicos.tolist()):
+        try:
+            valores[i] = converter(*str(texto).strip().split('/'))
+        except (TypeError, ValueError):
+            valores[i] = invalido
+    valores[-1] = invalido
+    return valores[codigos]
+
+
+def _ordinal(mes, ano):
+    mes, ano = int(mes), int(ano)
+    if not 1 <= mes <= 12:
+        raise ValueError(mes)
+    return ano * 12 + mes - 1
+
+
+def ordinal_competencia(competencias):
+    """Converte competências "MM/AAAA" em ordinais de mês (int32)."""
+    return _por_valor_unico(competencias, _ordinal, np.int32, ORDINAL_INVALIDO)
+
+
+def ano_competencia(competencias):
+    """Ano de cada competência "MM/AAAA" como float (NaN quando inválida)."""
+    return _por_valor_unico(competencias, lambda *partes: int(partes[-1]), np.float64, np.nan)
+
+
+def rotulos_competencia(ordinais):
+    """Converte ordinais de mês (ano * 12 + mês - 1) em rótulos "MM/AAAA"."""
+    unicos, posicoes = np.unique(np.asarray(ordinais), return_inverse=True)
+    rotulos = np.array([f"{o % 12 + 1:02d}/{o // 12}" for o in unicos.tolist()], dtype=object)
+    return rotulos[posicoes]
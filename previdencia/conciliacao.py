@@ -0,0 +1,116 @@
+"""Conciliação CNIS × Carta de Concessão por competência.
+
+As duas tabelas são indexadas pelo ordinal de mês e unidas em uma única
+junção externa. Para cada competência saem: presença em cada lado,
+diferença entre a remuneração do CNIS (vínculos somados, duplicatas fora) e
+o salário da Carta, e a conferência do `Sal. Corrigido` da Carta contra
+`Salário × Índice`. Comparações em centavos inteiros.
+"""
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import ORDINAL_INVALIDO, rotulos_competencia
+from previdencia.consolidacao import consolidar
+from previdencia.esquema import centavos_de, ordinais_de
+
+TOLERANCIA_PADRAO = 0.01  # R$: diferenças de arredondamento não contam
+
+SITUACAO_OK = 'OK'
+SITUACAO_SO_CNIS = 'Só no CNIS'
+SITUACAO_SO_CARTA = 'Só na Carta'
+SITUACAO_SALARIO = 'Salário divergente'
+SITUACAO_CORRECAO = 'Correção divergente'
+# Uma competência pode ter mais de um problema; a Situação mostra o primeiro desta ordem.
+SITUACOES = (SITUACAO_SO_CNIS, SITUACAO_SO_CARTA, SITUACAO_SALARIO, SITUACAO_CORRECAO, SITUACAO_OK)
+
+
+def _centavos(coluna, compacto):
+    # Em float: ausências viram NaN e propagam nas diferenças.
+    return centavos_de(coluna, compacto).to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _cnis_por_competencia(df_cnis):
+    consolidado = consolidar(df_cnis)
+    compacto = bool(consolidado.attrs.get('compacto'))
+    return pd.DataFrame(
+        {'CNIS (centavos)': _centavos(consolidado['Remuneração'], compacto)},
+        index=pd.Index(ordinais_de(consolidado['Competência']), name='Ordinal'),
+    )
+
+
+def _carta_por_competencia(df_carta):
+    compacto = bool(df_carta.attrs.get('compacto'))
+    carta = pd.DataFrame({
+        'Ordinal': ordinais_de(df_carta['Data']),
+        'Carta (centavos)': _centavos(df_carta['Salário'], compacto),
+        'Índice': pd.to_numeric(df_carta['Índice'], errors='coerce').to_numpy(dtype=np.float64),
+        'Corrigido (centavos)': _centavos(df_carta['Sal. Corrigido'], compacto),
+    })
+    carta = carta[carta['Ordinal'] != ORDINAL_INVALIDO]
+    # Linhas repetidas da mesma competência na Carta: somadas, com o índice da primeira.
+    grupos = carta.groupby('Ordinal', sort=True)
+    return pd.DataFrame({
+        'Carta (centavos)': grupos['Carta (centavos)'].sum(min_count=1),
+        'Índice': grupos['Índice'].first(),
+        'Corrigido (centavos)': grupos['Corrigido (centavos)'].sum(min_count=1),
+    })
+
+
+def conciliar(df_cnis, df_carta, tolerancia=TOLERANCIA_PADRAO):
+    """Relatório competência a competência da conciliação CNIS × Carta.
+
+    `df_cnis` com Competência/Remuneração e `df_carta` com Data, Salário,
+    Índice e Sal. Corrigido, em qualquer dos dois esquemas. Devolve um
+    DataFrame em ordem cronológica com os valores dos dois lados, as
+    diferenças, as marcas booleanas de cada problema e a coluna Situação.
+    """
+    cnis = _cnis_por_competencia(df_cnis)
+    carta = _carta_por_competencia(df_carta)
+    unido = cnis.join(carta, how='outer', sort=True)
+
+    limite = round(tolerancia * 100)
+    centavos_cnis = unido['CNIS (centavos)'].to_numpy()
+    centavos_carta = unido['Carta (centavos)'].to_numpy()
+    indices = unido['Índice'].to_numpy()
+    corrigido = unido['Corrigido (centavos)'].to_numpy()
+    recalculado = np.rint(centavos_carta * indices)
+
+    diferenca = centavos_cnis - centavos_carta
+    diferenca_correcao = corrigido - recalculado
+    falta_carta = np.isnan(centavos_carta) & ~np.isnan(centavos_cnis)
+    falta_cnis = np.isnan(centavos_cnis) & ~np.isnan(centavos_carta)
+    salario_divergente = np.abs(np.nan_to_num(diferenca)) > limite
+    correcao_divergente = np.abs(np.nan_to_num(diferenca_correcao)) > limite
+
+    situacao = np.select(
+        [falta_carta, falta_cnis, salario_divergente, correcao_divergente],
+        list(SITUACOES[:-1]),
+        default=SITUACAO_OK,
+    )
+    ordinais = unido.index.to_numpy()
+    return pd.DataFrame({
+        'Competência': rotulos_competencia(ordinais) if len(ordinais) else np.array([], dtype=object),
+        'Remuneração CNIS': centavos_cnis / 100,
+        'Salário Carta': centavos_carta / 100,
+        'Diferença': diferenca / 100,
+        'Índice': indices,
+        'Sal. Corrigido': corrigido / 100,
+        'Salário × Índice': recalculado / 100,
+        'Diferença Correção': diferenca_correcao / 100,
+        'Falta na Carta': falta_carta,
+        'Falta no CNIS': falta_cnis,
+        'Salário Divergente': salario_divergente,
+        'Correção Divergente': correcao_divergente,
+        'Situação': situacao,
+    })
+
+
+def resumo_conciliacao(relatorio):
+    """Quantidade de competências em cada situação (todas as situações, mesmo com zero)."""
+    contagem = relatorio['Situação'].value_counts()
+    return {situacao: int(contagem.get(situacao, 0)) for situacao in SITUACOES}
+
+
+def divergencias(relatorio):
+    """Só as competências com algum problema."""
+    return relatorio[relatorio['Situação'] != SITUACAO_OK]
@@ -0,0 +1,77 @@
+"""Consolidação por competência: um salário por mês.
+
+Linhas idênticas (mesma competência, mesmo valor e mesmo vínculo quando o
+arquivo identifica o vínculo; sem essa identificação, iguais nas demais
+colunas de dados) são duplicatas — o mesmo recolhimento extraído duas vezes —
+e ficam só uma vez. Numeração de linha (Seq) e colunas derivadas (Ano) nunca
+entram na chave, então o CSV e o TXT do mesmo extrato consolidam igual. Linhas
+distintas na mesma competência são vínculos concomitantes e têm as
+remunerações somadas. Tudo por hash das linhas e groupby do ordinal de mês,
+em tempo linear.
+"""
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import ORDINAL_INVALIDO
+from previdencia.esquema import centavos_de, expandir, ordinais_de
+
+# Colunas que identificam o vínculo, quando o arquivo as tem.
+COLUNAS_VINCULO = ('Empresa', 'Vínculo', 'CNPJ', 'NIT')
+MARCA_DUPLICADO = 'Sim'
+# Numeração de linha e colunas derivadas: não dizem nada sobre o recolhimento.
+COLUNAS_FORA_DA_CHAVE = ('Seq', 'Seq.', 'Ano', 'Duplicado', 'Vínculos', 'Duplicados')
+
+
+def marcar_duplicados(df, coluna_competencia='Competência', coluna_valor='Remuneração'):
+    """Máscara das linhas que repetem uma anterior (competência, centavos e vínculo).
+
+    Sem coluna de vínculo, entram na chave as demais colunas de dados (fora
+    Seq, Ano e as marcas de `COLUNAS_FORA_DA_CHAVE`). Também marca as linhas
+    que o arquivo já traz com Duplicado = "Sim".
+    """
+    centavos = centavos_de(df[coluna_valor], df.attrs.get('compacto'))
+    identificacao = [coluna for coluna in COLUNAS_VINCULO if coluna in df.columns]
+    if not identificacao:
+        fora = (coluna_competencia, coluna_valor, *COLUNAS_FORA_DA_CHAVE)
+        identificacao = [coluna for coluna in df.columns if coluna not in fora]
+    chave = pd.DataFrame({
+        'ordinal': ordinais_de(df[coluna_competencia]),
+        'centavos': centavos.to_numpy(dtype=np.int64, na_value=-1),
+        **{coluna: df[coluna].to_numpy() for coluna in identificacao},
+    })
+    duplicado = pd.util.hash_pandas_object(chave, index=False).duplicated().to_numpy()
+    if 'Duplicado' in df.columns:
+        duplicado |= (df['Duplicado'].astype(str).str.strip() == MARCA_DUPLICADO).to_numpy()
+    return duplicado
+
+
+def consolidar(df, coluna_competencia='Competência', coluna_valor='Remuneração'):
+    """Uma linha por competência, em ordem cronológica.
+
+    Colunas: `coluna_competencia`, `coluna_valor` (soma dos vínculos sem as
+    duplicatas), 'Ano', 'Vínculos' (linhas somadas) e 'Duplicados' (linhas
+    descartadas). Competências inválidas e valores ausentes ficam de fora.
+    Devolve no mesmo esquema da entrada (compacto ou de exibição).
+    """
+    compacto = bool(df.attrs.get('compacto'))
+    ordinais = ordinais_de(df[coluna_competencia])
+    centavos = centavos_de(df[coluna_valor], compacto)
+    duplicado = marcar_duplicados(df, coluna_competencia, coluna_valor)
+    validos = (ordinais != ORDINAL_INVALIDO) & ~centavos.isna()
+
+    somados = validos & ~duplicado
+    grupos = pd.DataFrame({
+        'ordinal': ordinais[somados],
+        'centavos': centavos[somados].to_numpy(dtype=np.int64),
+    }).groupby('ordinal', sort=True)['centavos'].agg(['sum', 'size'])
+    descartados = pd.Series(ordinais[validos & duplicado]).value_counts()
+
+    consolidado = pd.DataFrame({
+        coluna_competencia: grupos.index.to_numpy(dtype=np.int32),
+        coluna_valor: pd.array(grupos['sum'].to_numpy(), dtype='Int64'),
+        'Ano': (grupos.index.to_numpy() // 12).astype(str),
+        'Vínculos': grupos['size'].to_numpy(),
+        'Duplicados': descartados.reindex(grupos.index, fill_value=0).to_numpy(),
+    })
+    consolidado.attrs['compacto'] = True
+    return consolidado if compacto else expandir(consolidado)
@@ -0,0 +1,118 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import (
+    ORDINAL_INVALIDO,
+    ano_competencia,
+    ordinal_competencia,
+    rotulos_competencia,
+)
+
+# ===================== ATUALIZAÇÃO POR PERÍODO ECONÔMICO =====================
+
+def atualizar_valores_plano(competencias, salarios, indices_ano):
+    """Aplica os índices por período econômico a todas as linhas de uma vez.
+
+    `indices_ano` mapeia o ano inicial de cada faixa ('1980', '1990', ...) ao
+    seu índice, como nos `number_input` do dashboard. Cada ano é localizado na
+    faixa por `searchsorted` e o fator é multiplicado em bloco.
+    """
+    inicios = sorted(indices_ano, key=int)
+    limites = np.array([int(inicio) for inicio in inicios[1:]], dtype=np.float64)
+    fatores = np.array([indices_ano[inicio] for inicio in inicios], dtype=np.float64)
+
+    anos = ano_competencia(competencias)
+    faixa = np.searchsorted(limites, anos, side='right')
+    fator = np.where(np.isnan(anos), np.nan, fatores[faixa])
+    return np.round(np.asarray(salarios, dtype=np.float64) * fator, 2)
+
+
+# ===================== ÍNDICE MENSAL =====================
+
+ARQUIVO_INDICES_PADRAO = os.path.join('dados', 'indices_mensais.csv')
+
+
+class SerieIndices:
+    """Série mensal de índices de correção com produtos acumulados pré-calculados.
+
+    `indices[k]` é o fator multiplicativo do mês `inicio + k` (ordinais de mês).
+    `acumulado[k]` guarda o produto dos `k` primeiros meses, de modo que o fator
+    que leva a competência `c` até a data-alvo `t` (meses c .. t-1) é
+    `acumulado[t - inicio] / acumulado[c - inicio]`: duas leituras por linha,
+    sem percorrer a série. Meses sem índice (NaN) entram como 1 no produto e
+    `lacunas[k]` conta quantos há entre os `k` primeiros: o fator só é NaN
+    quando a janela c .. t-1 contém uma lacuna.
+    """
+
+    def __init__(self, inicio, indices):
+        self.inicio = int(inicio)
+        self.indices = np.asarray(indices, dtype=np.float64)
+        ausentes = np.isnan(self.indices)
+        self.acumulado = np.concatenate(([1.0], np.cumprod(np.where(ausentes, 1.0, self.indices))))
+        self.lacunas = np.concatenate(([0], np.cumsum(ausentes)))
+
+    @property
+    def fim(self):
+        """Ordinal do mês seguinte ao último índice (data-alvo mais recente)."""
+        return self.inicio + len(self.indices)
+
+    @classmethod
+    def de_tabela(cls, df, coluna_competencia='Competência', coluna_indice='Índice'):
+        ordinais = ordinal_competencia(df[coluna_competencia])
+        indices = pd.to_numeric(df[coluna_indice], errors='coerce').to_numpy(dtype=np.float64)
+        validos = ordinais != ORDINAL_INVALIDO
+        ordinais, indices = ordinais[validos], indices[validos]
+        if len(ordinais) == 0:
+            raise ValueError("Série de índices vazia.")
+        inicio = int(ordinais.min())
+        # Meses ausentes ficam NaN: correções que atravessam a lacuna viram NaN.
+        densa = np.full(int(ordinais.max()) - inicio + 1, np.nan)
+        densa[ordinais - inicio] = indices
+        return cls(inicio, densa)
+
+    def fatores(self, competencias, alvo):
+        """Fator de correção de cada competência até a competência-alvo "MM/AAAA".
+
+        Competências posteriores ao alvo não são corrigidas (fator 1); as
+        anteriores ao início da série ou inválidas ficam NaN.
+        """
+        t = int(ordinal_competencia([alvo])[0]) - self.inicio
+        if not 0 <= t <= len(self.indices):
+            raise ValueError(f"Competência-alvo {alvo} fora da série de índices.")
+        ordinais = ordinal_competencia(competencias)
+        c = ordinais.astype(np.int64) - self.inicio
+        fora = (ordinais == ORDINAL_INVALIDO) | (c < 0)
+        c = np.clip(c, 0, t)
+        fator = self.acumulado[t] / self.acumulado[c]
+        fator[fora | (self.lacunas[c] != self.lacunas[t])] = np.nan
+        return fator
+
+    def corrigir(self, competencias, valores, alvo):
+        fator = self.fatores(competencias, alvo)
+        return np.round(np.asarray(valores, dtype=np.float64) * fator, 2)
+
+    def competencias_alvo(self):
+        """Rótulos "MM/AAAA" aceitos como data-alvo, do mais recente ao mais antigo."""
+        return list(rotulos_competencia(np.arange(self.fim, self.inicio - 1, -1)))
+
+
+@functools.lru_cache(maxsize=8)
+def _carregar_serie(caminho, _modificado_em):
+    if caminho.lower().endswith('.parquet'):
+        df = pd.read_parquet(caminho)
+    else:
+        df = pd.read_csv(caminho, dtype={'Competência': str})
+    return SerieIndices.de_tabela(df)
+
+
+def carregar_serie(caminho=ARQUIVO_INDICES_PADRAO):
+    """Carrega a série mensal (CSV ou Parquet com colunas Competência/Índice).
+
+    A série fica em memória por processo e só é relida quando o arquivo muda;
+    trocar a data-alvo não relê nem percorre a série.
+    """
+    caminho = os.fspath(caminho)
+    return _carregar_serie(caminho, os.path.getmtime(caminho))
@@ -0,0 +1,85 @@
+"""Mede o tempo de importação do núcleo de cálculo.
+
+Uso:
+    python -m previdencia.diagnostico
+
+Cada módulo é importado em um interpretador novo (sem cache de módulos) e o
+melhor de algumas execuções é comparado com o orçamento em ORCAMENTO_MS.
+Também confere que nenhum módulo do núcleo puxa o Streamlit e que os módulos
+leves não carregam pandas.
+"""
+import json
+import subprocess
+import sys
+
+# Orçamento de importação (ms) dos módulos que não dependem de pandas.
+ORCAMENTO_MS = {
+    'previdencia': 20,
+    'previdencia.beneficio': 20,
+    'previdencia.formatacao': 20,
+    'previdencia.cache': 30,
+}
+
+# Módulos do núcleo que podem usar pandas/numpy, mas nunca o Streamlit.
+MODULOS_NUCLEO = (
+    'previdencia.competencia',
+    'previdencia.extracao',
+    'previdencia.leitura',
+    'previdencia.correcao',
+    'previdencia.selecao',
+    'previdencia.lote',
+)
+
+_SONDA = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+ms = (time.perf_counter() - inicio) * 1000
+print(json.dumps({{'ms': ms, 'streamlit': 'streamlit' in sys.modules, 'pandas': 'pandas' in sys.modules}}))
+"""
+
+
+# ===================== MEDIÇÃO =====================
+
+def medir_importacao(modulo, repeticoes=3):
+    """Importa `modulo` em processos novos e devolve o melhor tempo e o que foi carregado junto."""
+    medicoes = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, '-c', _SONDA.format(modulo=modulo)],
+                               capture_output=True, text=True, check=True)
+        medicoes.append(json.loads(saida.stdout))
+    melhor = min(medicoes, key=lambda m: m['ms'])
+    return {'modulo': modulo, **melhor}
+
+
+def verificar(repeticoes=3):
+    """Devolve as medições e a lista de violações (orçamento estourado, Streamlit ou pandas indevidos)."""
+    medicoes, violacoes = [], []
+    for modulo in (*ORCAMENTO_MS, *MODULOS_NUCLEO):
+        medicao = medir_importacao(modulo, repeticoes)
+        medicoes.append(medicao)
+        if medicao['streamlit']:
+            violacoes.append(f"{modulo} importa streamlit")
+        orcamento = ORCAMENTO_MS.get(modulo)
+        if orcamento is None:
+            continue
+        if medicao['pandas']:
+            violacoes.append(f"{modulo} importa pandas")
+        if medicao['ms'] > orcamento:
+            violacoes.append(f"{modulo}: {medicao['ms']:.1f} ms > {orcamento} ms")
+    return medicoes, violacoes
+
+
+def main():
+    medicoes, violacoes = verificar()
+    for m in medicoes:
+        orcamento = ORCAMENTO_MS.get(m['modulo'])
+        limite = f"/ {orcamento} ms" if orcamento else ""
+        print(f"{m['modulo']:<28} {m['ms']:8.1f} ms {limite}")
+    for violacao in violacoes:
+        print(f"FALHA: {violacao}")
+    return 1 if violacoes else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Esquema compacto dos casos e conversores para as bordas (exibição e exportação).
+
+Na forma compacta as colunas mantêm o nome, mudando só o tipo:
+competências viram ordinais de mês int32 (ano * 12 + mês - 1, -1 quando
+inválida), valores em dinheiro viram centavos inteiros (Int64, nulo quando
+ausente) e textos repetidos viram categorias. Filtros e junções por
+competência passam a ser comparações de inteiros.
+"""
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import ORDINAL_INVALIDO, ordinal_competencia, rotulos_competencia
+
+COLUNAS_COMPETENCIA = ('Competência', 'Data')
+COLUNAS_DINHEIRO = ('Remuneração', 'Salário', 'Sal. Corrigido')
+COLUNAS_CATEGORIA = ('Observação', 'Origem', 'Duplicado', 'Ano')
+
+
+# ===================== CENTAVOS =====================
+
+def para_centavos(valores):
+    """Reais (float) em centavos inteiros; NaN vira nulo."""
+    valores = pd.to_numeric(pd.Series(valores), errors='coerce').to_numpy(dtype=np.float64)
+    nulos = np.isnan(valores)
+    centavos = np.rint(np.where(nulos, 0.0, valores) * 100).astype(np.int64)
+    return pd.arrays.IntegerArray(centavos, nulos)
+
+
+def para_reais(centavos):
+    """Centavos (Int64) em reais float; nulos viram NaN."""
+    return pd.array(centavos, dtype='Int64').to_numpy(dtype=np.float64, na_value=np.nan) / 100
+
+
+# ===================== LEITURA NOS DOIS ESQUEMAS =====================
+
+def ordinais_de(coluna):
+    """Ordinais de mês (int64) de uma coluna de competência, compacta ou "MM/AAAA"."""
+    if pd.api.types.is_integer_dtype(coluna):  # esquema compacto: já é ordinal
+        return coluna.to_numpy(dtype=np.int64)
+    return ordinal_competencia(coluna).astype(np.int64)
+
+
+def centavos_de(coluna, compacto):
+    """Centavos (Int64) de uma coluna de dinheiro, compacta ou em reais."""
+    if compacto:
+        return pd.array(coluna, dtype='Int64')
+    return para_centavos(coluna)
+
+
+def reais_de(coluna, compacto):
+    """Reais (float64, NaN quando ausente) de uma coluna de dinheiro, compacta ou em reais."""
+    if compacto:
+        return para_reais(coluna)
+    return pd.to_numeric(coluna, errors='coerce').to_numpy(dtype=np.float64)
+
+
+# ===================== COMPACTAR / EXPANDIR =====================
+
+def compactar(df):
+    """Converte um DataFrame do CNIS, da Carta ou dos desconsiderados para o esquema compacto."""
+    if df.attrs.get('compacto'):
+        return df
+    compacto = df.copy()
+    for coluna in compacto.columns:
+        if coluna in COLUNAS_COMPETENCIA:
+            compacto[coluna] = ordinal_competencia(compacto[coluna])
+        elif coluna in COLUNAS_DINHEIRO:
+            compacto[coluna] = para_centavos(compacto[coluna])
+        elif coluna in COLUNAS_CATEGORIA:
+            compacto[coluna] = compacto[coluna].astype('category')
+    compacto.attrs['compacto'] = True
+    return compacto
+
+
+def expandir(df):
+    """Volta ao formato de exibição: rótulos "MM/AAAA" e valores em reais."""
+    if not df.attrs.get('compacto'):
+        return df
+    expandido = df.copy()
+    for coluna in expandido.columns:
+        if coluna in COLUNAS_COMPETENCIA:
+            ordinais = expandido[coluna].to_numpy()
+            rotulos = rotulos_competencia(ordinais)
+            rotulos[ordinais == ORDINAL_INVALIDO] = None
+            expandido[coluna] = rotulos
+        elif coluna in COLUNAS_DINHEIRO:
+            expandido[coluna] = para_reais(expandido[coluna])
+    expandido.attrs.pop('compacto', None)
+    return expandido
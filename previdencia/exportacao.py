@@ -0,0 +1,16 @@
+import io
+
+# ===================== EXPORTAÇÃO EM MEMÓRIA =====================
+
+MIME_CSV = 'text/csv'
+
+
+def csv_em_bytes(df):
+    """CSV do DataFrame gerado direto em memória, sem arquivo em disco.
+
+    Cada sessão recebe seus próprios bytes: não há nome fixo no diretório de
+    trabalho para duas sessões sobrescreverem nem arquivo aberto para vazar.
+    """
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
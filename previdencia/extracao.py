@@ -0,0 +1,170 @@
+import mmap
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import rotulos_competencia
+
+# ===================== PADRÕES PRÉ-COMPILADOS =====================
+
+# Espaço dentro da linha: qualquer espaço ASCII exceto '\n', ou NBSP em UTF-8
+# (comum em textos copiados de PDF e aceito pelo \s da versão em str).
+_ESPACO = rb"(?:[^\S\n]|\xc2\xa0)+"
+
+# Primeira ocorrência "MM/AAAA  1.234,56" de cada linha, como o re.search por linha.
+PADRAO_CNIS = re.compile(
+    rb"^[^\n]*?(\d{2})/(\d{4})" + _ESPACO + rb"([0-9.]+),([0-9]{2})",
+    re.MULTILINE,
+)
+
+# Linha da Carta: "Seq.  MM/AAAA  Salário  Índice  Sal. Corrigido  [Observação]".
+PADRAO_CARTA = re.compile(
+    r"^(\d{3})[^\S\n]+(\d{2}/\d{4})[^\S\n]+([0-9.,]+)[^\S\n]+([0-9.,]+)[^\S\n]+([0-9.,]+)([^\S\n]+[^\n]*)?",
+    re.MULTILINE,
+)
+
+TAMANHO_BLOCO = 1 << 20
+CAPACIDADE_INICIAL = 1024
+
+
+# ===================== COLUNAS PRÉ-ALOCADAS =====================
+
+class _Colunas:
+    """Competência (ordinal de mês) e Remuneração (centavos) em arrays que crescem por duplicação."""
+
+    def __init__(self, capacidade=CAPACIDADE_INICIAL):
+        self.competencia = np.empty(capacidade, dtype=np.int32)
+        self.centavos = np.empty(capacidade, dtype=np.int64)
+        self.n = 0
+
+    def _crescer(self):
+        capacidade = len(self.competencia) * 2
+        self.competencia = np.resize(self.competencia, capacidade)
+        self.centavos = np.resize(self.centavos, capacidade)
+
+    def consumir(self, buffer):
+        for match in PADRAO_CNIS.finditer(buffer):
+            mes, ano, inteiro, decimais = match.groups()
+            mes = int(mes)
+            if not 1 <= mes <= 12:
+                continue  # "13/2020" não vira 01/2021: a linha é descartada como as que o padrão rejeita
+            if self.n == len(self.competencia):
+                self._crescer()
+            self.competencia[self.n] = int(ano) * 12 + mes - 1
+            self.centavos[self.n] = int(inteiro.replace(b".", b"") or 0) * 100 + int(decimais)
+            self.n += 1
+
+    def para_dataframe(self, compacto=False):
+        competencia = self.competencia[:self.n]
+        centavos = self.centavos[:self.n]
+        if compacto:
+            df = pd.DataFrame({
+                'Competência': competencia.copy(),
+                'Remuneração': pd.array(centavos, dtype='Int64'),
+            })
+            df.attrs['compacto'] = True
+            return df
+        return pd.DataFrame({
+            'Competência': rotulos_competencia(competencia),
+            'Remuneração': centavos / 100,
+        })
+
+
+# ===================== LEITURA SEM CÓPIAS =====================
+
+def _extrair_arquivo(caminho, colunas):
+    with open(caminho, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            colunas.consumir(mapa)
+
+
+def _extrair_blocos(arquivo, colunas):
+    # Lê em blocos e devolve a última linha incompleta para o próximo bloco.
+    resto = b""
+    while True:
+        bloco = arquivo.read(TAMANHO_BLOCO)
+        if not bloco:
+            break
+        bloco = resto + bloco
+        corte = bloco.rfind(b"\n") + 1
+        colunas.consumir(memoryview(bloco)[:corte])
+        resto = bloco[corte:]
+    if resto:
+        colunas.consumir(resto)
+
+
+def estrutura_cnis(origem, compacto=False):
+    """Extrai Competência/Remuneração de um TXT do CNIS.
+
+    `origem` pode ser um caminho, bytes ou um arquivo binário (incluindo o
+    UploadedFile do Streamlit). O arquivo nunca é decodificado nem quebrado em
+    linhas: um único padrão compilado percorre o buffer (mmap, memoryview do
+    upload ou blocos) e os resultados vão direto para arrays colunares.
+    Com `compacto=True` devolve o esquema compacto (ordinais e centavos, ver
+    `previdencia.esquema`) sem gerar os rótulos.
+    """
+    colunas = _Colunas()
+    if isinstance(origem, (str, os.PathLike)):
+        _extrair_arquivo(origem, colunas)
+    elif isinstance(origem, (bytes, bytearray, memoryview)):
+        colunas.consumir(origem)
+    elif hasattr(origem, 'getbuffer'):
+        buffer = origem.getbuffer()
+        try:
+            colunas.consumir(buffer)
+        finally:
+            buffer.release()
+    else:
+        _extrair_blocos(origem, colunas)
+    return colunas.para_dataframe(compacto)
+
+
+# ===================== CARTA BENEFÍCIO =====================
+
+def _ler_texto(origem):
+    if isinstance(origem, (str, os.PathLike)):
+        with open(origem, 'rb') as f:
+            origem = f.read()
+    elif hasattr(origem, 'getvalue'):
+        origem = origem.getvalue()
+    elif hasattr(origem, 'read'):
+        origem = origem.read()
+    return bytes(origem).decode("utf-8", errors='ignore')
+
+
+# "1.234,56" -> "1234.56"; o Índice só troca a vírgula decimal.
+_SEM_MILHAR = str.maketrans({'.': None, ',': '.'})
+_SO_DECIMAL = str.maketrans({',': '.'})
+
+
+def _numero_br(valores, tabela=_SEM_MILHAR):
+    # Uma tradução sobre a coluna inteira; valores malformados viram NaN.
+    if len(valores) == 0:
+        return np.empty(0, dtype=np.float64)
+    textos = '\n'.join(valores).translate(tabela).split('\n')
+    try:
+        return np.array(textos, dtype=np.float64)
+    except ValueError:
+        return pd.to_numeric(np.array(textos, dtype=object), errors='coerce')
+
+
+def estrutura_carta(origem):
+    """Extrai a tabela de salários da Carta Benefício em uma única passada.
+
+    Aceita caminho, bytes ou arquivo binário, como `estrutura_cnis`. O padrão
+    compilado percorre o texto inteiro de uma vez (sem quebrar em linhas) e as
+    colunas numéricas são convertidas em bloco para float.
+    """
+    campos = np.array(PADRAO_CARTA.findall(_ler_texto(origem)), dtype=object).reshape(-1, 6)
+    return pd.DataFrame({
+        'Seq.': campos[:, 0],
+        'Data': campos[:, 1],
+        'Salário': _numero_br(campos[:, 2]),
+        'Índice': _numero_br(campos[:, 3], _SO_DECIMAL),
+        'Sal. Corrigido': _numero_br(campos[:, 4]),
+        'Observação': [obs.strip() for obs in campos[:, 5]],
+    })
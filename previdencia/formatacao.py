@@ -0,0 +1,23 @@
+# ===================== MOEDA (BRL) =====================
+
+FORMATO_MOEDA = "R$ {:,.2f}"
+
+_PADRAO_BR = str.maketrans({',': '.', '.': ','})
+
+
+def formatar_moeda(valor):
+    return FORMATO_MOEDA.format(valor).translate(_PADRAO_BR)
+
+
+def moeda_em_texto(valores):
+    """Converte uma coluna numérica em textos "R$ 1.234,56" (NaN vira vazio), para exportação."""
+    return [formatar_moeda(v) if v == v else '' for v in valores]
+
+
+def estilo_moeda(df, *colunas):
+    """Exibe as colunas em R$ sem alterar o DataFrame.
+
+    A formatação é feita pelo Styler na renderização: as colunas continuam
+    numéricas, então a ordenação do `st.dataframe` segue o valor e não o texto.
+    """
+    return df.style.format(FORMATO_MOEDA, subset=list(colunas), thousands='.', decimal=',', na_rep='')
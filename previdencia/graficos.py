@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import ORDINAL_INVALIDO
+from previdencia.esquema import ordinais_de
+
+# ===================== SÉRIES PARA GRÁFICOS =====================
+
+PERIODOS = ('Ano', 'Trimestre', 'Mês')
+AGREGACOES = {'Média': 'mean', 'Soma': 'sum'}
+PONTOS_MAXIMOS = 500
+
+
+def _chaves(ordinais, periodo):
+    if periodo == 'Ano':
+        return ordinais // 12
+    if periodo == 'Trimestre':
+        return ordinais // 3
+    return ordinais
+
+
+def _rotulos(chaves, periodo):
+    # Rótulos que, em ordem alfabética, já ficam em ordem cronológica.
+    if periodo == 'Ano':
+        return [str(k) for k in chaves]
+    if periodo == 'Trimestre':
+        return [f"{k // 4}-T{k % 4 + 1}" for k in chaves]
+    return [f"{k // 12}-{k % 12 + 1:02d}" for k in chaves]
+
+
+def agregar(df, periodo='Ano', agregacao='Média', coluna_competencia='Competência',
+            coluna_valor='Remuneração', grupo=None):
+    """Agrupa os valores por ano, trimestre ou mês, em ordem cronológica.
+
+    Devolve as colunas `Período` (rótulo), `Ordem` (chave inteira do período)
+    e `coluna_valor`; com `grupo` (ex.: 'Caso'), uma série por grupo.
+    """
+    ordinais = ordinais_de(df[coluna_competencia])
+    valores = pd.to_numeric(df[coluna_valor], errors='coerce').to_numpy(dtype=np.float64)
+    validos = (ordinais != ORDINAL_INVALIDO) & ~np.isnan(valores)
+
+    dados = pd.DataFrame({'Ordem': _chaves(ordinais[validos].astype(np.int64), periodo), coluna_valor: valores[validos]})
+    chaves = ['Ordem']
+    if grupo is not None:
+        dados.insert(0, grupo, df[grupo].to_numpy()[validos])
+        chaves = [grupo, 'Ordem']
+
+    serie = dados.groupby(chaves, sort=True)[coluna_valor].agg(AGREGACOES[agregacao]).reset_index()
+    serie.insert(len(chaves) - 1, 'Período', _rotulos(serie['Ordem'].tolist(), periodo))
+    return serie
+
+
+# ===================== REDUÇÃO DE PONTOS (LTTB) =====================
+
+def lttb(x, y, limite):
+    """Largest-Triangle-Three-Buckets: posições de `limite` pontos que preservam a forma da série.
+
+    Mantém o primeiro e o último ponto e, em cada balde intermediário, o ponto
+    que forma o maior triângulo com o escolhido no balde anterior e a média do
+    balde seguinte.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if limite >= n or limite < 3:
+        return np.arange(n)
+
+    bordas = np.linspace(1, n - 1, limite - 1).astype(np.int64)
+    escolhidos = np.empty(limite, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    anterior = 0
+    for i in range(limite - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        fim_seguinte = bordas[i + 2] if i + 2 < len(bordas) else n
+        mx, my = x[fim:fim_seguinte].mean(), y[fim:fim_seguinte].mean()
+        area = np.abs((x[anterior] - mx) * (y[inicio:fim] - y[anterior])
+                      - (x[anterior] - x[inicio:fim]) * (my - y[anterior]))
+        anterior = inicio + int(np.argmax(area))
+        escolhidos[i + 1] = anterior
+    return escolhidos
+
+
+def serie_grafico(df, periodo='Ano', agregacao='Média', limite=PONTOS_MAXIMOS, coluna_competencia='Competência',
+                  coluna_valor='Remuneração', grupo=None):
+    """Série agregada e, acima de `limite` pontos por grupo, reduzida por LTTB antes de ir ao navegador."""
+    serie = agregar(df, periodo, agregacao, coluna_competencia, coluna_valor, grupo)
+    if grupo is None:
+        if len(serie) <= limite:
+            return serie
+        return serie.iloc[lttb(serie['Ordem'], serie[coluna_valor], limite)].reset_index(drop=True)
+
+    partes = []
+    for _, parte in serie.groupby(grupo, sort=False):
+        if len(parte) > limite:
+            parte = parte.iloc[lttb(parte['Ordem'], parte[coluna_valor], limite)]
+        partes.append(parte)
+    return pd.concat(partes, ignore_index=True) if partes else serie
@@ -0,0 +1,225 @@
+"""Histórico persistente de casos calculados, em SQLite local.
+
+Cada entrada é identificada pelo hash do conteúdo dos arquivos de entrada
+mais os parâmetros do cálculo (Tc, Es, Id, a, índices, regra). Guarda os
+resultados em JSON (consultáveis em SQL) e, quando há formato de pacote
+disponível, as tabelas já lidas como um Pacote do Caso. Um caso repetido é
+servido do banco sem reler os arquivos.
+
+As entradas gravadas por outra versão do código de cálculo são descartadas
+ao abrir o banco; acima do limite de entradas ou de bytes, saem as usadas
+há mais tempo.
+"""
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from previdencia.cache import CacheLRU, hash_conteudo
+from previdencia.pacote import PacoteCaso, abrir_pacote, exportar_pacote, formatos_disponiveis
+
+ARQUIVO_HISTORICO_PADRAO = os.path.join('dados', 'historico.sqlite')
+MAX_ENTRADAS = 2000
+MAX_BYTES = 512 * 1024 * 1024
+MAX_EM_MEMORIA = 16  # casos já abertos neste processo, servidos sem SQLite nem Parquet
+REGRA_PADRAO = 'media_80_fator'
+
+VERSAO_ESQUEMA = 1
+# Módulos cujo código muda o resultado de um caso: qualquer alteração neles invalida o histórico.
+MODULOS_CALCULO = (
+    'previdencia.anomalias',
+    'previdencia.beneficio',
+    'previdencia.competencia',
+    'previdencia.conciliacao',
+    'previdencia.consolidacao',
+    'previdencia.correcao',
+    'previdencia.esquema',
+    'previdencia.extracao',
+    'previdencia.leitura',
+    'previdencia.limites',
+    'previdencia.lote',
+    'previdencia.otimizacao',
+    'previdencia.pacote',
+    'previdencia.selecao',
+    'previdencia.tabua',
+)
+
+_TABELA = """
+CREATE TABLE IF NOT EXISTS casos (
+    chave      TEXT PRIMARY KEY,
+    versao     TEXT NOT NULL,
+    caso       TEXT,
+    entradas   TEXT NOT NULL,
+    parametros TEXT NOT NULL,
+    resultados TEXT NOT NULL,
+    formato    TEXT,
+    pacote     BLOB,
+    bytes      INTEGER NOT NULL,
+    criado     REAL NOT NULL,
+    acessado   REAL NOT NULL
+)
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def versao_calculo():
+    """Hash do código-fonte dos módulos de cálculo (mais a versão do esquema do banco)."""
+    h = hashlib.blake2b(str(VERSAO_ESQUEMA).encode(), digest_size=8)
+    for modulo in MODULOS_CALCULO:
+        with open(importlib.util.find_spec(modulo).origin, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def chave_caso(arquivos, parametros, regra=REGRA_PADRAO):
+    """Chave do caso: hash dos arquivos (papel -> upload, caminho ou bytes) e dos parâmetros.
+
+    Devolve (chave, entradas), com `entradas` = papel -> hash do conteúdo.
+    """
+    entradas = {papel: hash_conteudo(origem) for papel, origem in sorted(arquivos.items()) if origem is not None}
+    texto = json.dumps({'entradas': entradas, 'parametros': parametros, 'regra': regra},
+                       sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).hexdigest(), entradas
+
+
+def _json(dados):
+    return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class HistoricoResultados:
+    """Resultados de casos em um banco SQLite, com despejo LRU por entradas e por bytes.
+
+    Uma conexão por operação: o objeto pode ser compartilhado entre os
+    reruns do Streamlit e o mesmo arquivo pode ser usado por vários processos
+    do lote. Os casos já abertos ficam também em um LRU em memória: um rerun
+    que pede o mesmo caso não consulta o banco nem decodifica o pacote de
+    novo (o horário de acesso no banco é o da primeira leitura do processo).
+    """
+
+    def __init__(self, caminho=ARQUIVO_HISTORICO_PADRAO, max_entradas=MAX_ENTRADAS, max_bytes=MAX_BYTES):
+        self.caminho = caminho
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._memoria = CacheLRU(max_entradas=MAX_EM_MEMORIA)
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conexao:
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute(_TABELA)
+            conexao.execute('CREATE INDEX IF NOT EXISTS casos_acessado ON casos (acessado)')
+            conexao.execute('DELETE FROM casos WHERE versao != ?', (versao_calculo(),))
+
+    @contextlib.contextmanager
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            with conexao:  # commit ao sair, rollback em erro
+                yield conexao
+        finally:
+            conexao.close()
+
+    def __len__(self):
+        with self._conectar() as conexao:
+            return conexao.execute('SELECT COUNT(*) FROM casos').fetchone()[0]
+
+    # ===================== LEITURA =====================
+
+    def obter(self, chave, tabelas=True):
+        """PacoteCaso guardado para `chave` (tabelas vazias se gravado sem elas) ou None."""
+        em_memoria = self._memoria.obter((chave, tabelas))
+        if em_memoria is not None:
+            return em_memoria.copy()
+        caso = self._obter(chave, tabelas)
+        if caso is not None:
+            self._memoria.guardar((chave, tabelas), caso)
+            return caso.copy()
+        return None
+
+    def _obter(self, chave, tabelas):
+        coluna_pacote = 'pacote' if tabelas else 'NULL'
+        with self._conectar() as conexao:
+            linha = conexao.execute(
+                f'SELECT parametros, resultados, {coluna_pacote} FROM casos WHERE chave = ? AND versao = ?',
+                (chave, versao_calculo()),
+            ).fetchone()
+            if linha is None:
+                return None
+            conexao.execute('UPDATE casos SET acessado = ? WHERE chave = ?', (time.time(), chave))
+
+        parametros, resultados, pacote = json.loads(linha[0]), json.loads(linha[1]), linha[2]
+        if pacote is None:
+            return PacoteCaso({}, parametros, resultados)
+        caso = abrir_pacote.__wrapped__(pacote)
+        return PacoteCaso(caso.tabelas, parametros, resultados)
+
+    def consultar(self, where='', argumentos=()):
+        """Histórico como DataFrame (uma coluna por resultado), do mais recente ao mais antigo.
+
+        `where` é um filtro SQL opcional sobre a tabela `casos`, com `?` para `argumentos`.
+        """
+        sql = 'SELECT chave, caso, entradas, parametros, resultados, bytes, criado, acessado FROM casos'
+        if where:
+            sql += f' WHERE {where}'
+        with self._conectar() as conexao:
+            linhas = conexao.execute(sql + ' ORDER BY criado DESC', argumentos).fetchall()
+        registros = []
+        for chave, caso, entradas, parametros, resultados, tamanho, criado, acessado in linhas:
+            registros.append({
+                'Chave': chave,
+                'Caso': caso,
+                'Criado': pd.Timestamp(criado, unit='s'),
+                'Acessado': pd.Timestamp(acessado, unit='s'),
+                'Bytes': tamanho,
+                'Entradas': json.loads(entradas),
+                **json.loads(parametros),
+                **json.loads(resultados),
+            })
+        return pd.DataFrame(registros)
+
+    # ===================== GRAVAÇÃO =====================
+
+    def guardar(self, chave, entradas, parametros, resultados, tabelas=None, caso=None):
+        """Grava (ou substitui) um caso e despeja os menos usados além dos limites."""
+        formato, pacote = None, None
+        formatos = formatos_disponiveis()
+        if tabelas and formatos:
+            # Parquet reabre mais rápido e sem perda de tipos; XLSX só na falta do pyarrow.
+            formato = 'parquet' if 'parquet' in formatos else formatos[0]
+            pacote = exportar_pacote(tabelas, parametros, resultados, formato)
+        registro = (_json(entradas), _json(parametros), _json(resultados))
+        tamanho = sum(len(texto.encode('utf-8')) for texto in registro) + (len(pacote) if pacote else 0)
+        if tamanho > self.max_bytes:
+            return
+        agora = time.time()
+        self._memoria.limpar()  # uma versão em memória da mesma chave ficaria desatualizada
+        with self._conectar() as conexao:
+            conexao.execute(
+                'INSERT OR REPLACE INTO casos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (chave, versao_calculo(), caso, *registro, formato, pacote, tamanho, agora, agora),
+            )
+            self._despejar(conexao)
+
+    def _despejar(self, conexao):
+        total, ocupado = conexao.execute('SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM casos').fetchone()
+        if total <= self.max_entradas and ocupado <= self.max_bytes:
+            return
+        removidas = []
+        for chave, tamanho in conexao.execute('SELECT chave, bytes FROM casos ORDER BY acessado'):
+            if total <= self.max_entradas and ocupado <= self.max_bytes:
+                break
+            removidas.append((chave,))
+            total -= 1
+            ocupado -= tamanho
+        conexao.executemany('DELETE FROM casos WHERE chave = ?', removidas)
+
+    def limpar(self):
+        self._memoria.limpar()
+        with self._conectar() as conexao:
+            conexao.execute('DELETE FROM casos')
@@ -0,0 +1,105 @@
+"""Componentes Streamlit compartilhados pelos dashboards.
+
+É o único módulo do pacote que importa Streamlit; o núcleo de cálculo não o
+importa, e ele não é exportado por `previdencia`.
+"""
+import contextlib
+
+import streamlit as st
+
+from previdencia.exportacao import MIME_CSV, csv_em_bytes
+from previdencia.formatacao import estilo_moeda
+from previdencia.graficos import AGREGACOES, PERIODOS
+from previdencia.paginacao import TAMANHO_PAGINA, VisaoPaginada, assinatura
+
+TAMANHOS_PAGINA = (25, TAMANHO_PAGINA, 100, 250)
+
+
+# ===================== TABELA PAGINADA =====================
+
+def tabela_paginada(df, chave, moeda=(), cronometro=None):
+    """Mostra `df` em páginas, com busca e filtro por competência feitos no servidor.
+
+    Só a página visível é enviada ao navegador; `moeda` lista as colunas
+    exibidas em R$ (a tabela continua numérica). `chave` distingue os widgets
+    de cada tabela na mesma página. Com `cronometro`, o filtro e a renderização
+    entram como a etapa "Tabela <chave>".
+    """
+    medicao = cronometro.etapa(f"Tabela {chave}", len(df)) if cronometro else contextlib.nullcontext()
+    with medicao:
+        _tabela_paginada(df, chave, moeda)
+
+
+def _visao(df, chave):
+    """VisaoPaginada guardada na sessão: os índices de busca sobrevivem aos reruns enquanto o conteúdo não muda."""
+    atual = assinatura(df)
+    guardada = st.session_state.get(f"{chave}_visao")
+    if atual is not None and guardada is not None and guardada[0] == atual:
+        return guardada[1]
+    visao = VisaoPaginada(df)
+    if atual is not None:
+        st.session_state[f"{chave}_visao"] = (atual, visao)
+    return visao
+
+
+def _tabela_paginada(df, chave, moeda):
+    visao = _visao(df, chave)
+    colunas = st.columns([3, 1, 1, 1])
+    busca = colunas[0].text_input("🔎 Buscar", key=f"{chave}_busca")
+    de, ate = '', ''
+    if visao.coluna_competencia:
+        de = colunas[1].text_input("De (MM/AAAA)", key=f"{chave}_de")
+        ate = colunas[2].text_input("Até (MM/AAAA)", key=f"{chave}_ate")
+    tamanho = colunas[3].selectbox("Linhas", TAMANHOS_PAGINA, index=1, key=f"{chave}_tamanho")
+
+    posicoes = visao.filtrar(busca, de, ate)
+    total = visao.total_paginas(posicoes, tamanho)
+    numero = 1
+    if total > 1:
+        # A chave muda com o total de páginas: um filtro novo volta para a página 1.
+        numero = st.number_input("Página", min_value=1, max_value=total, value=1, step=1, key=f"{chave}_pagina_{total}")
+    parte = visao.pagina(posicoes, numero, tamanho)
+
+    st.dataframe(estilo_moeda(parte, *moeda) if moeda else parte)
+    st.caption(f"{len(posicoes)} de {len(df)} linhas · página {numero} de {total}")
+
+
+# ===================== DOWNLOADS =====================
+
+def download_csv(rotulo, df, nome_arquivo, chave, destino=st):
+    """Botão "Baixar <rotulo>" com o CSV de `df` gerado só sob demanda.
+
+    Como no pacote do caso, um checkbox "Gerar <rotulo>" vem antes: desmarcado,
+    o CSV não é montado no rerun. Marcado, os bytes ficam na sessão e só são
+    refeitos quando o conteúdo de `df` muda. `destino` pode ser `st.sidebar`.
+    """
+    if not destino.checkbox(f"Gerar {rotulo}", key=f"{chave}_gerar"):
+        return
+    atual = assinatura(df)
+    guardado = st.session_state.get(f"{chave}_csv")
+    if atual is None or guardado is None or guardado[0] != atual:
+        guardado = (atual, csv_em_bytes(df))
+        st.session_state[f"{chave}_csv"] = guardado
+    destino.download_button(f"⬇️ Baixar {rotulo}", data=guardado[1], file_name=nome_arquivo, mime=MIME_CSV,
+                            key=f"{chave}_baixar")
+
+
+# ===================== GRÁFICOS =====================
+
+def controles_grafico(chave):
+    """Escolha do período de agrupamento e da agregação (média ou soma)."""
+    colunas = st.columns(2)
+    periodo = colunas[0].radio("Agrupar por", PERIODOS, horizontal=True, key=f"{chave}_periodo")
+    agregacao = colunas[1].radio("Valor por período", list(AGREGACOES), horizontal=True, key=f"{chave}_agregacao")
+    return periodo, agregacao
+
+
+# ===================== DEPURAÇÃO =====================
+
+def painel_tempos(cronometro):
+    """Painel recolhível na barra lateral com o tempo e as linhas de cada etapa deste rerun."""
+    with st.sidebar.expander("🛠️ Depuração: tempos por etapa", expanded=False):
+        resumo = cronometro.resumo()
+        for linha in resumo:
+            linha['ms'] = round(linha.pop('Segundos') * 1000, 1)
+        st.dataframe(resumo, hide_index=True, use_container_width=True)
@@ -0,0 +1,149 @@
+import importlib.util
+import os
+
+import pandas as pd
+
+from previdencia.cache import cache_por_conteudo
+from previdencia.esquema import reais_de
+from previdencia.limites import ARQUIVO_LIMITES_PADRAO, aplicar_limites, carregar_limites
+
+# ===================== ESQUEMAS =====================
+
+# Arquivos exportados pelo extrator: separados por vírgula, com cabeçalho.
+ESQUEMA_CNIS = {
+    'Seq': str,
+    'Competência': str,
+    'Remuneração': 'float64',
+    'Ano': str,
+}
+
+ESQUEMA_DESCONSIDERADOS = {
+    'Seq': str,
+    'Seq.': str,
+    'Data': str,
+    'Salário': 'float64',
+    'Índice': 'float64',
+    'Sal. Corrigido': 'float64',
+    'Observação': str,
+    'Ano': str,
+    'Duplicado': str,
+}
+
+# Carta Benefício exportada em CSV pelo extrator (colunas de `estrutura_carta`).
+ESQUEMA_CARTA = {
+    'Seq.': str,
+    'Data': str,
+    'Salário': 'float64',
+    'Índice': 'float64',
+    'Sal. Corrigido': 'float64',
+    'Observação': str,
+}
+
+PYARROW_DISPONIVEL = importlib.util.find_spec('pyarrow') is not None
+
+
+# ===================== LEITOR TIPADO =====================
+
+def _colunas_do_cabecalho(file, inicio):
+    """Quantidade de colunas do cabeçalho, sem consumir o arquivo (None se não der para voltar)."""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            linha = f.readline()
+    elif inicio is not None and hasattr(file, 'readline'):
+        linha = file.readline()
+        file.seek(inicio)
+    else:
+        return None
+    separador = b',' if isinstance(linha, bytes) else ','
+    return len(linha.split(separador))
+
+
+def ler_csv(file, esquema):
+    """Lê o CSV em uma única passada já com as colunas e tipos do esquema.
+
+    Usa o motor pyarrow quando instalado. Linhas com colunas a mais têm o
+    excedente ignorado e linhas com colunas a menos são completadas com NaN;
+    valores numéricos inválidos viram NaN como no `to_numeric(errors='coerce')`.
+    Um arquivo com menos colunas que o esquema (ex.: CNIS sem a coluna Ano)
+    é lido com as que tem e as demais vêm vazias.
+    """
+    inicio = file.tell() if hasattr(file, 'tell') else None
+    colunas = _colunas_do_cabecalho(file, inicio)
+    if colunas is not None and colunas < len(esquema):
+        presentes = dict(list(esquema.items())[:colunas])
+        df = _ler_csv(file, presentes, inicio)
+        for coluna, tipo in list(esquema.items())[colunas:]:
+            df[coluna] = pd.Series(float('nan'), index=df.index, dtype=object if tipo == str else tipo)
+        return df
+    return _ler_csv(file, esquema, inicio)
+
+
+def _ler_csv(file, esquema, inicio):
+    nomes = list(esquema)
+    # usecols nos dois motores: colunas além do esquema são descartadas em vez de deslocar as demais.
+    opcoes = dict(sep=',', header=None, skiprows=1, names=nomes, usecols=range(len(nomes)), encoding='utf-8')
+
+    def _reiniciar():
+        if inicio is not None:
+            file.seek(inicio)
+
+    if PYARROW_DISPONIVEL:
+        try:
+            return pd.read_csv(file, engine='pyarrow', dtype=esquema, **opcoes)
+        except Exception:
+            _reiniciar()
+
+    try:
+        return pd.read_csv(file, dtype=esquema, **opcoes)
+    except ValueError:
+        _reiniciar()
+
+    # Algum valor numérico malformado: lê como texto e converte com coerce.
+    df = pd.read_csv(file, dtype=str, **opcoes)
+    for coluna, tipo in esquema.items():
+        if tipo != str:
+            df[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype(tipo)
+    return df
+
+
+# ===================== CSV DO CNIS E DESCONSIDERADOS =====================
+
+LIMITE_DISCREPANTE = 50000
+
+
+def remover_discrepantes(df, limite_superior=LIMITE_DISCREPANTE):
+    """Remove remunerações discrepantes (corte fixo, usado só sem a tabela de teto e piso)."""
+    return df[reais_de(df['Remuneração'], df.attrs.get('compacto')) < limite_superior]
+
+
+def limitar_remuneracoes(df, caminho=ARQUIVO_LIMITES_PADRAO):
+    """Limita ao teto de cada competência quando a tabela de teto e piso existe.
+
+    Aplicar sobre o CNIS consolidado: o teto vale para a soma dos vínculos
+    da competência, não para cada linha.
+
+    Devolve (df, ajustes) como `aplicar_limites`; sem a tabela, aplica o corte
+    fixo de `remover_discrepantes` e `ajustes` é None.
+    """
+    if caminho and os.path.exists(caminho):
+        return aplicar_limites(df, carregar_limites(caminho))
+    return remover_discrepantes(df), None
+
+
+@cache_por_conteudo
+def ler_cnis(file):
+    return ler_csv(file, ESQUEMA_CNIS)
+
+
+def organizar_cnis(file):
+    return limitar_remuneracoes(ler_cnis(file))[0]
+
+
+@cache_por_conteudo
+def organizar_desconsiderados(file):
+    return ler_csv(file, ESQUEMA_DESCONSIDERADOS)
+
+
+@cache_por_conteudo
+def ler_carta(file):
+    return ler_csv(file, ESQUEMA_CARTA)
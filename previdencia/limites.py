@@ -0,0 +1,121 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import ORDINAL_INVALIDO, rotulos_competencia
+from previdencia.esquema import centavos_de, ordinais_de, para_reais
+
+# ===================== TETO E PISO POR COMPETÊNCIA =====================
+
+ARQUIVO_LIMITES_PADRAO = os.path.join('dados', 'teto_piso.csv')
+
+AJUSTE_TETO = 'Limitado ao teto'
+AJUSTE_PISO = 'Abaixo do piso'
+
+
+class TabelaLimites:
+    """Teto previdenciário e salário mínimo (piso) de cada mês, em arrays densos.
+
+    `teto[k]` e `piso[k]` valem para o mês `inicio + k` (ordinal de mês). A
+    tabela de origem lista só as competências em que o valor mudou; cada mês
+    herda a última vigência. Competências depois da última linha usam os
+    valores mais recentes; antes da primeira, ou inválidas, ficam NaN.
+    """
+
+    def __init__(self, inicio, teto, piso):
+        self.inicio = int(inicio)
+        self.teto = np.asarray(teto, dtype=np.float64)
+        self.piso = np.asarray(piso, dtype=np.float64)
+
+    @classmethod
+    def de_tabela(cls, df, coluna_competencia='Competência', coluna_teto='Teto', coluna_piso='Piso'):
+        ordinais = ordinais_de(df[coluna_competencia])
+        validos = ordinais != ORDINAL_INVALIDO
+        if not validos.any():
+            raise ValueError("Tabela de teto e piso vazia.")
+        ordinais = ordinais[validos]
+        inicio = int(ordinais.min())
+        meses = int(ordinais.max()) - inicio + 1
+
+        limites = []
+        for coluna in (coluna_teto, coluna_piso):
+            valores = pd.to_numeric(df[coluna], errors='coerce').to_numpy(dtype=np.float64)[validos]
+            densa = np.full(meses, np.nan)
+            densa[ordinais - inicio] = valores
+            # Preenche para frente: cada mês fica com a última vigência informada.
+            informados = ~np.isnan(densa)
+            posicao = np.maximum.accumulate(np.where(informados, np.arange(meses), 0))
+            densa = densa[posicao]
+            densa[~np.maximum.accumulate(informados)] = np.nan
+            limites.append(densa)
+        return cls(inicio, *limites)
+
+    def limites(self, ordinais):
+        """(teto, piso) de cada ordinal de mês."""
+        ordinais = np.asarray(ordinais, dtype=np.int64)
+        k = np.minimum(ordinais - self.inicio, len(self.teto) - 1)
+        fora = (ordinais == ORDINAL_INVALIDO) | (k < 0)
+        k = np.clip(k, 0, None)
+        teto, piso = self.teto[k], self.piso[k]
+        teto[fora] = np.nan
+        piso[fora] = np.nan
+        return teto, piso
+
+
+def aplicar_limites(df, tabela, coluna_competencia='Competência', coluna_valor='Remuneração'):
+    """Limita cada remuneração ao teto da sua competência e marca as abaixo do piso.
+
+    Substitui o corte fixo de `remover_discrepantes`: nenhuma linha é
+    descartada. Devolve (df ajustado, ajustes), em que `ajustes` lista as
+    linhas alteradas ou marcadas com o valor informado, o teto, o piso, o
+    valor considerado e o tipo do ajuste. Uma passada vetorizada, em centavos;
+    aceita os dois esquemas.
+    """
+    compacto = bool(df.attrs.get('compacto'))
+    ordinais = ordinais_de(df[coluna_competencia])
+    informado = centavos_de(df[coluna_valor], compacto).to_numpy(dtype=np.float64, na_value=np.nan)
+
+    teto, piso = tabela.limites(ordinais)
+    teto_centavos, piso_centavos = np.rint(teto * 100), np.rint(piso * 100)
+    # NaN no teto (competência fora da tabela) não limita: np.fmin ignora NaN.
+    considerado = np.fmin(informado, teto_centavos)
+    acima = informado > teto_centavos
+    abaixo = informado < piso_centavos
+
+    ajustado = df.copy()
+    if compacto:
+        ajustado[coluna_valor] = pd.array(considerado, dtype='Int64')
+    else:
+        ajustado[coluna_valor] = para_reais(pd.array(considerado, dtype='Int64'))
+
+    marcadas = np.flatnonzero(acima | abaixo)
+    ajustes = pd.DataFrame({
+        'Competência': rotulos_competencia(ordinais[marcadas]) if len(marcadas) else np.array([], dtype=object),
+        'Remuneração Informada': informado[marcadas] / 100,
+        'Teto': teto[marcadas],
+        'Piso': piso[marcadas],
+        'Remuneração Considerada': considerado[marcadas] / 100,
+        'Ajuste': np.where(acima[marcadas], AJUSTE_TETO, AJUSTE_PISO),
+    })
+    return ajustado, ajustes
+
+
+@functools.lru_cache(maxsize=4)
+def _carregar_limites(caminho, _modificado_em):
+    if caminho.lower().endswith('.parquet'):
+        df = pd.read_parquet(caminho)
+    else:
+        df = pd.read_csv(caminho, dtype={'Competência': str})
+    return TabelaLimites.de_tabela(df)
+
+
+def carregar_limites(caminho=ARQUIVO_LIMITES_PADRAO):
+    """Carrega a tabela (CSV ou Parquet com colunas Competência, Teto, Piso).
+
+    Uma linha por mudança de valor, com a competência inicial da vigência e
+    os valores na moeda da época. Relida só quando o arquivo muda.
+    """
+    caminho = os.fspath(caminho)
+    return _carregar_limites(caminho, os.path.getmtime(caminho))
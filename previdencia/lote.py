@@ -0,0 +1,338 @@
+"""Processamento em lote de casos previdenciários, sem Streamlit.
+
+Uso:
+    python -m previdencia.lote ENTRADA [--saida DIR] [--processos N] [--formato csv|parquet]
+
+ENTRADA é uma pasta com uma subpasta por caso (arquivos cujo nome contém
+"cnis", "carta" e "desconsiderados", em TXT ou CSV) ou um manifesto CSV com
+as colunas caso, cnis, carta, desconsiderados e, opcionalmente, Tc, Es, Id, a.
+O resumo de todos os casos vai para um único CSV/Parquet e cada caso ganha
+um JSON de auditoria.
+
+Com --concessao MM/AAAA (ou a coluna concessao no manifesto), o Es de cada caso
+é consultado na tábua de sobrevida (--tabua) pela idade e data de concessão.
+
+Remunerações fora do padrão do ano ou com pico isolado entre competências
+vizinhas (erro de OCR/extração) são contadas e listadas na auditoria, sem
+sair do cálculo.
+
+Remunerações acima do teto da competência são limitadas pela tabela de teto
+e piso (--limites); sem a tabela, vale o corte fixo de R$ 50.000.
+
+Os desconsiderados só são reaproveitados dentro do período básico de cálculo
+(a partir de --periodo-basico, padrão 07/1994; vazio para todo o CNIS).
+
+Os casos são calculados no esquema compacto (competências em ordinais de
+mês, valores em centavos inteiros): menos memória por processo do pool.
+
+Com --historico ARQUIVO.sqlite, casos já calculados (mesmos arquivos e
+parâmetros, mesma versão do código) vêm do histórico em vez de serem relidos.
+"""
+import argparse
+import functools
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from previdencia.anomalias import pontuar_anomalias, suspeitos
+from previdencia.beneficio import PARAMETROS_PADRAO, fator_previdenciario, salario_de_beneficio
+from previdencia.conciliacao import SITUACAO_OK, conciliar, resumo_conciliacao
+from previdencia.consolidacao import consolidar
+from previdencia.esquema import compactar, expandir, reais_de
+from previdencia.extracao import estrutura_carta, estrutura_cnis
+from previdencia.historico import HistoricoResultados, chave_caso
+from previdencia.leitura import ler_carta, ler_cnis, limitar_remuneracoes, organizar_desconsiderados
+from previdencia.limites import ARQUIVO_LIMITES_PADRAO
+from previdencia.otimizacao import PERIODO_BASICO, Reaproveitamento
+from previdencia.selecao import SelecaoMaiores
+from previdencia.tabua import ARQUIVO_TABUA_PADRAO, carregar_tabua
+
+PAPEIS = ('cnis', 'carta', 'desconsiderados')
+EXTENSOES = ('.txt', '.csv')
+
+
+# ===================== DESCOBERTA DOS CASOS =====================
+
+def _papel(nome):
+    nome = nome.lower()
+    if not nome.endswith(EXTENSOES):
+        return None
+    if 'desconsid' in nome:
+        return 'desconsiderados'
+    if 'carta' in nome:
+        return 'carta'
+    if 'cnis' in nome:
+        return 'cnis'
+    return None
+
+
+def _caso_da_pasta(pasta, parametros, concessao):
+    caso = {'caso': os.path.basename(os.path.normpath(pasta)), 'parametros': dict(parametros), 'concessao': concessao}
+    for nome in sorted(os.listdir(pasta)):
+        papel = _papel(nome)
+        if papel and papel not in caso:
+            caso[papel] = os.path.join(pasta, nome)
+    return caso if 'cnis' in caso else None
+
+
+def descobrir_casos(entrada, parametros=PARAMETROS_PADRAO, concessao=None):
+    """Lista os casos de uma pasta (uma subpasta por caso) ou de um manifesto CSV."""
+    if os.path.isfile(entrada):
+        base = os.path.dirname(os.path.abspath(entrada))
+        manifesto = pd.read_csv(entrada, dtype=str, keep_default_na=False)
+        casos = []
+        for linha in manifesto.to_dict('records'):
+            caso = {'caso': linha['caso'], 'parametros': dict(parametros), 'concessao': linha.get('concessao') or concessao}
+            for papel in PAPEIS:
+                if linha.get(papel):
+                    caso[papel] = os.path.join(base, linha[papel])
+            for nome in parametros:
+                if linha.get(nome):
+                    caso['parametros'][nome] = float(linha[nome])
+            casos.append(caso)
+        return casos
+
+    subpastas = sorted(e.path for e in os.scandir(entrada) if e.is_dir())
+    casos = [_caso_da_pasta(p, parametros, concessao) for p in subpastas] or [_caso_da_pasta(entrada, parametros, concessao)]
+    return [caso for caso in casos if caso]
+
+
+# ===================== CÁLCULO DE UM CASO =====================
+
+def _ler_cnis(caminho):
+    # Cada caso é lido uma única vez no lote: dispensa o cache dos dashboards.
+    if caminho.lower().endswith('.txt'):
+        return estrutura_cnis(caminho, compacto=True)
+    return compactar(ler_cnis.__wrapped__(caminho))
+
+
+def _ler_carta(caminho):
+    if caminho is None:
+        return None
+    if caminho.lower().endswith('.txt'):
+        return compactar(estrutura_carta(caminho))
+    if caminho.lower().endswith('.csv'):
+        return compactar(ler_carta.__wrapped__(caminho))  # Carta exportada pelo extrator
+    raise ValueError(f"Formato da Carta não suportado (use TXT ou CSV): {caminho}")
+
+
+def _ler_desconsiderados(caso, df_carta):
+    if 'desconsiderados' in caso:
+        return compactar(organizar_desconsiderados.__wrapped__(caso['desconsiderados']))
+    if df_carta is not None:
+        return df_carta[df_carta['Observação'] == 'DESCONSIDERADO']
+    return None
+
+
+def _numero(valor):
+    valor = float(valor)
+    return None if math.isnan(valor) else valor
+
+
+def _parametros_do_caso(caso):
+    """Parâmetros do fator; com data de concessão, o Es vem da tábua de sobrevida."""
+    parametros = caso['parametros']
+    if not caso.get('concessao'):
+        return parametros
+    tabua = carregar_tabua(caso.get('tabua') or ARQUIVO_TABUA_PADRAO)
+    es = float(tabua.expectativa(parametros['Id'], caso['concessao'])[0])
+    if math.isnan(es):
+        raise ValueError(f"Sem Es na tábua para idade {parametros['Id']} e concessão {caso['concessao']}")
+    return {**parametros, 'Es': es}
+
+
+@functools.lru_cache(maxsize=None)
+def _historico(caminho):
+    # Um por processo do pool; a conexão SQLite é aberta a cada operação.
+    return HistoricoResultados(caminho)
+
+
+def calcular_caso(caso):
+    """Calcula média dos 80% maiores, fator e salário de benefício de um caso.
+
+    Com `caso['historico']`, consulta antes o histórico SQLite e grava nele o resultado novo.
+    """
+    parametros = _parametros_do_caso(caso)
+    if not caso.get('historico'):
+        return {**_calcular(caso, parametros), 'Do Histórico': False}
+
+    historico = _historico(caso['historico'])
+    arquivos = {papel: caso.get(papel) for papel in PAPEIS}
+    limites = caso.get('limites', ARQUIVO_LIMITES_PADRAO)
+    if limites and os.path.exists(limites):
+        arquivos['limites'] = limites  # outra tabela de teto e piso muda o resultado
+    # O período do reaproveitamento muda o resultado, mas não é parâmetro do fator: só entra na chave
+    chave, entradas = chave_caso(arquivos, {**parametros, 'Período Básico': caso.get('periodo', PERIODO_BASICO)})
+    guardado = historico.obter(chave, tabelas=False)
+    if guardado is not None:
+        return {**guardado.resultados, 'Caso': caso['caso'], 'Do Histórico': True}
+    resultado = _calcular(caso, parametros)
+    historico.guardar(chave, entradas, parametros, resultado, caso=caso['caso'])
+    return {**resultado, 'Do Histórico': False}
+
+
+def _calcular(caso, parametros):
+    df_bruto = _ler_cnis(caso['cnis'])
+    df_suspeitos = suspeitos(df_bruto, pontuar_anomalias(df_bruto))  # antes do teto, que mascara o erro
+    df_cnis = consolidar(df_bruto)  # um salário por competência: vínculos somados, duplicatas fora
+    # O teto vale para a soma dos vínculos da competência, então só depois da consolidação.
+    df_cnis, ajustes = limitar_remuneracoes(df_cnis, caso.get('limites', ARQUIVO_LIMITES_PADRAO))
+    df_carta = _ler_carta(caso.get('carta'))
+    df_desconsiderados = _ler_desconsiderados(caso, df_carta)
+
+    selecao_80 = SelecaoMaiores(reais_de(df_cnis['Remuneração'], compacto=True))
+    min_80 = selecao_80.minimo
+    media_salarios = selecao_80.media
+    fator = fator_previdenciario(parametros['Tc'], parametros['Es'], parametros['Id'], parametros['a'])
+    salario_beneficio = salario_de_beneficio(media_salarios, fator)
+
+    conciliacao = None
+    if df_carta is not None:
+        resumo = resumo_conciliacao(conciliar(df_cnis, df_carta))
+        conciliacao = {situacao: qtd for situacao, qtd in resumo.items() if situacao != SITUACAO_OK}
+
+    reaproveitamento = None
+    if df_desconsiderados is not None:
+        reaproveitamento = Reaproveitamento(df_cnis, df_desconsiderados, periodo=caso.get('periodo', PERIODO_BASICO))
+
+    return {
+        'Caso': caso['caso'],
+        'Registros CNIS': len(df_bruto),
+        'Competências CNIS': len(df_cnis),
+        'Duplicados CNIS': int(df_cnis['Duplicados'].sum()),
+        'Ajustes Teto/Piso': None if ajustes is None else len(ajustes),
+        'Remunerações Suspeitas': len(df_suspeitos),
+        'Registros Carta': None if df_carta is None else len(df_carta),
+        'Divergências CNIS × Carta': None if conciliacao is None else sum(conciliacao.values()),
+        '80% Maiores Salários': selecao_80.qtd,
+        'Média 80%': _numero(round(media_salarios, 2)),
+        'Menor Salário 80%': _numero(min_80),
+        'Fator Previdenciário': fator,
+        'Salário de Benefício': _numero(salario_beneficio),
+        'Desconsiderados Reaproveitados': None if reaproveitamento is None else len(reaproveitamento.trocas),
+        'Média 80% sem Reaproveitamento': (
+            None if reaproveitamento is None else _numero(round(reaproveitamento.media_original, 2))
+        ),
+        'Média 80% com Reaproveitamento': None if reaproveitamento is None else _numero(round(reaproveitamento.media, 2)),
+        'Salário de Benefício com Reaproveitamento': (
+            None if reaproveitamento is None else _numero(salario_de_beneficio(reaproveitamento.media, fator))
+        ),
+        'Competências Reaproveitáveis': [] if reaproveitamento is None else reaproveitamento.trocas['Competência'].tolist(),
+        'Conciliação CNIS × Carta': conciliacao,
+        'Competências Ajustadas': [] if ajustes is None else ajustes.to_dict('records'),
+        'Competências Suspeitas': expandir(
+            df_suspeitos[['Competência', 'Remuneração', 'Mediana do Período', 'Pontuação']]
+        ).to_dict('records'),
+        'Concessão': caso.get('concessao'),
+        **parametros,
+    }
+
+
+def processar_caso(caso):
+    """Executa um caso capturando erros, para que um arquivo ruim não derrube o lote."""
+    inicio = time.perf_counter()
+    try:
+        resultado = calcular_caso(caso)
+        resultado['Erro'] = None
+    except Exception as erro:
+        resultado = {'Caso': caso['caso'], **caso['parametros'], 'Erro': f"{type(erro).__name__}: {erro}"}
+    resultado['Tempo (s)'] = round(time.perf_counter() - inicio, 4)
+    resultado['Arquivos'] = {papel: caso[papel] for papel in PAPEIS if papel in caso}
+    return resultado
+
+
+# ===================== EXECUÇÃO DO LOTE =====================
+
+def processar_lote(casos, processos=None):
+    """Distribui os casos por um pool de processos, preservando a ordem de entrada."""
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(casos) <= 1:
+        return [processar_caso(caso) for caso in casos]
+    pedaco = max(1, len(casos) // (processos * 4))
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(processar_caso, casos, chunksize=pedaco))
+
+
+def _nome_auditoria(caso, usados):
+    """Nome do JSON de auditoria: sem separadores de pasta nem '..', e único no lote."""
+    nome = re.sub(r'[^\w.-]|\.{2,}', '_', str(caso)).lstrip('.') or 'caso'
+    unico, n = nome, 1
+    while unico.lower() in usados:
+        n += 1
+        unico = f"{nome}_{n}"
+    usados.add(unico.lower())
+    return f"{unico}.json"
+
+
+def gravar_resultados(resultados, saida, formato='csv'):
+    os.makedirs(os.path.join(saida, 'auditoria'), exist_ok=True)
+    usados = set()
+    for resultado in resultados:
+        caminho = os.path.join(saida, 'auditoria', _nome_auditoria(resultado['Caso'], usados))
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=4, ensure_ascii=False)
+
+    colunas_detalhe = ('Competências Reaproveitáveis', 'Conciliação CNIS × Carta', 'Competências Ajustadas',
+                       'Competências Suspeitas', 'Arquivos')
+    resumo = pd.DataFrame([{k: v for k, v in r.items() if k not in colunas_detalhe} for r in resultados])
+    colunas_inteiras = ('Registros CNIS', 'Competências CNIS', 'Duplicados CNIS', 'Ajustes Teto/Piso', 'Remunerações Suspeitas',
+                        'Registros Carta', 'Divergências CNIS × Carta', '80% Maiores Salários', 'Desconsiderados Reaproveitados')
+    for coluna in colunas_inteiras:
+        if coluna in resumo:
+            resumo[coluna] = resumo[coluna].astype('Int64')
+    caminho_resumo = os.path.join(saida, f"resumo.{formato}")
+    if formato == 'parquet':
+        resumo.to_parquet(caminho_resumo, index=False)
+    else:
+        resumo.to_csv(caminho_resumo, index=False)
+    return caminho_resumo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m previdencia.lote', description="Cálculo previdenciário em lote.")
+    parser.add_argument('entrada', help="Pasta de casos ou manifesto CSV")
+    parser.add_argument('--saida', default='resultados_lote', help="Pasta de saída (resumo e auditoria)")
+    parser.add_argument('--processos', type=int, default=None, help="Processos em paralelo (padrão: núcleos da máquina)")
+    parser.add_argument('--formato', choices=('csv', 'parquet'), default='csv', help="Formato do resumo")
+    parser.add_argument('--concessao', default=None, help="Competência de concessão MM/AAAA (Es pela tábua)")
+    parser.add_argument('--tabua', default=ARQUIVO_TABUA_PADRAO, help="Tábua de sobrevida (CSV/Parquet: Ano, Idade, Expectativa)")
+    parser.add_argument('--limites', default=ARQUIVO_LIMITES_PADRAO, help="Tabela de teto e piso (CSV/Parquet: Competência, Teto, Piso)")
+    parser.add_argument('--periodo-basico', default=PERIODO_BASICO[0],
+                        help="Início MM/AAAA do período em que desconsiderados são reaproveitados (vazio: todo o CNIS)")
+    parser.add_argument('--historico', default=None, help="Histórico SQLite de resultados (reaproveita casos já calculados)")
+    for nome, valor in PARAMETROS_PADRAO.items():
+        parser.add_argument(f'--{nome}', type=float, default=valor, help=f"Parâmetro {nome} (padrão {valor})")
+    args = parser.parse_args(argv)
+
+    parametros = {nome: getattr(args, nome) for nome in PARAMETROS_PADRAO}
+    casos = descobrir_casos(args.entrada, parametros, args.concessao)
+    if not casos:
+        parser.error(f"Nenhum caso com arquivo CNIS encontrado em {args.entrada}")
+    if any(caso['concessao'] for caso in casos):
+        carregar_tabua(args.tabua)  # gera o índice .npy uma vez; os processos só o mapeiam
+        for caso in casos:
+            caso['tabua'] = args.tabua
+    for caso in casos:
+        caso['limites'] = args.limites
+        caso['periodo'] = (args.periodo_basico, None) if args.periodo_basico else None
+    if args.historico:
+        HistoricoResultados(args.historico)  # cria o banco e descarta versões antigas antes do pool
+        for caso in casos:
+            caso['historico'] = args.historico
+
+    inicio = time.perf_counter()
+    resultados = processar_lote(casos, args.processos)
+    caminho_resumo = gravar_resultados(resultados, args.saida, args.formato)
+    erros = sum(1 for r in resultados if r['Erro'])
+    print(f"{len(resultados)} casos em {time.perf_counter() - inicio:.2f}s ({erros} com erro) -> {caminho_resumo}")
+    return 1 if erros else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
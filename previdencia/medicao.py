@@ -0,0 +1,56 @@
+import contextlib
+import time
+
+# ===================== TEMPOS POR ETAPA =====================
+
+
+class Etapa:
+    """Uma etapa medida: nome, duração em segundos e linhas processadas (se informadas)."""
+
+    __slots__ = ('nome', 'segundos', 'linhas')
+
+    def __init__(self, nome, linhas=None):
+        self.nome = nome
+        self.segundos = 0.0
+        self.linhas = linhas
+
+    def como_dicionario(self):
+        return {'Etapa': self.nome, 'Segundos': round(self.segundos, 6), 'Linhas': self.linhas}
+
+
+class Cronometro:
+    """Registra o tempo de cada etapa de uma execução (um rerun do dashboard).
+
+    Uso:
+        cronometro = Cronometro()
+        with cronometro.etapa("Leitura CNIS") as etapa:
+            df_cnis = organizar_cnis(arquivo)
+            etapa.linhas = len(df_cnis)
+
+    Só usa `time.perf_counter`; o custo por etapa é de microssegundos.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.etapas = []
+
+    @contextlib.contextmanager
+    def etapa(self, nome, linhas=None):
+        registro = Etapa(nome, linhas)
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            registro.segundos = time.perf_counter() - inicio
+            self.etapas.append(registro)
+
+    @property
+    def total(self):
+        """Segundos desde a criação do cronômetro (inclui o que ficou fora das etapas)."""
+        return time.perf_counter() - self.inicio
+
+    def resumo(self):
+        """Lista serializável em JSON, na ordem em que as etapas terminaram, com o total ao final."""
+        linhas = [e.como_dicionario() for e in self.etapas]
+        linhas.append({'Etapa': 'Total da execução', 'Segundos': round(self.total, 6), 'Linhas': None})
+        return linhas
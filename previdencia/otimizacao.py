@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+from previdencia.beneficio import salario_de_beneficio
+from previdencia.competencia import ORDINAL_INVALIDO, ordinal_competencia, rotulos_competencia
+from previdencia.esquema import ordinais_de, reais_de
+from previdencia.selecao import SelecaoMaiores
+
+# ===================== REAPROVEITAMENTO DE DESCONSIDERADOS =====================
+
+TIPO_SUBSTITUICAO = 'Substituição'
+TIPO_INCLUSAO = 'Inclusão'
+COLUNAS_TROCAS = ('Competência', 'Tipo', 'Salário CNIS', 'Sal. Corrigido', 'Ganho na Média')
+PERIODO_BASICO = ('07/1994', None)  # período básico de cálculo: competências a partir do Plano Real
+
+
+def _um_por_competencia(ordinais, valores, periodo):
+    """Maior valor de cada competência válida dentro do período, em ordem de competência."""
+    validos = (ordinais != ORDINAL_INVALIDO) & ~np.isnan(valores)
+    if periodo is not None:
+        de, ate = (ordinal_competencia([limite])[0] if limite else ORDINAL_INVALIDO for limite in periodo)
+        if de != ORDINAL_INVALIDO:
+            validos &= ordinais >= de
+        if ate != ORDINAL_INVALIDO:
+            validos &= ordinais <= ate
+    ordinais, valores = ordinais[validos], valores[validos]
+    ordem = np.lexsort((valores, ordinais))
+    ordinais, valores = ordinais[ordem], valores[ordem]
+    ultimo = np.append(ordinais[1:] != ordinais[:-1], True)[:len(ordinais)]  # maior valor fica por último no grupo
+    return ordinais[ultimo], valores[ultimo]
+
+
+def _melhor_inclusao(base, inclusoes, proporcao):
+    """Quantas inclusões (as maiores primeiro) maximizam a média dos `proporcao` maiores.
+
+    Com `base` e `inclusoes` em ordem decrescente, a inclusão j (1..t) está entre
+    os k maiores quando (base acima dela) + j <= k; esse posto cresce com j, então
+    uma busca binária dá quantas inclusões entram no corte de cada t, e as somas
+    de prefixo dão a média de todos os t de uma vez.
+    """
+    n, m = len(base), len(inclusoes)
+    t = np.arange(m + 1)
+    k = ((n + t) * proporcao).astype(np.int64)
+    postos = np.searchsorted(-base, -inclusoes, side='left') + np.arange(1, m + 1)
+    j = np.minimum(t, np.searchsorted(postos, k, side='right'))
+    soma_base = np.concatenate(([0.0], np.cumsum(base)))
+    soma_inclusoes = np.concatenate(([0.0], np.cumsum(inclusoes)))
+    somas = soma_inclusoes[j] + soma_base[np.minimum(k - j, n)]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        medias = np.where(k > 0, somas / np.maximum(k, 1), np.nan)
+    if np.isnan(medias).all():
+        return 0
+    return int(np.nanargmax(medias))
+
+
+class Reaproveitamento:
+    """Combinação de salários CNIS e desconsiderados que maximiza a média dos 80% maiores.
+
+    Restrições: um salário por competência (o maior, quando há mais de um) e,
+    opcionalmente, só competências dentro de `periodo` ("MM/AAAA", "MM/AAAA";
+    ex.: ("07/1994", None) para o período básico de cálculo).
+
+    Um desconsiderado de competência já presente no CNIS só entra no lugar do
+    salário CNIS, e só se for maior (substituição nunca reduz a média). De
+    competência ausente do CNIS, ele aumenta o número de salários e portanto o
+    corte dos 80%: entram as inclusões, das maiores para as menores, até o
+    ponto em que a média é máxima.
+
+    Tudo em O(n log n): ordenação das duas listas, buscas binárias e somas de
+    prefixo; a média final sai de `SelecaoMaiores`. Aceita os dois esquemas.
+    """
+
+    def __init__(self, df_cnis, df_desconsiderados, proporcao=0.8, periodo=None,
+                 coluna_competencia='Competência', coluna_salario='Remuneração',
+                 coluna_competencia_desconsiderados='Data', coluna_salario_desconsiderados='Sal. Corrigido'):
+        self.proporcao = proporcao
+        ordinais, valores = _um_por_competencia(
+            ordinais_de(df_cnis[coluna_competencia]),
+            reais_de(df_cnis[coluna_salario], df_cnis.attrs.get('compacto')),
+            periodo,
+        )
+        ordinais_d, valores_d = _um_por_competencia(
+            ordinais_de(df_desconsiderados[coluna_competencia_desconsiderados]),
+            reais_de(df_desconsiderados[coluna_salario_desconsiderados], df_desconsiderados.attrs.get('compacto')),
+            periodo,
+        )
+
+        # Competências dos desconsiderados já presentes no CNIS (as duas listas estão ordenadas).
+        posicoes = np.searchsorted(ordinais, ordinais_d)
+        presente = posicoes < len(ordinais)
+        presente[presente] = ordinais[posicoes[presente]] == ordinais_d[presente]
+        substitui = presente.copy()
+        substitui[presente] = valores_d[presente] > valores[posicoes[presente]]
+
+        otimizados = valores.copy()
+        otimizados[posicoes[substitui]] = valores_d[substitui]
+
+        ausentes = np.flatnonzero(~presente)
+        ausentes = ausentes[np.argsort(-valores_d[ausentes], kind='stable')]
+        t = _melhor_inclusao(np.sort(otimizados)[::-1], valores_d[ausentes], proporcao)
+        incluidas = np.sort(ausentes[:t])
+
+        self.original = SelecaoMaiores(valores, proporcao)
+        self.otimizada = SelecaoMaiores(np.concatenate((otimizados, valores_d[incluidas])), proporcao)
+        self.trocas = self._trocas(
+            np.concatenate((ordinais_d[substitui], ordinais_d[incluidas])),
+            np.concatenate((valores[posicoes[substitui]], np.full(len(incluidas), np.nan))),
+            np.concatenate((valores_d[substitui], valores_d[incluidas])),
+            np.concatenate((posicoes[substitui], len(otimizados) + np.arange(len(incluidas)))),
+        )
+
+    @property
+    def media_original(self):
+        return self.original.media
+
+    @property
+    def media(self):
+        return self.otimizada.media
+
+    @property
+    def ganho_media(self):
+        return self.media - self.media_original
+
+    def salarios(self, fator):
+        """(salário de benefício original, salário de benefício otimizado) para o `fator` dado."""
+        return salario_de_beneficio(self.media_original, fator), salario_de_beneficio(self.media, fator)
+
+    def _trocas(self, ordinais, anteriores, novos, posicoes_finais):
+        """Trocas que entram nos 80% maiores, com o ganho marginal de cada uma.
+
+        O ganho de uma troca é quanto a média otimizada cairia sem ela (as
+        demais mantidas): substituição volta ao salário CNIS, inclusão sai e
+        pode reduzir o corte em um. Calculado para todas de uma vez a partir da
+        soma dos k maiores e do maior valor fora do corte.
+        """
+        otimizada = self.otimizada
+        final = np.zeros(len(otimizada.valores), dtype=bool)
+        final[otimizada.maiores] = True
+        entram = final[posicoes_finais]
+        ordinais, anteriores, novos = ordinais[entram], anteriores[entram], novos[entram]
+
+        k = otimizada.qtd
+        soma = float(otimizada.valores[otimizada.maiores].sum())
+        fora = otimizada.valores[otimizada.descartados]
+        fora = fora[~np.isnan(fora)]
+        proximo = float(fora.max()) if len(fora) else 0.0
+
+        inclusao = np.isnan(anteriores)
+        substituto = np.maximum(np.nan_to_num(anteriores, nan=0.0), proximo)
+        ganhos = (novos - substituto) / max(k, 1)
+        k_sem = int((len(otimizada.valores) - 1) * self.proporcao)
+        if k_sem < k:
+            # Sem a inclusão o corte diminui: a média passa a ser (soma - valor) / (k - 1).
+            media_sem = (soma - novos[inclusao]) / k_sem if k_sem else 0.0
+            ganhos[inclusao] = soma / k - media_sem
+
+        trocas = pd.DataFrame({
+            'Competência': rotulos_competencia(ordinais) if len(ordinais) else np.array([], dtype=object),
+            'Tipo': np.where(inclusao, TIPO_INCLUSAO, TIPO_SUBSTITUICAO),
+            'Salário CNIS': anteriores,
+            'Sal. Corrigido': novos,
+            'Ganho na Média': ganhos,
+            'Ordem': ordinais,
+        })
+        return trocas.sort_values('Ordem', kind='stable').drop(columns='Ordem').reset_index(drop=True)
@@ -0,0 +1,200 @@
+"""Pacote do caso: todas as tabelas, parâmetros e resultados em um único arquivo.
+
+Dois formatos, ambos gerados em memória em uma única passada:
+
+- XLSX: uma aba por tabela mais as abas "Parâmetros", "Resultados" e
+  "Esquema" (tipos de cada coluna e se a tabela estava no esquema compacto);
+- ZIP com um dataset Parquet: um arquivo .parquet por tabela e um caso.json.
+
+`abrir_pacote` restaura o caso a partir de qualquer um dos dois, sem
+reprocessar os TXT/CSV originais. Só o Parquet é exato: o Excel não separa
+texto vazio de célula vazia, então uma coluna de texto que tenha os dois
+volta com NaN no lugar dos vazios (coluna só com vazios volta certa).
+"""
+import importlib.util
+import io
+import json
+import zipfile
+
+import pandas as pd
+
+from previdencia.cache import cache_por_conteudo
+from previdencia.esquema import COLUNAS_DINHEIRO, compactar, expandir
+from previdencia.leitura import ESQUEMA_CNIS, ESQUEMA_DESCONSIDERADOS
+
+VERSAO_PACOTE = 1
+FORMATOS_PACOTE = ('xlsx', 'parquet')
+MIME_PACOTE = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/zip',
+}
+EXTENSAO_PACOTE = {'xlsx': 'xlsx', 'parquet': 'zip'}
+
+TABELA_CNIS = 'CNIS'
+TABELA_CARTA = 'Carta'
+TABELA_DESCONSIDERADOS = 'Desconsiderados'
+
+ABA_PARAMETROS = 'Parâmetros'
+ABA_RESULTADOS = 'Resultados'
+ABA_ESQUEMA = 'Esquema'
+ARQUIVO_CASO = 'caso.json'
+
+# Tipos ao reabrir um XLSX: o Excel não guarda "001" como texto nem 1500.0 como float.
+TIPOS_XLSX = {
+    **{coluna: str for esquema in (ESQUEMA_CNIS, ESQUEMA_DESCONSIDERADOS) for coluna, tipo in esquema.items() if tipo == str},
+    **{coluna: 'float64' for coluna in COLUNAS_DINHEIRO},
+    'Chave': str,
+    'Valor': str,
+}
+
+_DEPENDENCIAS = {'xlsx': 'openpyxl', 'parquet': 'pyarrow'}
+
+
+def formatos_disponiveis():
+    """Formatos de pacote cujas dependências opcionais estão instaladas."""
+    return [formato for formato in FORMATOS_PACOTE if importlib.util.find_spec(_DEPENDENCIAS[formato])]
+
+
+class PacoteCaso:
+    """Tabelas (nome -> DataFrame), parâmetros e resultados de um caso."""
+
+    def __init__(self, tabelas, parametros=None, resultados=None):
+        self.tabelas = dict(tabelas)
+        self.parametros = dict(parametros or {})
+        self.resultados = dict(resultados or {})
+
+    def copy(self):
+        return PacoteCaso({nome: df.copy() for nome, df in self.tabelas.items()}, self.parametros, self.resultados)
+
+
+def _pares(dados):
+    # Valores aninhados (ex.: índices por período) vão como JSON na coluna Valor.
+    return pd.DataFrame({
+        'Chave': list(dados),
+        'Valor': [json.dumps(valor, ensure_ascii=False, default=str) for valor in dados.values()],
+    })
+
+
+def _de_pares(df):
+    return {str(chave): json.loads(valor) for chave, valor in zip(df['Chave'], df['Valor'])}
+
+
+def _esquema(nome, df):
+    """Nome, tipos e marcas que o XLSX perde, para `_restaurar` na abertura."""
+    colunas = {}
+    for coluna in df.columns:
+        serie = df[coluna]
+        # Texto vazio sem nenhum nulo na coluna: as células vazias voltam como ''.
+        vazio = bool((serie.astype(object) == '').any()) and not serie.isna().any()
+        colunas[str(coluna)] = {'tipo': str(serie.dtype), 'vazio': vazio}
+    return {'tabela': nome, 'compacto': bool(df.attrs.get('compacto')), 'colunas': colunas}
+
+
+def _restaurar(df, esquema):
+    colunas = esquema['colunas']
+    for coluna, info in colunas.items():
+        if coluna in df.columns and info['vazio']:
+            df[coluna] = df[coluna].astype(object).where(df[coluna].notna(), '')
+    if esquema['compacto']:
+        df = compactar(df)
+    for coluna, info in colunas.items():
+        if coluna in df.columns and str(df[coluna].dtype) != info['tipo']:
+            try:
+                df[coluna] = df[coluna].astype(info['tipo'])
+            except (TypeError, ValueError):
+                pass  # fica com o tipo lido do Excel
+    return df
+
+
+# ===================== EXPORTAÇÃO =====================
+
+def _exportar_xlsx(caso, buffer):
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        esquemas = {}
+        for nome, df in caso.tabelas.items():
+            expandir(df).to_excel(writer, sheet_name=nome[:31], index=False)
+            esquemas[nome[:31]] = _esquema(nome, df)
+        _pares(caso.parametros).to_excel(writer, sheet_name=ABA_PARAMETROS, index=False)
+        _pares(caso.resultados).to_excel(writer, sheet_name=ABA_RESULTADOS, index=False)
+        _pares(esquemas).to_excel(writer, sheet_name=ABA_ESQUEMA, index=False)
+
+
+def _exportar_parquet(caso, buffer):
+    # Parquet já é comprimido: o ZIP só agrupa (ZIP_STORED), sem recomprimir.
+    arquivos = {}
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for i, (nome, df) in enumerate(caso.tabelas.items()):
+            arquivo = f"{i:02d}.parquet"
+            with zf.open(arquivo, 'w') as destino:
+                df.to_parquet(destino, index=False)
+            arquivos[nome] = arquivo
+        zf.writestr(ARQUIVO_CASO, json.dumps({
+            'versao': VERSAO_PACOTE,
+            'tabelas': arquivos,
+            'parametros': caso.parametros,
+            'resultados': caso.resultados,
+        }, ensure_ascii=False, indent=4, default=str))
+
+
+def exportar_pacote(tabelas, parametros=None, resultados=None, formato='xlsx'):
+    """Gera o pacote do caso em memória e devolve os bytes (XLSX ou ZIP Parquet)."""
+    if formato not in FORMATOS_PACOTE:
+        raise ValueError(f"Formato de pacote desconhecido: {formato}")
+    caso = PacoteCaso(tabelas, parametros, resultados)
+    buffer = io.BytesIO()
+    if formato == 'xlsx':
+        _exportar_xlsx(caso, buffer)
+    else:
+        _exportar_parquet(caso, buffer)
+    return buffer.getvalue()
+
+
+# ===================== RESTAURAÇÃO =====================
+
+def _abrir_parquet(zf):
+    caso = json.loads(zf.read(ARQUIVO_CASO))
+    if caso.get('versao', 0) > VERSAO_PACOTE:
+        raise ValueError(f"Pacote na versão {caso['versao']}, mais nova que a suportada ({VERSAO_PACOTE}).")
+    tabelas = {}
+    for nome, arquivo in caso['tabelas'].items():
+        with zf.open(arquivo) as origem:
+            tabelas[nome] = pd.read_parquet(io.BytesIO(origem.read()))
+    return PacoteCaso(tabelas, caso['parametros'], caso['resultados'])
+
+
+def _abrir_xlsx(buffer):
+    abas = pd.read_excel(buffer, sheet_name=None, dtype=TIPOS_XLSX, engine='openpyxl')
+    parametros = _de_pares(abas.pop(ABA_PARAMETROS)) if ABA_PARAMETROS in abas else {}
+    resultados = _de_pares(abas.pop(ABA_RESULTADOS)) if ABA_RESULTADOS in abas else {}
+    esquemas = _de_pares(abas.pop(ABA_ESQUEMA)) if ABA_ESQUEMA in abas else {}  # pacotes antigos não têm
+    tabelas = {}
+    for aba, df in abas.items():
+        esquema = esquemas.get(aba)
+        if esquema is None:
+            tabelas[aba] = df
+        else:
+            tabelas[esquema['tabela']] = _restaurar(df, esquema)
+    return PacoteCaso(tabelas, parametros, resultados)
+
+
+@cache_por_conteudo
+def abrir_pacote(origem):
+    """Restaura um pacote a partir de caminho, bytes ou arquivo enviado (XLSX ou ZIP Parquet)."""
+    if isinstance(origem, (bytes, bytearray)):
+        buffer = io.BytesIO(origem)
+    elif hasattr(origem, 'getvalue'):
+        buffer = io.BytesIO(origem.getvalue())
+    elif hasattr(origem, 'read'):
+        buffer = io.BytesIO(origem.read())
+    else:
+        with open(origem, 'rb') as f:
+            buffer = io.BytesIO(f.read())
+
+    if not zipfile.is_zipfile(buffer):
+        raise ValueError("O arquivo não é um pacote de caso (XLSX ou ZIP).")
+    buffer.seek(0)
+    with zipfile.ZipFile(buffer) as zf:
+        if ARQUIVO_CASO in zf.namelist():
+            return _abrir_parquet(zf)
+    buffer.seek(0)
+    return _abrir_xlsx(buffer)
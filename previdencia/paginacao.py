@@ -0,0 +1,74 @@
+import functools
+import hashlib
+import math
+
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import ORDINAL_INVALIDO, ordinal_competencia
+from previdencia.esquema import COLUNAS_COMPETENCIA, ordinais_de
+
+# ===================== PAGINAÇÃO NO SERVIDOR =====================
+
+TAMANHO_PAGINA = 50
+
+
+def assinatura(df):
+    """Assinatura do conteúdo de `df` (colunas e hash das linhas), ou None se não houver hash.
+
+    Identifica a mesma tabela entre reruns do Streamlit, que recriam o
+    DataFrame a cada interação.
+    """
+    try:
+        linhas = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    except TypeError:  # células não hasheáveis (listas, dicionários)
+        return None
+    return tuple(map(str, df.columns)), hashlib.blake2b(linhas.tobytes(), digest_size=16).hexdigest()
+
+
+class VisaoPaginada:
+    """Filtro, busca e fatiamento de uma tabela feitos no servidor.
+
+    Os índices (ordinal de mês da competência e texto em minúsculas de cada
+    linha) são montados uma vez, na primeira consulta; cada filtro depois é
+    uma comparação vetorizada e só a página pedida sai do objeto.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.coluna_competencia = next((c for c in COLUNAS_COMPETENCIA if c in df.columns), None)
+
+    @functools.cached_property
+    def _ordinais(self):
+        if self.coluna_competencia is None:
+            return None
+        return ordinais_de(self.df[self.coluna_competencia])
+
+    @functools.cached_property
+    def _texto(self):
+        colunas = [self.df[c].astype(str) for c in self.df.columns]
+        if not colunas:
+            return np.array([], dtype=object)
+        return colunas[0].str.cat(colunas[1:], sep=' ').str.lower().to_numpy()
+
+    def filtrar(self, busca='', competencia_de='', competencia_ate=''):
+        """Posições das linhas que passam pela busca e pelo intervalo "MM/AAAA"."""
+        mascara = np.ones(len(self.df), dtype=bool)
+        if self._ordinais is not None:
+            for limite, comparar in ((competencia_de, np.greater_equal), (competencia_ate, np.less_equal)):
+                if limite:
+                    ordinal = ordinal_competencia([limite])[0]
+                    if ordinal != ORDINAL_INVALIDO:
+                        mascara &= comparar(self._ordinais, ordinal)
+        if busca:
+            mascara &= pd.Series(self._texto, dtype=object).str.contains(busca.lower(), regex=False).to_numpy()
+        return np.flatnonzero(mascara)
+
+    @staticmethod
+    def total_paginas(posicoes, tamanho=TAMANHO_PAGINA):
+        return max(1, math.ceil(len(posicoes) / tamanho))
+
+    def pagina(self, posicoes, numero, tamanho=TAMANHO_PAGINA):
+        """Linhas da página `numero` (a partir de 1) entre as posições filtradas."""
+        inicio = (numero - 1) * tamanho
+        return self.df.iloc[posicoes[inicio:inicio + tamanho]]
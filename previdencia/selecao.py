@@ -0,0 +1,66 @@
+from functools import cached_property
+
+import numpy as np
+
+# ===================== 80% MAIORES SALÁRIOS =====================
+
+class SelecaoMaiores:
+    """Seleciona os `proporcao` maiores valores por partição, em tempo linear.
+
+    Equivale a `sort_values(ascending=False).head(int(len * proporcao))`, mas
+    só separa o conjunto dos maiores do conjunto dos descartados
+    (`np.argpartition`). A média, o menor salário considerado (min_80) e as
+    posições saem dessa partição; a ordenação completa só é feita, e apenas
+    sobre o subconjunto pedido, quando uma tabela ou gráfico precisa dela.
+    Valores NaN nunca entram entre os maiores.
+    """
+
+    def __init__(self, valores, proporcao=0.8):
+        self.valores = np.asarray(valores, dtype=np.float64)
+        self.qtd = int(len(self.valores) * proporcao)
+
+    @cached_property
+    def _particao(self):
+        validos = np.flatnonzero(~np.isnan(self.valores))
+        k = min(self.qtd, len(validos))
+        corte = len(validos) - k
+        if k == 0:
+            maiores = validos[:0]
+        else:
+            maiores = validos[np.argpartition(self.valores[validos], corte)[corte:]]
+        descartados = np.ones(len(self.valores), dtype=bool)
+        descartados[maiores] = False
+        return maiores, np.flatnonzero(descartados)
+
+    @property
+    def maiores(self):
+        """Posições dos maiores valores, sem ordem definida."""
+        return self._particao[0]
+
+    @property
+    def descartados(self):
+        """Posições dos valores fora da seleção (inclui NaN), sem ordem definida."""
+        return self._particao[1]
+
+    @cached_property
+    def media(self):
+        selecionados = self.valores[self.maiores]
+        return float(selecionados.mean()) if len(selecionados) else float('nan')
+
+    @cached_property
+    def minimo(self):
+        selecionados = self.valores[self.maiores]
+        return float(selecionados.min()) if len(selecionados) else float('nan')
+
+    def _ordenar(self, posicoes):
+        return posicoes[np.argsort(-self.valores[posicoes], kind='stable')]
+
+    @cached_property
+    def ordem(self):
+        """Posições dos maiores valores em ordem decrescente."""
+        return self._ordenar(self.maiores)
+
+    @cached_property
+    def ordem_descartados(self):
+        """Posições dos descartados em ordem decrescente (NaN ao final)."""
+        return self._ordenar(self.descartados)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+# ===================== GRADE DE SENSIBILIDADE =====================
+
+
+def faixa(inicio, fim, passo):
+    """Valores de `inicio` a `fim` (inclusive) com o passo dado."""
+    qtd = int(np.floor(round((fim - inicio) / passo, 9))) + 1
+    return np.round(inicio + passo * np.arange(max(qtd, 1)), 6)
+
+
+def _arredondar(valores, casas):
+    """`np.round` corrigido nos quase-empates para coincidir com o `round` do Python."""
+    arredondado = np.round(valores, casas)
+    escala = valores * 10.0 ** casas
+    empate = np.abs(escala - np.floor(escala) - 0.5) < 1e-6
+    if empate.any():
+        arredondado[empate] = [round(v, casas) for v in valores[empate].tolist()]
+    return arredondado
+
+
+def grade_fator(media, Tc, Id, Es, a=0.31):
+    """Fator e salário de benefício para todas as combinações de Tc × Id × Es.
+
+    Uma única operação em broadcast sobre os eixos (Tc, Id, Es), com os mesmos
+    arredondamentos de `fator_previdenciario` e `salario_de_beneficio`.
+    Devolve uma tabela longa com uma linha por combinação.
+    """
+    tc = np.asarray(Tc, dtype=float)[:, None, None]
+    id_ = np.asarray(Id, dtype=float)[None, :, None]
+    es = np.asarray(Es, dtype=float)[None, None, :]
+
+    tca = tc * a
+    fator = _arredondar((tca / es) * (1 + (id_ + tca) / 100), 4)
+    # Mesma conta inteira de `salario_de_beneficio` (centavos × décimos de milésimo).
+    salario = (np.int64(round(media * 100)) * np.rint(fator * 10000).astype(np.int64) + 5000) // 10000 / 100
+
+    eixos = np.meshgrid(tc.ravel(), id_.ravel(), es.ravel(), indexing='ij')
+    return pd.DataFrame({
+        'Tc': eixos[0].ravel(),
+        'Id': eixos[1].ravel(),
+        'Es': eixos[2].ravel(),
+        'Fator': fator.ravel(),
+        'Salário de Benefício': salario.ravel(),
+    })
@@ -0,0 +1,117 @@
+"""Geradores de arquivos sintéticos nos formatos aceitos pelos leitores.
+
+Cada gerador recebe o número de linhas e uma semente e devolve os bytes do
+arquivo; a mesma semente gera sempre o mesmo conteúdo. Usados pelo
+benchmark (`python -m previdencia.benchmark`) e para montar casos de teste
+do lote.
+"""
+import numpy as np
+import pandas as pd
+
+# Competências a partir de 01/1980, cobrindo 44 anos (vários vínculos por mês
+# quando o número de linhas passa disso).
+ORDINAL_INICIAL = 1980 * 12
+MESES_HISTORICO = 44 * 12
+PROPORCAO_DISCREPANTES = 0.01
+PROPORCAO_DESCONSIDERADOS = 0.2
+
+_PADRAO_BR = str.maketrans({',': '.', '.': ','})
+
+
+def _rng(semente):
+    return np.random.default_rng(semente)
+
+
+def _competencias(n, rng):
+    ordinais = ORDINAL_INICIAL + np.sort(rng.integers(0, MESES_HISTORICO, n))
+    return [f"{o % 12 + 1:02d}/{o // 12}" for o in ordinais.tolist()], ordinais // 12
+
+
+def _salarios(n, rng):
+    # Log-normal em torno de R$ 3.000, com uma fração de valores acima do filtro de 50.000.
+    valores = np.round(rng.lognormal(np.log(3000), 0.6, n), 2)
+    discrepantes = rng.random(n) < PROPORCAO_DISCREPANTES
+    valores[discrepantes] = np.round(rng.uniform(50000, 500000, discrepantes.sum()), 2)
+    return valores
+
+
+def _br(valores):
+    return [f"{v:,.2f}".translate(_PADRAO_BR) for v in valores.tolist()]
+
+
+# ===================== CNIS =====================
+
+def cnis_txt(n, semente=0):
+    """Extrato CNIS em TXT: "Empresa  MM/AAAA  1.234,56" por linha."""
+    rng = _rng(semente)
+    competencias, _ = _competencias(n, rng)
+    empresas = rng.integers(1, 6, n).tolist()
+    linhas = [f"Empresa {e}   {c}   {v}" for e, c, v in zip(empresas, competencias, _br(_salarios(n, rng)))]
+    return ('\n'.join(linhas) + '\n').encode('utf-8')
+
+
+def cnis_csv(n, semente=0):
+    """CSV do CNIS organizado (Seq, Competência, Remuneração, Ano)."""
+    rng = _rng(semente)
+    competencias, anos = _competencias(n, rng)
+    salarios = _salarios(n, rng).tolist()
+    linhas = ['Seq,Competência,Remuneração,Ano']
+    linhas += [f"{i},{c},{v:.2f},{a}" for i, (c, v, a) in enumerate(zip(competencias, salarios, anos.tolist()))]
+    return ('\n'.join(linhas) + '\n').encode('utf-8')
+
+
+# ===================== CARTA E DESCONSIDERADOS =====================
+
+def _carta(n, rng):
+    competencias, anos = _competencias(n, rng)
+    salarios = np.round(rng.lognormal(np.log(2000), 0.6, n), 2)
+    indices = np.round(rng.uniform(1.0, 3.0, n), 4)
+    corrigidos = np.round(salarios * indices, 2)
+    desconsiderado = rng.random(n) < PROPORCAO_DESCONSIDERADOS
+    return competencias, anos, salarios, indices, corrigidos, desconsiderado
+
+
+def carta_txt(n, semente=0):
+    """Carta de concessão em TXT: "Seq.  MM/AAAA  Salário  Índice  Sal. Corrigido  [DESCONSIDERADO]"."""
+    competencias, _, salarios, indices, corrigidos, desconsiderado = _carta(n, _rng(semente))
+    indices_br = [f"{v:.4f}".replace('.', ',') for v in indices.tolist()]
+    linhas = [
+        f"{i % 1000:03d}  {c}  {s}  {ind}  {sc}{'  DESCONSIDERADO' if d else ''}"
+        for i, (c, s, ind, sc, d) in enumerate(zip(
+            competencias, _br(salarios), indices_br, _br(corrigidos), desconsiderado.tolist()))
+    ]
+    return ('\n'.join(linhas) + '\n').encode('utf-8')
+
+
+def desconsiderados_csv(n, semente=0):
+    """CSV dos desconsiderados (Seq, Seq., Data, Salário, Índice, Sal. Corrigido, Observação, Ano, Duplicado)."""
+    competencias, anos, salarios, indices, corrigidos, _ = _carta(n, _rng(semente))
+    linhas = ['Seq,Seq.,Data,Salário,Índice,Sal. Corrigido,Observação,Ano,Duplicado']
+    linhas += [
+        f"{i},{i % 1000:03d},{c},{s:.2f},{ind:.4f},{sc:.2f},DESCONSIDERADO,{a},Não"
+        for i, (c, s, ind, sc, a) in enumerate(zip(
+            competencias, salarios.tolist(), indices.tolist(), corrigidos.tolist(), anos.tolist()))
+    ]
+    return ('\n'.join(linhas) + '\n').encode('utf-8')
+
+
+def indices_mensais(semente=0):
+    """Tabela Competência/Índice cobrindo todo o histórico sintético."""
+    rng = _rng(semente)
+    ordinais = ORDINAL_INICIAL + np.arange(MESES_HISTORICO + 1)
+    return pd.DataFrame({
+        'Competência': [f"{o % 12 + 1:02d}/{o // 12}" for o in ordinais.tolist()],
+        'Índice': np.round(1 + rng.uniform(0.0, 0.01, len(ordinais)), 6),
+    })
+
+
+def teto_piso(semente=0):
+    """Tabela Competência/Teto/Piso com uma vigência por ano do histórico sintético."""
+    rng = _rng(semente)
+    anos = np.arange(ORDINAL_INICIAL // 12, (ORDINAL_INICIAL + MESES_HISTORICO) // 12 + 1)
+    crescimento = np.cumprod(1 + rng.uniform(0.0, 0.08, len(anos)))
+    return pd.DataFrame({
+        'Competência': [f"01/{ano}" for ano in anos.tolist()],
+        'Teto': np.round(8000 * crescimento, 2),
+        'Piso': np.round(1000 * crescimento, 2),
+    })
@@ -0,0 +1,115 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+from previdencia.competencia import ORDINAL_INVALIDO, ordinal_competencia
+
+# ===================== TÁBUA DE MORTALIDADE (Es) =====================
+
+ARQUIVO_TABUA_PADRAO = os.path.join('dados', 'tabua_sobrevida.csv')
+
+IDADE_MAXIMA_MESES = 120 * 12
+
+
+def ano_tabua_vigente(concessoes):
+    """Ano da tábua do IBGE vigente em cada competência de concessão "MM/AAAA".
+
+    A tábua do ano N é publicada em dezembro de N + 1 e vale a partir desse mês:
+    concessões em dezembro de A usam a tábua de A - 1, nos demais meses a de A - 2.
+    Competências inválidas devolvem -1.
+    """
+    ordinais = ordinal_competencia(concessoes).astype(np.int64)
+    ano, mes = np.divmod(ordinais, 12)
+    ano_tabua = np.where(mes == 11, ano - 1, ano - 2)
+    return np.where(ordinais == ORDINAL_INVALIDO, -1, ano_tabua)
+
+
+class TabuaSobrevida:
+    """Expectativa de sobrevida em uma matriz densa (ano da tábua × idade em meses).
+
+    `valores[a, m]` é a Es da tábua `ano_inicial + a` para a idade de `m` meses
+    completos; cada mês herda o valor da última idade listada na tábua (idade em
+    anos completos, como no cálculo do fator). Uma consulta é uma leitura
+    indexada, sem busca; anos ou idades fora da tábua devolvem NaN.
+    """
+
+    def __init__(self, ano_inicial, valores):
+        self.ano_inicial = int(ano_inicial)
+        self.valores = valores
+
+    @property
+    def anos(self):
+        return np.arange(self.ano_inicial, self.ano_inicial + self.valores.shape[0])
+
+    @classmethod
+    def de_tabela(cls, df, coluna_ano='Ano', coluna_idade='Idade', coluna_es='Expectativa'):
+        anos = pd.to_numeric(df[coluna_ano], errors='coerce').to_numpy(dtype=np.float64)
+        idades = pd.to_numeric(df[coluna_idade], errors='coerce').to_numpy(dtype=np.float64)
+        es = pd.to_numeric(df[coluna_es], errors='coerce').to_numpy(dtype=np.float64)
+        validos = ~(np.isnan(anos) | np.isnan(idades) | np.isnan(es))
+        anos, idades, es = anos[validos].astype(np.int64), idades[validos], es[validos]
+        if len(anos) == 0:
+            raise ValueError("Tábua de sobrevida vazia.")
+
+        ano_inicial = int(anos.min())
+        linhas = anos - ano_inicial
+        meses = np.clip(np.round(idades * 12).astype(np.int64), 0, IDADE_MAXIMA_MESES - 1)
+        valores = np.full((int(anos.max()) - ano_inicial + 1, IDADE_MAXIMA_MESES), np.nan)
+        valores[linhas, meses] = es
+
+        # Preenche para frente, ano a ano: cada mês recebe a última idade informada.
+        preenchidos = ~np.isnan(valores)
+        posicao = np.where(preenchidos, np.arange(IDADE_MAXIMA_MESES), 0)
+        np.maximum.accumulate(posicao, axis=1, out=posicao)
+        valores = np.take_along_axis(valores, posicao, axis=1)
+        valores[~np.maximum.accumulate(preenchidos, axis=1)] = np.nan
+        return cls(ano_inicial, valores)
+
+    def expectativa(self, idades, concessoes):
+        """Es para cada par (idade em anos, competência de concessão "MM/AAAA")."""
+        idades = np.asarray(idades, dtype=np.float64)
+        linhas = ano_tabua_vigente(np.atleast_1d(concessoes)) - self.ano_inicial
+        meses = np.floor(np.nan_to_num(idades, nan=-1.0) * 12 + 1e-9).astype(np.int64)
+        linhas, meses = np.broadcast_arrays(linhas, meses)
+        dentro = ((linhas >= 0) & (linhas < self.valores.shape[0])
+                  & (meses >= 0) & (meses < self.valores.shape[1]))
+        es = np.full(linhas.shape, np.nan)
+        es[dentro] = self.valores[linhas[dentro], meses[dentro]]
+        return es
+
+
+def _caminho_indice(caminho):
+    return os.path.splitext(caminho)[0] + '.npy'
+
+
+@functools.lru_cache(maxsize=4)
+def _carregar_tabua(caminho, _modificado_em):
+    indice = _caminho_indice(caminho)
+    if not (os.path.exists(indice) and os.path.getmtime(indice) >= _modificado_em):
+        df = pd.read_parquet(caminho) if caminho.lower().endswith('.parquet') else pd.read_csv(caminho)
+        tabua = TabuaSobrevida.de_tabela(df)
+        # Coluna 0 guarda o ano de cada tábua; o resto é a matriz por idade em meses.
+        matriz = np.column_stack((tabua.anos, tabua.valores))
+        temporario = f"{indice}.{os.getpid()}.tmp"
+        try:
+            with open(temporario, 'wb') as f:
+                np.save(f, matriz)
+            os.replace(temporario, indice)  # troca atômica: outro processo nunca lê um índice pela metade
+        except OSError:
+            return tabua
+    # Mapeado em memória e somente leitura: processos do lote compartilham as páginas.
+    matriz = np.load(indice, mmap_mode='r')
+    return TabuaSobrevida(int(matriz[0, 0]), matriz[:, 1:])
+
+
+def carregar_tabua(caminho=ARQUIVO_TABUA_PADRAO):
+    """Carrega a tábua (CSV ou Parquet com colunas Ano, Idade, Expectativa).
+
+    Na primeira leitura grava ao lado um índice `.npy` que as demais leituras,
+    inclusive em outros processos, apenas mapeiam em memória, sem reinterpretar o
+    CSV. O índice é refeito quando o arquivo da tábua muda.
+    """
+    caminho = os.fspath(caminho)
+    return _carregar_tabua(caminho, os.path.getmtime(caminho))
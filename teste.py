@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
-import re
-from io import StringIO
+
+from previdencia.conciliacao import conciliar, divergencias
+from previdencia.consolidacao import consolidar
+from previdencia.extracao import estrutura_carta, estrutura_cnis
+from previdencia.interface import download_csv
 
 # ===================== CONFIGURAÇÃO DA PÁGINA =====================
 st.set_page_config(page_title="Jesus e INSS | Sistema Completo", layout="wide")
@@ -40,54 +43,6 @@ def login():
             st.session_state.login_visible = True
             st.experimental_rerun()
 
-# ===================== FUNÇÕES DE LEITURA E ESTRUTURAÇÃO =====================
-
-def ler_texto(uploaded_file):
-    stringio = StringIO(uploaded_file.getvalue().decode("utf-8", errors='ignore'))
-    texto = stringio.read()
-    return texto
-
-
-def estrutura_cnis(texto):
-    linhas = texto.split('\n')
-    data = []
-    for line in linhas:
-        match = re.search(r"(\d{2}/\d{4})\s+([0-9.]+,[0-9]{2})", line)
-        if match:
-            competencia = match.group(1)
-            remuneracao = match.group(2).replace('.', '').replace(',', '.')
-            data.append({'Competência': competencia, 'Remuneração': remuneracao, 'Origem': 'CNIS'})
-    return pd.DataFrame(data)
-
-
-def estrutura_carta(texto):
-    linhas = texto.split('\n')
-    data = []
-    for line in linhas:
-        match = re.match(r"^(\d{3})\s+(\d{2}/\d{4})\s+([0-9.,]+)\s+([0-9.,]+)\s+([0-9.,]+)(\s+.*)?", line)
-        if match:
-            seq = match.group(1)
-            data_col = match.group(2)
-            salario = match.group(3).replace('.', '').replace(',', '.')
-            indice = match.group(4).replace(',', '.')
-            sal_corrigido = match.group(5).replace('.', '').replace(',', '.')
-            observacao = match.group(6).strip() if match.group(6) else ""
-            data.append({
-                'Seq.': seq,
-                'Data': data_col,
-                'Salário': salario,
-                'Índice': indice,
-                'Sal. Corrigido': sal_corrigido,
-                'Observação': observacao,
-                'Origem': 'Carta Benefício'
-            })
-    return pd.DataFrame(data)
-
-
-def exportar_csv(df, nome_base):
-    df.to_csv(f"{nome_base}.csv", index=False)
-    return f"{nome_base}.csv"
-
 # ===================== LAYOUT COM TABELAS =====================
 
 st.subheader("📊 Tabelas Organizacionais")
@@ -104,18 +59,16 @@ with col2:
 
 if uploaded_cnis_txt and uploaded_carta_txt:
     # Processando CNIS
-    texto_cnis = ler_texto(uploaded_cnis_txt)
-    df_cnis = estrutura_cnis(texto_cnis)
+    df_cnis = estrutura_cnis(uploaded_cnis_txt)
+    df_cnis['Origem'] = 'CNIS'
 
     # Processando Carta Benefício
-    texto_carta = ler_texto(uploaded_carta_txt)
-    df_carta = estrutura_carta(texto_carta)
+    df_carta = estrutura_carta(uploaded_carta_txt)
+    df_carta['Origem'] = 'Carta Benefício'
 
     # Exportando CNIS e Carta para CSV
-    file_cnis = exportar_csv(df_cnis, "Extrato_CNIS_Organizado")
-    file_carta = exportar_csv(df_carta, "Carta_Beneficio_Organizada")
-    st.download_button("⬇️ Baixar CNIS CSV", data=open(file_cnis, 'rb'), file_name=file_cnis, mime='text/csv')
-    st.download_button("⬇️ Baixar Carta CSV", data=open(file_carta, 'rb'), file_name=file_carta, mime='text/csv')
+    download_csv("CNIS CSV", df_cnis, "Extrato_CNIS_Organizado.csv", 'cnis')
+    download_csv("Carta CSV", df_carta, "Carta_Beneficio_Organizada.csv", 'carta')
 
     # ===================== SALÁRIOS DESCONSIDERADOS =====================
 
@@ -125,12 +78,29 @@ if uploaded_cnis_txt and uploaded_carta_txt:
 
     # Agrupando os dados de salários desconsiderados
     df_desconsiderados = pd.concat([df_desconsiderados_cnis, df_desconsiderados_carta], ignore_index=True)
-    file_output_desconsiderados = exportar_csv(df_desconsiderados, "Salarios_Desconsiderados")
 
     # Exibindo os salários desconsiderados
     st.subheader("📊 Salários Desconsiderados (CNIS e Carta)")
     st.dataframe(df_desconsiderados, use_container_width=True)
-    st.download_button("⬇️ Baixar Salários Desconsiderados CSV", data=open(file_output_desconsiderados, 'rb'), file_name=file_output_desconsiderados, mime='text/csv')
+    download_csv("Salários Desconsiderados CSV", df_desconsiderados, "Salarios_Desconsiderados.csv", 'desconsiderados')
+
+    # ===================== CONSOLIDAÇÃO POR COMPETÊNCIA =====================
+
+    # Cada fonte consolidada por si: somar CNIS e Carta dobraria o salário quando os valores diferem
+    df_consolidado = consolidar(df_cnis)
+
+    st.subheader("📊 Salários Consolidados por Competência (CNIS)")
+    st.caption(f"{len(df_cnis)} linhas em {len(df_consolidado)} competências; "
+               f"{int(df_consolidado['Duplicados'].sum())} duplicadas descartadas.")
+    st.dataframe(df_consolidado, use_container_width=True)
+    download_csv("Consolidado CSV", df_consolidado, "Salarios_Consolidados.csv", 'consolidado')
+
+    # CNIS × Carta lado a lado, competência a competência
+    df_conciliacao = conciliar(df_cnis, df_carta)
+    st.subheader("🔎 Conciliação CNIS × Carta por Competência")
+    st.caption(f"{len(divergencias(df_conciliacao))} de {len(df_conciliacao)} competências com divergência.")
+    st.dataframe(df_conciliacao, use_container_width=True)
+    download_csv("Conciliação CSV", df_conciliacao, "Conciliacao_CNIS_Carta.csv", 'conciliacao')
 
     # ===================== CAIXA DE DADOS ALIENÍGENAS =====================
 
@@ -143,8 +113,7 @@ if uploaded_cnis_txt and uploaded_carta_txt:
         st.dataframe(df_alienigenas)
 
         # Gerar CSV para download
-        file_output_alienigenas = exportar_csv(df_alienigenas, "Alienigenas_Formatados")
-        st.download_button("⬇️ Baixar Alienígenas CSV", data=open(file_output_alienigenas, 'rb'), file_name=file_output_alienigenas, mime='text/csv')
+        download_csv("Alienígenas CSV", df_alienigenas, "Alienigenas_Formatados.csv", 'alienigenas')
 
 else:
     st.info("🔔 Faça upload dos arquivos CNIS e Carta Benefício para iniciar o processamento.")
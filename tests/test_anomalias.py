@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from previdencia.anomalias import pontuar_anomalias, suspeitos
+
+
+def _cnis(remuneracoes, ano=2015):
+    return pd.DataFrame({
+        'Competência': [f"{mes:02d}/{ano + (mes - 1) // 12}" for mes in range(1, len(remuneracoes) + 1)],
+        'Remuneração': remuneracoes,
+    })
+
+
+def test_pico_de_100_vezes_e_suspeito():
+    remuneracoes = np.full(12, 3000.0)
+    remuneracoes += np.arange(12) * 10  # pequenas variações reais
+    remuneracoes[5] *= 100  # vírgula fora do lugar
+    df = _cnis(remuneracoes)
+    pontuacao = pontuar_anomalias(df)
+    assert pontuacao['Suspeito'].tolist() == [i == 5 for i in range(12)]
+    assert suspeitos(df, pontuacao)['Competência'].tolist() == ['06/2015']
+
+
+def test_aumento_duradouro_nao_e_suspeito():
+    # Promoção em julho: o salário dobra e se mantém por mais de um ano.
+    df = _cnis([2000.0] * 6 + [4000.0] * 18)
+    pontuacao = pontuar_anomalias(df)
+    assert not pontuacao['Suspeito'].any()
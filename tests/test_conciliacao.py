@@ -0,0 +1,20 @@
+import pandas as pd
+
+from previdencia.conciliacao import SITUACAO_OK, SITUACAO_SALARIO, conciliar, divergencias
+
+
+def _carta(salarios):
+    return pd.DataFrame({
+        'Data': ['01/2020', '02/2020', '03/2020'],
+        'Salário': salarios,
+        'Índice': [1.0, 1.0, 1.0],
+        'Sal. Corrigido': salarios,
+    })
+
+
+def test_diferenca_acima_de_um_centavo_e_divergencia():
+    df_cnis = pd.DataFrame({'Competência': ['01/2020', '02/2020', '03/2020'], 'Remuneração': [1500.0, 1600.0, 1700.0]})
+    # 01/2020 difere em um centavo (tolerância), 02/2020 em dois centavos.
+    relatorio = conciliar(df_cnis, _carta([1500.01, 1600.02, 1700.0]))
+    assert relatorio['Situação'].tolist() == [SITUACAO_OK, SITUACAO_SALARIO, SITUACAO_OK]
+    assert divergencias(relatorio)['Competência'].tolist() == ['02/2020']
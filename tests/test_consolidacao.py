@@ -0,0 +1,42 @@
+import pandas as pd
+
+from previdencia.consolidacao import consolidar, marcar_duplicados
+from previdencia.extracao import estrutura_cnis
+
+
+def test_csv_e_txt_do_mesmo_extrato_consolidam_igual():
+    csv = pd.DataFrame({
+        'Seq': ['1', '2', '3'],
+        'Competência': ['01/2020', '01/2020', '02/2020'],
+        'Remuneração': [1500.0, 1500.0, 1800.0],
+        'Ano': ['2020', '2020', '2020'],
+    })
+    txt = estrutura_cnis(b"1  01/2020  1.500,00\n2  01/2020  1.500,00\n3  02/2020  1.800,00\n")
+    for df in (csv, txt):
+        assert marcar_duplicados(df).tolist() == [False, True, False]
+        consolidado = consolidar(df)
+        assert consolidado['Remuneração'].tolist() == [1500.0, 1800.0]
+        assert consolidado['Duplicados'].tolist() == [1, 0]
+
+
+def test_sem_vinculo_valores_distintos_na_mesma_competencia_sao_somados():
+    df = pd.DataFrame({
+        'Seq': ['1', '2'],
+        'Competência': ['01/2020', '01/2020'],
+        'Remuneração': [1500.0, 900.0],
+        'Ano': ['2020', '2020'],
+    })
+    consolidado = consolidar(df)
+    assert consolidado['Remuneração'].tolist() == [2400.0]
+    assert consolidado['Vínculos'].tolist() == [2]
+
+
+def test_com_vinculo_a_chave_e_o_vinculo():
+    df = pd.DataFrame({
+        'Seq': ['1', '2', '3'],
+        'Competência': ['01/2020', '01/2020', '01/2020'],
+        'Remuneração': [1500.0, 1500.0, 1500.0],
+        'Empresa': ['A', 'A', 'B'],
+    })
+    assert marcar_duplicados(df).tolist() == [False, True, False]
+    assert consolidar(df)['Remuneração'].tolist() == [3000.0]
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from previdencia.correcao import SerieIndices
+
+
+@pytest.fixture
+def serie_com_lacuna():
+    # 01/2020 a 06/2020 sem o índice de 03/2020.
+    return SerieIndices.de_tabela(pd.DataFrame({
+        'Competência': ['01/2020', '02/2020', '04/2020', '05/2020', '06/2020'],
+        'Índice': [1.01, 1.02, 1.04, 1.05, 1.06],
+    }))
+
+
+def test_lacuna_antes_da_janela_nao_afeta_a_correcao(serie_com_lacuna):
+    fatores = serie_com_lacuna.fatores(['04/2020', '05/2020'], '06/2020')
+    np.testing.assert_allclose(fatores, [1.04 * 1.05, 1.05])
+
+
+def test_janela_que_atravessa_a_lacuna_fica_nan(serie_com_lacuna):
+    fatores = serie_com_lacuna.fatores(['02/2020', '03/2020', '06/2020'], '05/2020')
+    assert np.isnan(fatores[0]) and np.isnan(fatores[1])
+    assert fatores[2] == 1.0
+
+
+def test_janela_antes_da_lacuna(serie_com_lacuna):
+    np.testing.assert_allclose(serie_com_lacuna.fatores(['01/2020'], '03/2020'), [1.01 * 1.02])
@@ -0,0 +1,19 @@
+import io
+
+import pytest
+
+from previdencia.extracao import estrutura_cnis
+
+TXT = (
+    "1  01/2020  1.234,56\n"
+    "2  13/2020  9.999,99\n"
+    "3  00/2020  8.888,88\n"
+    "4  12/2020  2.000,00\n"
+).encode('utf-8')
+
+
+@pytest.mark.parametrize('origem', [TXT, io.BytesIO(TXT)], ids=['bytes', 'arquivo'])
+def test_mes_fora_de_1_a_12_descarta_a_linha(origem):
+    df = estrutura_cnis(origem)
+    assert df['Competência'].tolist() == ['01/2020', '12/2020']
+    assert df['Remuneração'].tolist() == [1234.56, 2000.0]
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from previdencia.historico import HistoricoResultados
+from previdencia.pacote import formatos_disponiveis
+
+
+def _tabelas():
+    return {'CNIS': pd.DataFrame({'Competência': ['01/2020', '02/2020'], 'Remuneração': [1500.0, 1600.5]})}
+
+
+@pytest.mark.skipif(not formatos_disponiveis(), reason='sem formato de pacote')
+def test_caso_repetido_vem_da_memoria(tmp_path, monkeypatch):
+    historico = HistoricoResultados(str(tmp_path / 'historico.sqlite'))
+    historico.guardar('k', {}, {'Tc': 35}, {'Média 80%': 1550.25}, _tabelas())
+    primeiro = historico.obter('k')
+
+    def sem_banco(*args):
+        raise AssertionError('consultou o banco de novo')
+
+    monkeypatch.setattr(historico, '_obter', sem_banco)
+    segundo = historico.obter('k')
+    assert segundo.resultados == primeiro.resultados == {'Média 80%': 1550.25}
+    pd.testing.assert_frame_equal(segundo.tabelas['CNIS'], primeiro.tabelas['CNIS'])
+
+    # A cópia devolvida não altera a versão em memória.
+    segundo.tabelas['CNIS'].loc[0, 'Remuneração'] = 0.0
+    assert historico.obter('k').tabelas['CNIS'].loc[0, 'Remuneração'] == 1500.0
+
+    # Regravar a chave descarta a versão em memória.
+    monkeypatch.undo()
+    historico.guardar('k', {}, {'Tc': 35}, {'Média 80%': 9.0}, _tabelas())
+    assert historico.obter('k').resultados == {'Média 80%': 9.0}
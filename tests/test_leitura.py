@@ -0,0 +1,42 @@
+import io
+
+import pytest
+
+import previdencia.leitura as leitura
+from previdencia.leitura import ESQUEMA_CNIS, ler_csv
+
+MOTORES = [
+    pytest.param(True, id='pyarrow', marks=pytest.mark.skipif(not leitura.PYARROW_DISPONIVEL, reason='pyarrow ausente')),
+    pytest.param(False, id='c'),
+]
+
+
+@pytest.fixture(params=MOTORES)
+def motor(request, monkeypatch):
+    monkeypatch.setattr(leitura, 'PYARROW_DISPONIVEL', request.param)
+
+
+def test_csv_com_coluna_a_mais_nao_desloca(motor):
+    csv = b"Seq,Competencia,Remuneracao,Ano,Extra\n1,01/2020,2020.5,2020,x\n2,02/2020,10,2020,y\n"
+    df = ler_csv(io.BytesIO(csv), ESQUEMA_CNIS)
+    assert list(df.columns) == list(ESQUEMA_CNIS)
+    assert df['Seq'].tolist() == ['1', '2']
+    assert df['Competência'].tolist() == ['01/2020', '02/2020']
+    assert df['Remuneração'].tolist() == [2020.5, 10.0]
+    assert df['Ano'].tolist() == ['2020', '2020']
+
+
+def test_csv_com_colunas_a_menos_completa_o_esquema(motor):
+    csv = b"Seq,Competencia,Remuneracao\n1,01/2020,2020.5\n2,02/2020,10\n"
+    df = ler_csv(io.BytesIO(csv), ESQUEMA_CNIS)
+    assert list(df.columns) == list(ESQUEMA_CNIS)
+    assert df['Remuneração'].tolist() == [2020.5, 10.0]
+    assert df['Ano'].isna().all()
+
+
+def test_organizar_cnis_aceita_csv_sem_ano(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # sem dados/teto_piso.csv: vale o corte fixo
+    caminho = tmp_path / 'cnis.csv'
+    caminho.write_bytes(b"Seq,Competencia,Remuneracao\n1,01/2020,2020.5\n2,02/2020,60000\n")
+    df = leitura.organizar_cnis(str(caminho))
+    assert df['Competência'].tolist() == ['01/2020']
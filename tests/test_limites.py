@@ -0,0 +1,20 @@
+import pandas as pd
+
+from previdencia.limites import AJUSTE_PISO, AJUSTE_TETO, TabelaLimites, aplicar_limites
+
+TABELA = TabelaLimites.de_tabela(pd.DataFrame({
+    'Competência': ['01/2019', '01/2020'],
+    'Teto': [5839.45, 6101.06],
+    'Piso': [998.00, 1039.00],
+}))
+
+
+def test_acima_do_teto_limita_e_abaixo_do_piso_so_marca():
+    df = pd.DataFrame({'Competência': ['06/2019', '03/2020', '04/2020'], 'Remuneração': [7000.0, 800.0, 3000.0]})
+    ajustado, ajustes = aplicar_limites(df, TABELA)
+    # Teto da vigência de 2019 em 06/2019; o valor abaixo do piso fica como informado.
+    assert ajustado['Remuneração'].tolist() == [5839.45, 800.0, 3000.0]
+    assert ajustes['Competência'].tolist() == ['06/2019', '03/2020']
+    assert ajustes['Ajuste'].tolist() == [AJUSTE_TETO, AJUSTE_PISO]
+    assert ajustes['Remuneração Considerada'].tolist() == [5839.45, 800.0]
+    assert ajustes['Piso'].tolist() == [998.00, 1039.00]
@@ -0,0 +1,68 @@
+import io
+
+import pandas as pd
+import pytest
+
+from previdencia.beneficio import PARAMETROS_PADRAO
+from previdencia.esquema import compactar
+from previdencia.leitura import ler_cnis, organizar_desconsiderados
+from previdencia.lote import calcular_caso, gravar_resultados, processar_caso
+from previdencia.otimizacao import Reaproveitamento
+from previdencia.sintetico import cnis_csv, desconsiderados_csv
+
+
+def _caso(tmp_path, cnis, **extras):
+    (tmp_path / 'cnis.csv').write_text(cnis, encoding='utf-8')
+    caso = {'caso': 'c1', 'cnis': str(tmp_path / 'cnis.csv'), 'parametros': dict(PARAMETROS_PADRAO), 'concessao': None}
+    for papel, conteudo in extras.items():
+        caminho = tmp_path / f'{papel}.csv'
+        caminho.write_text(conteudo, encoding='utf-8')
+        caso[papel] = str(caminho)
+    return caso
+
+
+def test_teto_vale_para_a_soma_dos_vinculos(tmp_path):
+    caso = _caso(tmp_path, "Seq,Competencia,Remuneracao,Ano\n1,01/2020,5000.00,2020\n2,01/2020,4000.00,2020\n",
+                 limites="Competência,Teto,Piso\n01/2020,6101.06,1045.00\n")
+    resultado = calcular_caso(caso)
+    assert resultado['Competências CNIS'] == 1
+    assert resultado['Ajustes Teto/Piso'] == 1
+    ajuste = resultado['Competências Ajustadas'][0]
+    assert ajuste['Remuneração Informada'] == 9000.0
+    assert ajuste['Remuneração Considerada'] == 6101.06
+
+
+def test_esquema_compacto_da_o_mesmo_reaproveitamento():
+    df_cnis = ler_cnis.__wrapped__(io.BytesIO(cnis_csv(200, semente=3)))
+    df_desconsiderados = organizar_desconsiderados.__wrapped__(io.BytesIO(desconsiderados_csv(100, semente=3)))
+    exibicao = Reaproveitamento(df_cnis, df_desconsiderados)
+    compacto = Reaproveitamento(compactar(df_cnis), compactar(df_desconsiderados))
+    assert compacto.media == pytest.approx(exibicao.media)
+    pd.testing.assert_frame_equal(compacto.trocas, exibicao.trocas)
+
+
+def test_carta_em_csv_entra_na_conciliacao(tmp_path):
+    carta = ("Seq.,Data,Salário,Índice,Sal. Corrigido,Observação\n"
+             "001,01/2020,1500.00,1.0000,1500.00,\n"
+             "002,02/2020,1700.00,1.0000,1700.00,DESCONSIDERADO\n")
+    caso = _caso(tmp_path, "Seq,Competencia,Remuneracao,Ano\n1,01/2020,1500.00,2020\n", carta=carta)
+    resultado = calcular_caso(caso)
+    assert resultado['Registros Carta'] == 2
+    assert resultado['Divergências CNIS × Carta'] is not None
+    assert resultado['Competências Reaproveitáveis'] == ['02/2020']  # desconsiderados vêm da Carta
+
+
+def test_carta_em_formato_desconhecido_vira_erro_do_caso(tmp_path):
+    caso = _caso(tmp_path, "Seq,Competencia,Remuneracao,Ano\n1,01/2020,1500.00,2020\n")
+    (tmp_path / 'carta.pdf').write_bytes(b'%PDF')
+    caso['carta'] = str(tmp_path / 'carta.pdf')
+    resultado = processar_caso(caso)
+    assert resultado['Erro'].startswith('ValueError')
+
+
+def test_auditoria_fica_dentro_da_pasta_de_saida(tmp_path):
+    saida = tmp_path / 'saida'
+    gravar_resultados([{'Caso': '../../fora', 'Erro': None}, {'Caso': '..', 'Erro': None},
+                       {'Caso': 'a/b', 'Erro': None}, {'Caso': 'a_b', 'Erro': None}], str(saida))
+    assert sorted(p.name for p in (saida / 'auditoria').iterdir()) == ['_.json', '____fora.json', 'a_b.json', 'a_b_2.json']
+    assert not (tmp_path / 'fora.json').exists()
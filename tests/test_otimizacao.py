@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from previdencia.otimizacao import PERIODO_BASICO, Reaproveitamento
+
+
+def _media_maiores(valores, proporcao=0.8):
+    k = int(len(valores) * proporcao)
+    return float(np.mean(sorted(valores, reverse=True)[:k])) if k else float('nan')
+
+
+def _forca_bruta(cnis, desconsiderados, inicio):
+    """Melhor média testando todo subconjunto de desconsiderados (um salário por competência)."""
+    cnis = {c: v for c, v in cnis.items() if c >= inicio}
+    desconsiderados = {c: v for c, v in desconsiderados.items() if c >= inicio}
+    melhor = _media_maiores(list(cnis.values()))
+    for escolha in itertools.product((False, True), repeat=len(desconsiderados)):
+        salarios = dict(cnis)
+        for (competencia, valor), entra in zip(desconsiderados.items(), escolha):
+            if entra:
+                salarios[competencia] = valor  # substitui o salário CNIS ou inclui a competência
+        media = _media_maiores(list(salarios.values()))
+        if not np.isnan(media) and not media <= melhor:
+            melhor = media
+    return melhor
+
+
+def _rotulo(ordinal):
+    return f"{ordinal % 12 + 1:02d}/{ordinal // 12}"
+
+
+@pytest.mark.parametrize('semente', range(60))
+def test_reaproveitamento_igual_a_forca_bruta(semente):
+    rng = np.random.default_rng(semente)
+    inicio = 1994 * 12 + 6
+    competencias = rng.choice(np.arange(inicio - 6, inicio + 14), size=rng.integers(4, 14), replace=False)
+    n_cnis = rng.integers(2, len(competencias))
+    cnis = {int(c): float(v) for c, v in zip(competencias[:n_cnis], rng.integers(100, 5000, n_cnis))}
+    # Desconsiderados: parte em competências do CNIS (substituição), parte fora (inclusão).
+    escolhidas = rng.choice(competencias, size=min(len(competencias), rng.integers(1, 9)), replace=False)
+    desconsiderados = {int(c): float(v) for c, v in zip(escolhidas, rng.integers(100, 5000, len(escolhidas)))}
+
+    df_cnis = pd.DataFrame({'Competência': [_rotulo(c) for c in cnis], 'Remuneração': list(cnis.values())})
+    df_desconsiderados = pd.DataFrame({'Data': [_rotulo(c) for c in desconsiderados],
+                                       'Sal. Corrigido': list(desconsiderados.values())})
+    for periodo, limite in ((None, 0), (PERIODO_BASICO, inicio)):
+        reaproveitamento = Reaproveitamento(df_cnis, df_desconsiderados, periodo=periodo)
+        esperado = _forca_bruta(cnis, desconsiderados, limite)
+        if np.isnan(esperado):
+            assert np.isnan(reaproveitamento.media)
+        else:
+            assert reaproveitamento.media == pytest.approx(esperado)
+            assert not reaproveitamento.media < reaproveitamento.media_original  # original NaN: nada a comparar
@@ -0,0 +1,53 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from previdencia.esquema import compactar
+from previdencia.pacote import TABELA_CNIS, TABELA_DESCONSIDERADOS, abrir_pacote, exportar_pacote
+
+FORMATOS = [
+    pytest.param(formato, marks=pytest.mark.skipif(importlib.util.find_spec(modulo) is None, reason=f'{modulo} ausente'))
+    for formato, modulo in (('xlsx', 'openpyxl'), ('parquet', 'pyarrow'))
+]
+
+
+def _desconsiderados(n=100):
+    return pd.DataFrame({
+        'Seq': [f"{i:03d}" for i in range(n)],
+        'Data': [f"{i % 12 + 1:02d}/{2000 + i // 12}" for i in range(n)],
+        'Salário': np.round(np.linspace(1000, 5000, n), 2),
+        'Observação': ['DESCONSIDERADO' if i % 5 == 0 else '' for i in range(n)],
+    })
+
+
+def _cnis():
+    return pd.DataFrame({
+        'Seq': ['1', '2', '3'],
+        'Competência': ['01/2020', '02/2020', '03/2020'],
+        'Remuneração': [1500.0, 1600.5, np.nan],
+        'Ano': ['2020', '2020', '2020'],
+    })
+
+
+def _abrir(tabelas, formato):
+    return abrir_pacote.__wrapped__(exportar_pacote(tabelas, {'Tc': 35}, {'Média 80%': 1.0}, formato))
+
+
+@pytest.mark.parametrize('formato', FORMATOS)
+def test_texto_vazio_volta_vazio(formato):
+    original = _desconsiderados()
+    caso = _abrir({TABELA_DESCONSIDERADOS: original}, formato)
+    pd.testing.assert_frame_equal(caso.tabelas[TABELA_DESCONSIDERADOS], original, check_dtype=False)
+    assert caso.parametros == {'Tc': 35}
+
+
+@pytest.mark.parametrize('formato', FORMATOS)
+def test_tabela_compacta_volta_compacta(formato):
+    original = compactar(_cnis())
+    restaurado = _abrir({TABELA_CNIS: original}, formato).tabelas[TABELA_CNIS]
+    assert restaurado.attrs.get('compacto')
+    for coluna in ('Competência', 'Remuneração', 'Ano'):
+        assert restaurado[coluna].dtype == original[coluna].dtype, coluna
+    pd.testing.assert_frame_equal(restaurado, original)
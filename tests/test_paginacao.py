@@ -0,0 +1,12 @@
+import numpy as np
+import pandas as pd
+
+from previdencia.paginacao import assinatura
+
+
+def test_assinatura_reconhece_a_mesma_tabela_recriada():
+    df = pd.DataFrame({'Competência': ['01/2020', '02/2020', '03/2020'], 'Remuneração': [1500.0, np.nan, 1600.5]})
+    assert assinatura(df) == assinatura(df.copy())
+    assert assinatura(df) != assinatura(df.iloc[::-1])  # a ordem das linhas muda a página
+    assert assinatura(df) != assinatura(df.assign(**{'Remuneração': [1500.0, 0.0, 1600.5]}))
+    assert assinatura(pd.DataFrame({'Entradas': [{'cnis': 'x'}]})) is None
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from previdencia.tabua import TabuaSobrevida, ano_tabua_vigente
+
+# Es distinta por ano da tábua para identificar qual foi consultada.
+TABUA = TabuaSobrevida.de_tabela(pd.DataFrame({
+    'Ano': [2017, 2017, 2018, 2018, 2019, 2019],
+    'Idade': [60, 61, 60, 61, 60, 61],
+    'Expectativa': [21.7, 21.0, 21.8, 21.1, 21.9, 21.2],
+}))
+
+
+def test_es_usa_a_tabua_vigente_na_concessao():
+    # A tábua de 2018 é publicada em 12/2019: novembro ainda usa a de 2017.
+    assert ano_tabua_vigente(['11/2019', '12/2019', '06/2020', '12/2020']).tolist() == [2017, 2018, 2018, 2019]
+    es = TABUA.expectativa([60, 60, 61.5, 60], ['11/2019', '12/2019', '06/2020', '12/2020'])
+    assert es.tolist() == [21.7, 21.8, 21.1, 21.9]
+
+
+def test_concessao_sem_tabua_vigente_da_nan():
+    assert np.isnan(TABUA.expectativa(60, '06/2018')).all()  # vigente seria a de 2016